@@ -6,6 +6,7 @@ Built with Streamlit + Groq + AstraDB + LangChain
 import streamlit as st
 import os
 import time
+import uuid
 import hashlib
 from datetime import datetime
 
@@ -18,17 +19,26 @@ st.set_page_config(
 )
 
 # ─── CSS Injection ────────────────────────────────────────────────────────────
-from styles import GLOBAL_CSS
-st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
+# A one-line <link> to the locally served, cached stylesheet; the ~26KB
+# of CSS is not resent on every rerun and no font request leaves the host.
+from assets import stylesheet_html
+st.markdown(stylesheet_html(st.get_option("server.enableStaticServing")), unsafe_allow_html=True)
 
 # ─── Lazy imports (after page config) ─────────────────────────────────────────
 from backend import (
     initialize_vector_store,
     ingest_pdfs,
+    ingest_coverage,
+    spool_upload,
     build_rag_chain,
     query_with_streaming,
     clear_knowledge_base,
+    remove_document,
     get_retrieval_config,
+    warmup_status,
+    start_metrics_endpoint,
+    arm_profiler,
+    get_config,
 )
 from ui_components import (
     render_top_bar,
@@ -36,15 +46,24 @@ from ui_components import (
     render_message_bubble,
     render_source_citations,
     render_dev_panel_content,
+    render_profile_panel,
     render_document_card,
     render_skeleton_loader,
+    prerender_message,
+    render_citation_summary,
+    transcript_window_start,
 )
 
+# ─── Transcript Window ─────────────────────────────────────────────────────────
+TRANSCRIPT_WINDOW = 10     # exchanges rendered by default
+TRANSCRIPT_PAGE = 10       # exchanges added per "load earlier"
+FULL_CITATIONS = 3         # most recent answers that keep full citation cards
+
 # ─── Session State Init ────────────────────────────────────────────────────────
 def init_session():
     defaults = {
         "messages": [],
-        "documents": [],          # list of {name, pages, size, status, id}
+        "documents": [],          # list of {name, pages, size, status, id, blob}
         "vector_store": None,
         "chat_history": [],
         "query_mode": "⚡ Factual Answer",
@@ -54,6 +73,9 @@ def init_session():
         "show_clear_modal": False,
         "last_retrieval_info": None,
         "is_streaming": False,
+        "history_window": TRANSCRIPT_WINDOW,
+        "session_id": uuid.uuid4().hex,
+        "uploader_nonce": 0,      # bumped to release the widget's upload buffers
     }
     for k, v in defaults.items():
         if k not in st.session_state:
@@ -63,8 +85,11 @@ init_session()
 
 # ─── Credentials Check ────────────────────────────────────────────────────────
 def check_credentials():
+    required = ["GROQ_API_KEY"]
+    if get_config()["vector_store"] == "astra":
+        required += ["ASTRA_DB_APPLICATION_TOKEN", "ASTRA_DB_API_ENDPOINT"]
     missing = []
-    for key in ["GROQ_API_KEY", "ASTRA_DB_APPLICATION_TOKEN", "ASTRA_DB_API_ENDPOINT"]:
+    for key in required:
         if not (st.secrets.get(key) or os.environ.get(key)):
             missing.append(key)
     return missing
@@ -72,7 +97,8 @@ def check_credentials():
 missing_creds = check_credentials()
 
 # ─── Top Navigation Bar ───────────────────────────────────────────────────────
-render_top_bar()
+start_metrics_endpoint()
+render_top_bar(warming=not warmup_status()["ready"])
 
 # ─── Clear Confirmation Modal ─────────────────────────────────────────────────
 if st.session_state.show_clear_modal:
@@ -104,6 +130,7 @@ if st.session_state.show_clear_modal:
             st.session_state.vector_store = None
             st.session_state.chat_history = []
             st.session_state.last_retrieval_info = None
+            st.session_state.history_window = TRANSCRIPT_WINDOW
             st.rerun()
 
 # ─── Sidebar ──────────────────────────────────────────────────────────────────
@@ -127,7 +154,7 @@ with st.sidebar:
         "Upload PDFs",
         type=["pdf"],
         accept_multiple_files=True,
-        key="pdf_uploader",
+        key=f"pdf_uploader_{st.session_state.uploader_nonce}",
         label_visibility="collapsed",
     )
 
@@ -146,47 +173,82 @@ with st.sidebar:
                 existing_ids = [d["id"] for d in st.session_state.documents]
 
                 if file_id not in existing_ids:
-                    # Add with indexing status
+                    # Add with indexing status; bytes go to the on-disk spool,
+                    # session state only keeps the digest
                     doc_entry = {
                         "id": file_id,
                         "name": file.name,
                         "size": file.size,
                         "pages": 0,
                         "status": "indexing",
-                        "file": file,
+                        "blob": spool_upload(file),
                     }
                     st.session_state.documents.append(doc_entry)
 
-            # Ingest any new documents
-            new_docs = [d for d in st.session_state.documents if d["status"] == "indexing"]
-            if new_docs:
-                progress_placeholder = st.empty()
-                with progress_placeholder:
-                    result = ingest_pdfs(new_docs, progress_placeholder)
-                progress_placeholder.empty()
-
-                for doc in st.session_state.documents:
-                    if doc["status"] == "indexing":
-                        doc["status"] = "ready"
-                        if doc["id"] in result:
-                            doc["pages"] = result[doc["id"]].get("pages", 0)
-
-                st.rerun()
+    # Ingest new documents, and new versions uploaded on a card (see document_cards)
+    new_docs = [d for d in st.session_state.documents if d["status"] == "indexing"]
+    if new_docs and not missing_creds:
+        progress_placeholder = st.empty()
+        with progress_placeholder:
+            result = ingest_pdfs(new_docs, progress_placeholder)
+        progress_placeholder.empty()
+
+        for doc in st.session_state.documents:
+            if doc["status"] == "indexing":
+                doc["status"] = "ready"
+                if doc["id"] in result:
+                    # Long PDFs are queryable already; their tail indexes in the background
+                    doc["pages"] = result[doc["id"]].get("pages", 0)
+                    doc["indexed_pages"] = result[doc["id"]].get("indexed_pages", doc["pages"])
+                    if result[doc["id"]].get("pending"):
+                        doc["status"] = "partial"
+
+        # Fresh uploader keys drop the widgets' in-memory UploadedFiles
+        st.session_state.uploader_nonce += 1
+        st.rerun()
 
-    # Document cards
-    if st.session_state.documents:
+    # Document cards; refreshed every 2s while any document is still indexing in the background
+    def document_cards():
         to_remove = None
         for i, doc in enumerate(st.session_state.documents):
-            col_doc, col_rm = st.columns([9, 1])
+            if doc["status"] == "partial":
+                coverage = ingest_coverage(doc["id"])
+                if coverage:
+                    doc["indexed_pages"] = coverage["indexed_pages"]
+                    doc["stalled"] = coverage["state"] in ("failed", "cancelled")
+                if coverage is None or coverage["state"] == "ready":
+                    doc["status"] = "ready"
+            col_doc, col_rev, col_rm = st.columns([8, 1, 1])
             with col_doc:
                 render_document_card(doc)
+            with col_rev:
+                # A new version of this document keeps its id, so only its changed pages are re-embedded
+                if doc["status"] in ("ready", "partial"):
+                    with st.popover("⟳", help="Upload a new version"):
+                        revision = st.file_uploader(
+                            "New version", type=["pdf"], label_visibility="collapsed",
+                            key=f"rev_{doc['id']}_{st.session_state.uploader_nonce}",
+                        )
+                    if revision is not None and not missing_creds:
+                        doc.update(name=revision.name, size=revision.size, status="indexing",
+                                   blob=spool_upload(revision), stalled=False)
+                        st.rerun()
             with col_rm:
                 if st.button("✕", key=f"rm_{doc['id']}", help="Remove document"):
                     to_remove = i
 
         if to_remove is not None:
-            st.session_state.documents.pop(to_remove)
+            removed = st.session_state.documents.pop(to_remove)
+            if removed["status"] in ("ready", "partial"):
+                remove_document(removed["id"])
             st.rerun()
+        if partial and not any(d["status"] == "partial" and not d.get("stalled")
+                               for d in st.session_state.documents):
+            st.rerun()   # stop polling
+
+    if st.session_state.documents:
+        partial = any(d["status"] == "partial" and not d.get("stalled") for d in st.session_state.documents)
+        st.fragment(document_cards, run_every=2.0 if partial else None)()
 
     st.markdown('<div class="sidebar-divider"></div>', unsafe_allow_html=True)
 
@@ -254,6 +316,22 @@ with st.sidebar:
     dev = st.toggle("Developer Mode", value=st.session_state.dev_mode)
     st.session_state.dev_mode = dev
 
+    if dev:
+        profiler_mode = st.selectbox(
+            "Profiler",
+            ["sampling", "deterministic"],
+            help="Sampling sees the shared event loop (retrieval, streaming); "
+                 "deterministic counts every call on the session thread.",
+        )
+        trace_allocs = st.checkbox("Trace allocations", value=True)
+        if st.button("Profile next query / ingestion", key="arm_profiler", use_container_width=True):
+            arm_profiler(profiler_mode, trace_allocs)
+        if st.session_state.get("profile_armed"):
+            st.markdown(
+                '<div class="toggle-sublabel">Armed · the next query or ingestion is profiled</div>',
+                unsafe_allow_html=True,
+            )
+
     st.markdown('<div class="sidebar-divider"></div>', unsafe_allow_html=True)
 
     # ── Clear Knowledge Base ──────────────────────────────────────────────
@@ -283,21 +361,48 @@ with main_col:
     elif st.session_state.messages:
         chat_container = st.container()
         with chat_container:
-            for msg in st.session_state.messages:
+            messages = st.session_state.messages
+            start = transcript_window_start(messages, st.session_state.history_window)
+
+            # Older messages stay in session state but are not sent to the browser
+            if start > 0:
+                if st.button(
+                    f"↑ Load earlier messages ({start} hidden)",
+                    key="load_earlier",
+                    use_container_width=True,
+                ):
+                    st.session_state.history_window += TRANSCRIPT_PAGE
+                    st.rerun()
+                st.markdown(
+                    f'<div class="transcript-window-note">Showing the last {len(messages) - start} '
+                    f'of {len(messages)} messages</div>',
+                    unsafe_allow_html=True,
+                )
+
+            ai_indices = [
+                i for i in range(start, len(messages)) if messages[i]["role"] == "assistant"
+            ]
+            last_ai_idx = ai_indices[-1] if ai_indices else None
+            full_citations = set(ai_indices[-FULL_CITATIONS:])
+
+            for i in range(start, len(messages)):
+                msg = messages[i]
+
+                # Replays HTML cached on the message at creation time
                 render_message_bubble(msg)
 
-                # Source citations for AI messages
+                # Source citations for AI messages; older answers get a one-line summary
                 if msg["role"] == "assistant" and msg.get("sources"):
-                    render_source_citations(msg["sources"], msg.get("query", ""))
+                    if i in full_citations:
+                        render_source_citations(msg["sources"], msg.get("query", ""), msg.get("citations_html"))
+                    else:
+                        render_citation_summary(msg)
 
                 # Dev panel for last AI message
                 if (
                     st.session_state.dev_mode
-                    and msg["role"] == "assistant"
+                    and i == last_ai_idx
                     and msg.get("retrieval_info")
-                    and msg == next(
-                        (m for m in reversed(st.session_state.messages) if m["role"] == "assistant"), None
-                    )
                 ):
                     render_dev_panel_content(msg["retrieval_info"])
 
@@ -311,6 +416,11 @@ with main_col:
         </div>
         """, unsafe_allow_html=True)
 
+# Last profiler capture (Developer Mode)
+if dev_col is not None and st.session_state.get("last_profile"):
+    with dev_col:
+        render_profile_panel(st.session_state.last_profile)
+
 
 # ─── Chat Input ────────────────────────────────────────────────────────────────
 if not missing_creds or True:  # always show input area, error on submit if no creds
@@ -340,7 +450,8 @@ if not missing_creds or True:  # always show input area, error on submit if no c
                 "content": prompt,
                 "timestamp": ts,
             }
-            st.session_state.messages.append(user_msg)
+            st.session_state.messages.append(prerender_message(user_msg))
+            st.session_state.history_window = TRANSCRIPT_WINDOW
 
             # Build RAG chain and query
             with st.spinner(""):
@@ -375,7 +486,7 @@ if not missing_creds or True:  # always show input area, error on submit if no c
                         "query": prompt,
                         "retrieval_info": retrieval_info,
                     }
-                    st.session_state.messages.append(ai_msg)
+                    st.session_state.messages.append(prerender_message(ai_msg))
 
                     # Update conversation memory (windowed)
                     st.session_state.chat_history.append(("human", prompt))
@@ -0,0 +1,206 @@
+"""
+PDF Intelligence — Static Assets
+Serves the design system from ./static through Streamlit static serving
+instead of inlining it: the stylesheet is minified into a content-hashed
+file, and each rerun only emits a one-line <link> that the browser
+resolves from its cache. No request leaves the host: DM Sans, Lora and
+JetBrains Mono (SIL Open Font License) are bundled in static/fonts.
+Streamlit versions whose static handler serves .css as text/plain get the
+inline <style> instead, since browsers refuse such stylesheets under nosniff.
+
+The stylesheet is built at packaging time and committed, so the app never
+writes to its install directory. Rebuild it after editing styles.py; until
+then the app inlines the CSS:
+
+    python assets.py build
+    python assets.py vendor-fonts DIR...    # re-cut static/fonts from variable TTFs (needs fontTools, brotli)
+"""
+
+import functools
+import glob
+import hashlib
+import os
+import re
+import shutil
+import sys
+
+from styles import GLOBAL_CSS
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+FONTS_DIR = os.path.join(STATIC_DIR, "fonts")
+STATIC_URL = "app/static"
+
+# (family, weight, style) — the faces the design system uses
+FONT_FACES = [
+    ("DM Sans", 300, "normal"),
+    ("DM Sans", 400, "normal"),
+    ("DM Sans", 500, "normal"),
+    ("DM Sans", 400, "italic"),
+    ("Lora", 400, "normal"),
+    ("Lora", 500, "normal"),
+    ("Lora", 400, "italic"),
+    ("JetBrains Mono", 400, "normal"),
+    ("JetBrains Mono", 500, "normal"),
+]
+
+
+def font_file(family: str, weight: int, style: str) -> str:
+    return f"{family.lower().replace(' ', '-')}-{weight}-{style}.woff2"
+
+
+# ─── CSS build ────────────────────────────────────────────────────────────────
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_SPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace. Leaves values like calc() intact."""
+    css = _COMMENT.sub("", css)
+    css = _SPACE.sub(" ", css)
+    css = _PUNCT.sub(r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def font_face_css(base: str = "") -> str:
+    """
+    @font-face rules for bundled fonts, their URLs relative to `base`;
+    families without files fall back to the CSS stacks.
+    """
+    rules = []
+    for family, weight, style in FONT_FACES:
+        name = font_file(family, weight, style)
+        src = f'local("{family}")'
+        if os.path.exists(os.path.join(FONTS_DIR, name)):
+            src += f', url("{base}fonts/{name}") format("woff2")'
+        rules.append(
+            f'@font-face{{font-family:"{family}";font-style:{style};font-weight:{weight};'
+            f"font-display:swap;src:{src}}}"
+        )
+    return "".join(rules)
+
+
+def _style_body(html: str) -> str:
+    start = html.index("<style>") + len("<style>")
+    return html[start:html.index("</style>")]
+
+
+@functools.lru_cache(maxsize=1)
+def stylesheet() -> tuple:
+    """(file name, CSS) of the static stylesheet. Content-hashed names make the file safe to cache indefinitely."""
+    # Font URLs resolve against the stylesheet, which is served from the static root
+    css = font_face_css() + minify_css(_style_body(GLOBAL_CSS))
+    return f"app.{hashlib.sha256(css.encode()).hexdigest()[:12]}.min.css", css
+
+
+def build_stylesheet(static_dir: str = STATIC_DIR) -> str:
+    """Write static/app.<hash>.min.css, delete older builds, and return its file name. A packaging step."""
+    name, css = stylesheet()
+    path = os.path.join(static_dir, name)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(css)
+    os.replace(tmp, path)
+    for stale in glob.glob(os.path.join(static_dir, "app.*.min.css")):
+        if stale != path:
+            os.unlink(stale)
+    return name
+
+
+@functools.lru_cache(maxsize=1)
+def inline_style_html() -> str:
+    """Minified <style> block, for deployments without static serving."""
+    return f"<style>{font_face_css(STATIC_URL + '/')}{minify_css(_style_body(GLOBAL_CSS))}</style>"
+
+
+@functools.lru_cache(maxsize=1)
+def static_css_served() -> bool:
+    """Whether Streamlit's static handler sends .css as text/css (so a <link> to it is honoured)."""
+    try:
+        # Tornado-era servers: files outside this allow-list go out as text/plain
+        from streamlit.web.server.app_static_file_handler import SAFE_APP_STATIC_FILE_EXTENSIONS
+    except ImportError:
+        # Starlette server: content type guessed from the extension
+        return True
+    return ".css" in SAFE_APP_STATIC_FILE_EXTENSIONS
+
+
+def stylesheet_html(static_serving: bool = True) -> str:
+    """Markup to inject per rerun: a <link> to the hashed stylesheet, or inline CSS where that would not load."""
+    name, _ = stylesheet()
+    if not static_serving or not static_css_served() or not os.path.exists(os.path.join(STATIC_DIR, name)):
+        # No build for the current styles.py: inline rather than write into the install directory
+        return inline_style_html()
+    # ?v= lets servers that honour it (Tornado) send long-lived cache headers
+    return f'<link rel="stylesheet" href="{STATIC_URL}/{name}?v={name.split(".")[1]}">'
+
+
+# ─── Font vendoring ───────────────────────────────────────────────────────────
+# Google Fonts' "latin" subset
+_LATIN = ("0000-00FF 0131 0152-0153 02BB-02BC 02C6 02DA 02DC 0304 0308 0329 2000-206F 20AC 2122 2191 2193 "
+          "2212 2215 FEFF FFFD")
+# DM Sans also varies by optical size; pin the one its text sizes are drawn for
+_PINNED_AXES = {"DM Sans": {"opsz": 14}}
+
+
+def _latin_codepoints() -> list:
+    points = []
+    for part in _LATIN.split():
+        lo, _, hi = part.partition("-")
+        points.extend(range(int(lo, 16), int(hi or lo, 16) + 1))
+    return points
+
+
+def vendor_fonts(source_dirs: list, log=print) -> int:
+    """
+    Cut the latin woff2 files for FONT_FACES into static/fonts from the
+    families' variable TTFs (e.g. DMSans[opsz,wght].ttf, as in google/fonts
+    or the fontpkg-* wheels) found under `source_dirs`, with the license
+    next to (or one level above) each. Nothing is downloaded. Returns files
+    written.
+    """
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+    from fontTools.varLib import instancer
+
+    sources = {name: os.path.join(root, name) for d in source_dirs for root, _, names in os.walk(d) for name in names}
+    os.makedirs(FONTS_DIR, exist_ok=True)
+    written = 0
+    for family, weight, style in FONT_FACES:
+        prefix = family.replace(" ", "") + ("-Italic" if style == "italic" else "")
+        source = next((path for name, path in sorted(sources.items())
+                       if name.startswith(prefix + "[") and name.endswith(".ttf")), None)
+        if source is None:
+            log(f"  ✕ {family} {weight} {style}: no {prefix}[...].ttf")
+            continue
+        font = instancer.instantiateVariableFont(TTFont(source), {"wght": weight, **_PINNED_AXES.get(family, {})},
+                                                 updateFontNames=True)
+        options = subset.Options()
+        options.flavor = "woff2"
+        options.layout_features = ["*"]
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=_latin_codepoints())
+        subsetter.subset(font)
+        name = font_file(family, weight, style)
+        font.flavor = "woff2"
+        font.save(os.path.join(FONTS_DIR, name))
+        written += 1
+        log(f"  ✓ {name}")
+
+        here = os.path.dirname(source)
+        license_file = next((os.path.join(d, n) for d in (here, os.path.dirname(here)) for n in ("OFL.txt", "LICENSE")
+                             if os.path.exists(os.path.join(d, n))), None)
+        if license_file:
+            shutil.copyfile(license_file, os.path.join(FONTS_DIR, f"{family.replace(' ', '')}-OFL.txt"))
+    return written
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["build"]:
+        print(build_stylesheet())
+    elif sys.argv[1:2] == ["vendor-fonts"] and sys.argv[2:]:
+        vendor_fonts(sys.argv[2:])
+    else:
+        sys.exit("usage: python assets.py build | vendor-fonts DIR...")
@@ -0,0 +1,66 @@
+"""
+PDF Intelligence — Shared Event Loop
+One asyncio loop per process, run on a daemon thread. Streamlit script
+threads submit coroutines to it and consume async generators through a
+synchronous bridge, so in-flight queries share the loop instead of each
+holding a blocked worker thread.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Fallback pool for LangChain components without native async support
+# (their `ainvoke` runs the sync method in the loop's default executor).
+EXECUTOR_THREADS = 4
+
+_loop = None
+_lock = threading.Lock()
+
+
+# ─── Loop ─────────────────────────────────────────────────────────────────────
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop, starting it on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            loop.set_default_executor(
+                ThreadPoolExecutor(max_workers=EXECUTOR_THREADS, thread_name_prefix="aio-fallback")
+            )
+            started = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            threading.Thread(target=_run, daemon=True, name="pagewise-event-loop").start()
+            started.wait()
+            _loop = loop
+        return _loop
+
+
+def run(coro, timeout: float = None):
+    """Run a coroutine on the shared loop and block for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+# ─── Async generator bridge ───────────────────────────────────────────────────
+def iterate(agen):
+    """
+    Consume an async generator from synchronous code.
+
+    Each item is pulled with one hop onto the shared loop. Closing the
+    returned generator (e.g. when Streamlit stops a rerun mid-stream)
+    closes the async generator on the loop, cancelling its tasks.
+    """
+    loop = get_loop()
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
@@ -0,0 +1,176 @@
+"""
+PDF Intelligence — Headless Batch Q&A
+Ingests a document set, answers a JSONL file of questions concurrently and
+writes answers, sources and timings to JSONL. No Streamlit run required.
+
+    python batch.py questions.jsonl --docs filings/*.pdf --out answers.jsonl --workers 8
+
+Each input line is {"id": ..., "question": ...} with optional "mode", "k"
+and "strict" overrides; a bare JSON string is also accepted.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import engine
+from engine import MODE_PROMPTS
+from registry import file_hash
+
+
+# ─── Input ────────────────────────────────────────────────────────────────────
+def load_questions(path: str) -> list:
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if isinstance(item, str):
+                item = {"question": item}
+            if not item.get("question"):
+                raise ValueError(f"{path}:{lineno}: missing 'question'")
+            item.setdefault("id", str(lineno))
+            questions.append(item)
+    return questions
+
+
+def doc_id_for(path: str) -> str:
+    """Same name+size id scheme the app uses for uploads."""
+    name = os.path.basename(path)
+    size = os.path.getsize(path)
+    return hashlib.md5(name.encode() + str(size).encode()).hexdigest()[:8]
+
+
+# ─── Ingestion ────────────────────────────────────────────────────────────────
+def ingest_documents(config: dict, vstore, paths: list, workers: int, log=print) -> dict:
+    """
+    Ingest PDFs concurrently, skipping ones the registry already has with
+    the same content. Returns doc_id -> stats (or error).
+    """
+    splitter = engine.make_splitter(config)
+
+    def _one(path):
+        name = os.path.basename(path)
+        doc_id = doc_id_for(path)
+        start = time.perf_counter()
+        try:
+            stats = engine.ingest_tracked(config, vstore, splitter, path, name, doc_id, file_hash(path))
+        except Exception as e:
+            return doc_id, {"name": name, "error": str(e)[:500]}
+        stats["name"] = name
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        return doc_id, stats
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for doc_id, stats in pool.map(_one, paths):
+            results[doc_id] = stats
+            if "error" in stats:
+                log(f"  ✕ {stats['name']}: {stats['error']}")
+            elif stats["skipped"]:
+                log(f"  = {stats['name']}: already indexed ({stats['chunks']} chunks)")
+            else:
+                log(f"  ✓ {stats['name']}: {stats['pages']} pages, {stats['chunks']} chunks in {stats['seconds']}s")
+    return results
+
+
+# ─── Questions ────────────────────────────────────────────────────────────────
+def run_batch(config: dict, vstore, questions: list, out, workers: int, k: int, mode: str, strict: bool, log=print):
+    """Answer questions concurrently, writing one JSON line per answer in input order."""
+    chains = {}
+    chains_lock = threading.Lock()
+    search_filter = engine.scope(config)
+
+    def _chain(q_k, q_mode, q_strict):
+        key = (q_k, q_mode, q_strict)
+        with chains_lock:
+            if key not in chains:
+                chains[key] = engine.make_chain(
+                    vstore, k=q_k, strict=q_strict, mode=q_mode, search_filter=search_filter,
+                    reranker=engine.get_reranker(config), candidates=config["rerank_candidates"],
+                )
+            return chains[key]
+
+    def _one(item):
+        try:
+            chain, retriever = _chain(
+                int(item.get("k", k)),
+                item.get("mode", mode),
+                bool(item.get("strict", strict)),
+            )
+            result = engine.answer_question(config, chain, retriever, item["question"])
+        except Exception as e:
+            result = {"answer": "", "sources": [], "timings": {}, "error": str(e)[:500]}
+        return {
+            "id": item["id"],
+            "question": item["question"],
+            "answer": result["answer"],
+            "sources": [
+                {k_: s[k_] for k_ in ("filename", "page", "score", "snippet")}
+                for s in result["sources"]
+            ],
+            "timings": result["timings"],
+            "error": result["error"],
+        }
+
+    done = failed = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for record in pool.map(_one, questions):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            done += 1
+            failed += record["error"] is not None
+            log(f"  [{done}/{len(questions)}] {record['id']}"
+                f"{' ✕ ' + record['error'][:80] if record['error'] else ''}")
+
+    elapsed = time.perf_counter() - start
+    return {"questions": done, "failed": failed, "seconds": round(elapsed, 2),
+            "qps": round(done / elapsed, 3) if elapsed else 0.0}
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch question answering over PDFs")
+    parser.add_argument("questions", help="JSONL file of questions")
+    parser.add_argument("--docs", nargs="*", default=[], help="PDF files to ingest before answering")
+    parser.add_argument("--out", default="-", help="Output JSONL path (default: stdout)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent questions / ingestions")
+    parser.add_argument("--k", type=int, default=3, help="Retrieved chunks per question")
+    parser.add_argument("--mode", default="⚡ Factual Answer", choices=list(MODE_PROMPTS))
+    parser.add_argument("--strict", action="store_true")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml", help="Secrets file (env vars also work)")
+    parser.add_argument("--tenant", help="Tenant to ingest into and search (default: PAGEWISE_TENANT)")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+
+    questions = load_questions(args.questions)
+    config = engine.live_config(engine.load_config(engine.load_secrets_file(args.secrets), tenant=args.tenant))
+    vstore = engine.open_vector_store(config)
+
+    if args.docs:
+        log(f"Ingesting {len(args.docs)} document(s)...")
+        ingest_documents(config, vstore, args.docs, args.workers, log=log)
+
+    log(f"Answering {len(questions)} question(s) with {args.workers} worker(s)...")
+    out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+    try:
+        summary = run_batch(config, vstore, questions, out, args.workers, args.k, args.mode, args.strict, log=log)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    log(json.dumps(summary))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
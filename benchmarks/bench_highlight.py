@@ -0,0 +1,90 @@
+"""
+PDF Intelligence — Citation Highlighter Benchmark
+Compares the per-word regex highlighter the citation cards used to run
+against the single-pass shared matcher in ui_components.
+
+    python -m benchmarks.bench_highlight --snippets 10 --rounds 200
+"""
+
+import argparse
+import random
+import re
+import time
+
+from ui_components import _escape_html, _highlight_keywords, keyword_matcher
+
+
+def legacy_highlight(text: str, keywords: set) -> str:
+    """The previous implementation: one compile + sub pass per keyword."""
+    if not keywords:
+        return _escape_html(text)
+    escaped = _escape_html(text)
+    stop_words = {"the", "a", "an", "is", "are", "was", "were", "in", "on", "at",
+                  "to", "of", "and", "or", "for", "with", "this", "that", "it",
+                  "be", "by", "from", "as", "but", "not", "have", "has", "had"}
+    for word in keywords - stop_words:
+        if len(word) < 3:
+            continue
+        pattern = re.compile(re.escape(word), re.IGNORECASE)
+        escaped = pattern.sub(lambda m: f'<span class="highlight-kw">{m.group()}</span>', escaped)
+    return escaped
+
+
+_VOCAB = ("revenue operating margin segment growth guidance quarter fiscal liquidity "
+          "capital expenditure dividend impairment goodwill covenant lease revenue-share "
+          "amortization forecast currency headwind backlog pipeline").split()
+
+
+def _snippets(n: int, rng: random.Random) -> list:
+    return [
+        " ".join(rng.choice(_VOCAB) for _ in range(70))[:400] + " R&D <cost> ..."
+        for _ in range(n)
+    ]
+
+
+def _time(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark citation keyword highlighting")
+    parser.add_argument("--snippets", type=int, default=10, help="Citation cards per answer")
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    snippets = _snippets(args.snippets, rng)
+
+    for n_words in (3, 8, 16):
+        query = " ".join(rng.sample(_VOCAB, n_words)) + " what is the"
+        words = set(query.lower().split())
+
+        def _legacy():
+            return [legacy_highlight(s, words) for s in snippets]
+
+        def _single_pass():
+            keyword_matcher.cache_clear()  # include the per-answer compile
+            matcher = keyword_matcher(frozenset(words))
+            return [_highlight_keywords(s, matcher) for s in snippets]
+
+        legacy_s = _time(_legacy, args.rounds)
+        single_s = _time(_single_pass, args.rounds)
+        print(
+            f"{n_words:>2} keywords x {args.snippets} cards: "
+            f"legacy {legacy_s * 1e3:7.3f} ms  single-pass {single_s * 1e3:7.3f} ms  "
+            f"speedup {legacy_s / single_s:5.1f}x"
+        )
+
+    # Correctness note: the legacy version can match inside its own markup
+    # ("span", "class") and inside escaped entities ("amp", "cost" in "&lt;cost&gt;").
+    demo_words = {"span", "amp", "revenue"}
+    print("\nlegacy     :", legacy_highlight("revenue R&D span", demo_words))
+    print("single-pass:", _highlight_keywords("revenue R&D span", keyword_matcher(frozenset(demo_words))))
+
+
+if __name__ == "__main__":
+    main()
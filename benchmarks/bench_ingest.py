@@ -0,0 +1,176 @@
+"""
+PDF Intelligence — Ingestion Throughput Benchmark
+Generates deterministic PDFs (benchmarks.pdf_corpus) for every combination
+of page count, words per page and layout, ingests them with
+engine.ingest_file into the in-process LocalVectorStore, and reports
+pages/s, chunks/s, load/split/embed/store time and peak RSS. Each
+configuration runs in a fresh process so peak RSS is per configuration.
+
+    python -m benchmarks.bench_ingest --pages 10 50 --words 200 800 --layouts single columns
+    python -m benchmarks.bench_ingest --embeddings hash --save baseline.json
+    python -m benchmarks.bench_ingest --embeddings hash --baseline baseline.json --threshold 0.15
+
+With --baseline, exits 1 if any configuration's pages/s falls more than
+--threshold below the saved value.
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import engine
+from benchmarks.pdf_corpus import LAYOUTS, make_corpus
+
+
+class TimedEmbeddings:
+    """Wraps an Embeddings object and accumulates time spent encoding."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.seconds = 0.0
+
+    def embed_documents(self, texts):
+        start = time.perf_counter()
+        try:
+            return self.inner.embed_documents(texts)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def embed_query(self, text):
+        return self.inner.embed_query(text)
+
+
+def make_embeddings(kind: str, config: dict):
+    if kind == "hash":
+        from benchmarks.hashing_embeddings import HashingEmbeddings
+        return HashingEmbeddings()
+    return engine.get_embeddings(config["embedding_model"])
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def run_config(case: dict) -> dict:
+    """Ingest one generated corpus. Runs inside a fresh worker process."""
+    from local_store import LocalVectorStore
+
+    config = engine.load_config(chunk_size=case["chunk_size"], chunk_overlap=case["chunk_overlap"])
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = make_corpus(tmp, case["docs"], case["pages"], case["words"], case["layout"], case["seed"])
+        embeddings = TimedEmbeddings(make_embeddings(case["embeddings"], config))
+        embeddings.embed_documents(["warm up"])     # model load is not ingestion time
+        embeddings.seconds = 0.0
+        vstore = LocalVectorStore(embeddings)
+        splitter = engine.make_splitter(config)
+        rss_base = _rss_mb()
+
+        marks = {"load": 0.0, "split": 0.0, "store": 0.0}
+        pages = chunks = 0
+        start = time.perf_counter()
+        for i, doc in enumerate(corpus):
+            stamps = {}
+
+            def _on_progress(stage, fname, **info):
+                stamps[stage] = time.perf_counter()
+
+            stats = engine.ingest_file(vstore, splitter, doc["path"], doc["name"], f"doc{i}", _on_progress)
+            end = time.perf_counter()
+            # ingest_file stages: "splitting" → load, "embedding" → split, "storing" → embed + write
+            marks["load"] += stamps["embedding"] - stamps["splitting"]
+            marks["split"] += stamps["storing"] - stamps["embedding"]
+            marks["store"] += end - stamps["storing"]
+            pages += stats["pages"]
+            chunks += stats["chunks"]
+        total = time.perf_counter() - start
+
+    return {
+        "pages": pages,
+        "chunks": chunks,
+        "seconds": round(total, 4),
+        "pages_per_s": round(pages / total, 2),
+        "chunks_per_s": round(chunks / total, 2),
+        "load_s": round(marks["load"], 4),
+        "split_s": round(marks["split"], 4),
+        "embed_s": round(embeddings.seconds, 4),
+        "store_s": round(marks["store"] - embeddings.seconds, 4),
+        "rss_base_mb": round(rss_base, 1),
+        "rss_peak_mb": round(_rss_mb(), 1),
+    }
+
+
+def case_key(case: dict) -> str:
+    return f"{case['layout']}/{case['pages']}p/{case['words']}w"
+
+
+def check_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """Configurations whose pages/s dropped more than `threshold` below baseline."""
+    failures = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base and stats["pages_per_s"] < base["pages_per_s"] * (1 - threshold):
+            failures.append(f"{key}: {stats['pages_per_s']} pages/s vs baseline {base['pages_per_s']}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark PDF ingestion throughput")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--words", type=int, nargs="+", default=[250, 800], help="Words per page")
+    parser.add_argument("--layouts", nargs="+", default=["single", "columns"], choices=LAYOUTS)
+    parser.add_argument("--docs", type=int, default=2, help="Documents per configuration")
+    parser.add_argument("--chunk-size", type=int, default=engine.DEFAULT_CONFIG["chunk_size"])
+    parser.add_argument("--chunk-overlap", type=int, default=engine.DEFAULT_CONFIG["chunk_overlap"])
+    parser.add_argument("--embeddings", default="model", choices=["model", "hash"],
+                        help="'model' = configured sentence-transformer, 'hash' = offline hashing embedder")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Write results as a baseline JSON file")
+    parser.add_argument("--baseline", help="Compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed pages/s drop vs baseline")
+    args = parser.parse_args(argv)
+
+    cases = [
+        {"pages": p, "words": w, "layout": layout, "docs": args.docs, "seed": args.seed,
+         "chunk_size": args.chunk_size, "chunk_overlap": args.chunk_overlap, "embeddings": args.embeddings}
+        for layout, p, w in itertools.product(args.layouts, args.pages, args.words)
+    ]
+
+    print(f"{'config':<24} {'pages/s':>9} {'chunks/s':>9} {'load s':>8} {'split s':>8} "
+          f"{'embed s':>8} {'store s':>8} {'peak MB':>8}")
+    results = {}
+    ctx = multiprocessing.get_context("spawn")
+    for case in cases:
+        with ctx.Pool(1) as pool:
+            stats = pool.apply(run_config, (case,))
+        results[case_key(case)] = stats
+        print(f"{case_key(case):<24} {stats['pages_per_s']:9.1f} {stats['chunks_per_s']:9.1f} "
+              f"{stats['load_s']:8.3f} {stats['split_s']:8.3f} {stats['embed_s']:8.3f} "
+              f"{stats['store_s']:8.3f} {stats['rss_peak_mb']:8.1f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = check_regressions(results, json.load(f), args.threshold)
+        if failures:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in failures:
+                print(f"  ✕ {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} of {os.path.basename(args.baseline)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
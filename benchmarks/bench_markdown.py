@@ -0,0 +1,132 @@
+"""
+PDF Intelligence — Markdown Converter Benchmark
+Throughput of the shared single-pass converter against the two regex
+converters it replaced, for whole answers (history rerender) and for the
+per-token streaming case.
+
+    python -m benchmarks.bench_markdown --sections 8
+"""
+
+import argparse
+import re
+import time
+
+from markdown_html import MarkdownStream, markdown_to_html
+
+
+# ─── Previous converters (verbatim behaviour) ─────────────────────────────────
+def legacy_stream_md(text: str) -> str:
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
+    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+    text = text.replace("\n\n", "</p><p>").replace("\n", "<br>")
+    if not text.startswith("<"):
+        text = f"<p>{text}</p>"
+    return text
+
+
+def legacy_ui_md(text: str) -> str:
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    text = re.sub(r'^### (.+)$', r'<h3>\1</h3>', text, flags=re.MULTILINE)
+    text = re.sub(r'^## (.+)$', r'<h2>\1</h2>', text, flags=re.MULTILINE)
+    text = re.sub(r'^# (.+)$', r'<h1>\1</h1>', text, flags=re.MULTILINE)
+    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
+    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
+    result, in_list = [], False
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped.startswith('- ') or stripped.startswith('* ') or stripped.startswith('• '):
+            if not in_list:
+                result.append('<ul>')
+                in_list = True
+            result.append(f'<li>{stripped[2:]}</li>')
+        elif re.match(r'^\d+\.\s', stripped):
+            if not in_list:
+                result.append('<ol>')
+                in_list = 'ol'
+            item = re.sub(r'^\d+\.\s', '', stripped)
+            result.append(f"<li>{item}</li>")
+        else:
+            if in_list:
+                result.append(f"</{'ol' if in_list == 'ol' else 'ul'}>")
+                in_list = False
+            result.append(line)
+    if in_list:
+        result.append(f"</{'ol' if in_list == 'ol' else 'ul'}>")
+    processed = []
+    for para in '\n'.join(result).split('\n\n'):
+        para = para.strip()
+        if not para:
+            continue
+        processed.append(para if para.startswith('<') else "<p>" + para.replace("\n", "<br>") + "</p>")
+    return '\n'.join(processed)
+
+
+# ─── Corpus ───────────────────────────────────────────────────────────────────
+_SECTION = """## Key Findings
+
+Revenue grew **12%** year over year, driven by *services* and the `EMEA` segment.
+Operating margin narrowed to 18.4% on higher input costs & currency effects.
+
+- Services revenue up **21%**
+- Hardware flat at *$4.1bn*
+- Backlog of `$9.8bn`, up 6%
+
+1. Guidance maintained
+2. Buyback extended through 2026
+
+"""
+
+
+def _tokens(text: str, size: int = 4) -> list:
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def _bench(fn, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark markdown → HTML conversion")
+    parser.add_argument("--sections", type=int, default=8, help="Answer length in repeated sections")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    answer = _SECTION * args.sections
+    mb = len(answer.encode()) / 1e6
+
+    print(f"Whole answer ({len(answer)} chars):")
+    for label, fn in (("legacy ui", legacy_ui_md), ("legacy stream", legacy_stream_md),
+                      ("single-pass", markdown_to_html)):
+        secs = _bench(lambda: fn(answer), args.rounds)
+        print(f"  {label:<14} {secs * 1e3:8.3f} ms   {mb / secs:7.2f} MB/s")
+
+    tokens = _tokens(answer)
+    print(f"\nStreaming {len(tokens)} tokens, full re-render after each token:")
+
+    def _legacy_stream():
+        text = ""
+        for tok in tokens:
+            text += tok
+            legacy_stream_md(text)
+
+    def _incremental():
+        stream = MarkdownStream()
+        for tok in tokens:
+            stream.append(tok)
+
+    rounds = max(1, args.rounds // 10)
+    legacy_s = _bench(_legacy_stream, rounds)
+    incr_s = _bench(_incremental, rounds)
+    print(f"  legacy stream  {legacy_s * 1e3:8.1f} ms   ({legacy_s / len(tokens) * 1e6:6.1f} µs/token)")
+    print(f"  incremental    {incr_s * 1e3:8.1f} ms   ({incr_s / len(tokens) * 1e6:6.1f} µs/token)")
+    print(f"  speedup        {legacy_s / incr_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
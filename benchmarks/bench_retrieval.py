@@ -0,0 +1,181 @@
+"""
+PDF Intelligence — Retrieval Latency & Recall Benchmark
+Builds a labelled question → chunk set from a generated corpus
+(benchmarks.pdf_corpus: one fact and question per page), indexes it, and
+queries through the same retriever the app uses (engine.make_chain, which
+build_rag_chain wraps). Reports p50/p95 query-embed and search latency,
+recall@k against an exact NumPy brute-force index over the same
+embeddings, and hit@k against the labels for both.
+
+    python -m benchmarks.bench_retrieval --docs 20 --pages 25 --k 1 3 5 10
+    python -m benchmarks.bench_retrieval --embeddings hash --store local
+    python -m benchmarks.bench_retrieval --quantization none int8 binary
+    python -m benchmarks.bench_retrieval --store astra      # credentials from secrets/env
+
+For the local store, --quantization compares the float32 index with the
+quantized ones (quantized_store), adding in-memory vector bytes per chunk.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import engine
+from benchmarks.bench_ingest import make_embeddings
+from benchmarks.pdf_corpus import LAYOUTS, make_corpus
+from local_store import normalize, top_k
+
+
+class ExactIndex:
+    """Brute-force cosine top-k over a dense matrix; the ground truth."""
+
+    def __init__(self, vectors, ids: list):
+        self.matrix = normalize(vectors)
+        self.ids = list(ids)
+
+    def search(self, query_vector, k: int) -> list:
+        scores = self.matrix @ normalize(query_vector)
+        return [self.ids[i] for i in top_k(scores, k)]
+
+
+class TimedEmbeddings:
+    """Records the duration of the most recent embed_query call."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.last_query_s = 0.0
+
+    def embed_documents(self, texts):
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text):
+        start = time.perf_counter()
+        try:
+            return self.inner.embed_query(text)
+        finally:
+            self.last_query_s = time.perf_counter() - start
+
+
+def build_dataset(config: dict, corpus: list, tags: dict) -> tuple:
+    """Split the corpus like ingestion does. Returns (chunks, questions with relevant chunk ids)."""
+    splitter = engine.make_splitter(config)
+    chunks, questions = [], []
+    for i, doc in enumerate(corpus):
+        _, doc_chunks = engine.split_file(splitter, doc["path"], doc["name"], f"doc{i}", tags)
+        chunks.extend(doc_chunks)
+        for fact in doc["facts"]:
+            relevant = {c.id for c in doc_chunks
+                        if c.metadata.get("page") == fact["page"] and fact["codename"] in c.page_content}
+            if relevant:
+                questions.append({"question": fact["question"], "relevant": relevant})
+    return chunks, questions
+
+
+def _percentile(values: list, pct: float) -> float:
+    return float(np.percentile(values, pct)) if values else 0.0
+
+
+def open_store(kind: str, config: dict, embeddings, chunks: list, vectors, quantization: str = "none"):
+    if kind == "local":
+        from local_store import LocalVectorStore
+        from quantized_store import QuantizedVectorStore
+        store = (LocalVectorStore(embeddings) if quantization == "none"
+                 else QuantizedVectorStore(embeddings, quantization))
+        store.add_vectors(vectors, [c.page_content for c in chunks],
+                          [c.metadata for c in chunks], [c.id for c in chunks])
+        return store
+    store = engine.open_vector_store(config)
+    store.add_documents(chunks, ids=[c.id for c in chunks])
+    return store
+
+
+def run(store, exact: ExactIndex, embeddings: TimedEmbeddings, questions: list, k: int, search_filter: dict) -> dict:
+    _, retriever = engine.make_chain(store, k=k, search_filter=search_filter)
+    embed_s, search_s = [], []
+    recall = hit = exact_hit = 0.0
+
+    for q in questions:
+        start = time.perf_counter()
+        docs = retriever.invoke(q["question"])
+        total = time.perf_counter() - start
+        embed_s.append(embeddings.last_query_s)
+        search_s.append(total - embeddings.last_query_s)
+
+        got = [d.id for d in docs]
+        truth = exact.search(embeddings.inner.embed_query(q["question"]), k)
+        recall += len(set(got) & set(truth)) / max(len(truth), 1)
+        hit += bool(q["relevant"] & set(got))
+        exact_hit += bool(q["relevant"] & set(truth))
+
+    n = max(len(questions), 1)
+    return {
+        "k": k,
+        "embed_p50_ms": _percentile(embed_s, 50) * 1e3,
+        "search_p50_ms": _percentile(search_s, 50) * 1e3,
+        "search_p95_ms": _percentile(search_s, 95) * 1e3,
+        "recall_vs_exact": recall / n,
+        "hit": hit / n,
+        "exact_hit": exact_hit / n,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark retrieval latency and recall@k")
+    parser.add_argument("--docs", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--words", type=int, default=400)
+    parser.add_argument("--layout", default="single", choices=LAYOUTS)
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5, 10])
+    parser.add_argument("--queries", type=int, default=200, help="Max questions to run")
+    parser.add_argument("--chunk-size", type=int, default=engine.DEFAULT_CONFIG["chunk_size"])
+    parser.add_argument("--chunk-overlap", type=int, default=engine.DEFAULT_CONFIG["chunk_overlap"])
+    parser.add_argument("--embeddings", default="model", choices=["model", "hash"])
+    parser.add_argument("--store", default="local", choices=["local", "astra"])
+    parser.add_argument("--quantization", nargs="+", default=["none"], choices=["none", "int8", "binary"],
+                        help="Local store vector encodings to compare")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    config = engine.load_config(engine.load_secrets_file(args.secrets), vector_store=args.store,
+                                chunk_size=args.chunk_size, chunk_overlap=args.chunk_overlap)
+    # Same tenant + partition filter the app pushes into every search
+    partition = engine.new_partition()
+    tags = engine.scope(config, partition)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = make_corpus(tmp, args.docs, args.pages, args.words, args.layout, args.seed)
+        chunks, questions = build_dataset(config, corpus, tags)
+    questions = questions[:args.queries]
+
+    embeddings = TimedEmbeddings(make_embeddings(args.embeddings, config))
+    start = time.perf_counter()
+    vectors = embeddings.embed_documents([c.page_content for c in chunks])
+    print(f"{len(chunks)} chunks from {args.docs * args.pages} pages, {len(questions)} labelled questions "
+          f"(embedded in {time.perf_counter() - start:.1f}s)")
+
+    exact = ExactIndex(vectors, [c.id for c in chunks])
+    for quantization in (args.quantization if args.store == "local" else ["none"]):
+        store = open_store(args.store, config, embeddings, chunks, vectors, quantization)
+        try:
+            title = f"{args.store} store" + (f", {quantization}" if quantization != "none" else "")
+            if hasattr(store, "vector_bytes"):
+                title += f" — {store.vector_bytes() / len(chunks):.0f} B/chunk of vectors in memory"
+            print(f"\n{title}")
+            print(f"{'k':>3} {'embed p50':>10} {'search p50':>11} {'search p95':>11} "
+                  f"{'recall@k':>9} {'hit@k':>7} {'exact hit@k':>12}")
+            for k in args.k:
+                r = run(store, exact, embeddings, questions, k, tags)
+                print(f"{k:>3} {r['embed_p50_ms']:8.2f}ms {r['search_p50_ms']:9.2f}ms {r['search_p95_ms']:9.2f}ms "
+                      f"{r['recall_vs_exact']:9.3f} {r['hit']:7.3f} {r['exact_hit']:12.3f}")
+        finally:
+            if args.store != "local":
+                engine.drop_partition(store, partition)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
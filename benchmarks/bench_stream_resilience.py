@@ -0,0 +1,103 @@
+"""
+PDF Intelligence — Stream Resilience Benchmark
+Runs the same question stream against the fault-injecting stand-in twice:
+once as a plain stream, once through `resilient_stream`, and compares
+end-to-end answer latency percentiles and failure counts.
+
+    python -m benchmarks.bench_stream_resilience --requests 200
+"""
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fault_server import start_server
+from resilience import DEFAULT_STREAM_POLICY, LatencyWindow, resilient_stream, text_tokens
+
+
+def _sse_tokens(url: str, timeout: float):
+    """Minimal OpenAI-style SSE client yielding every content delta, empty ones included (as LangChain does)."""
+    body = json.dumps({
+        "model": "stand-in",
+        "stream": True,
+        "messages": [{"role": "user", "content": "Summarise the filing."}],
+    }).encode()
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        for raw in resp:
+            line = raw.decode().strip()
+            if not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data == "[DONE]":
+                return
+            yield json.loads(data)["choices"][0]["delta"].get("content") or ""
+
+
+def _pct(samples, pct):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))]
+
+
+def run(label: str, n: int, concurrency: int, one_request):
+    latencies, failures = [], 0
+
+    def _task(_):
+        start = time.perf_counter()
+        try:
+            text = "".join(one_request())
+            ok = bool(text)
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for ok, elapsed in pool.map(_task, range(n)):
+            latencies.append(elapsed)
+            failures += not ok
+
+    print(
+        f"{label:<12} n={n:<5} fail={failures:<4} "
+        f"p50={_pct(latencies, 50):6.2f}s p95={_pct(latencies, 95):6.2f}s "
+        f"p99={_pct(latencies, 99):6.2f}s mean={statistics.mean(latencies):6.2f}s"
+    )
+    return latencies, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark resilient_stream against injected faults")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stall-seconds", type=float, default=6.0)
+    parser.add_argument("--first-token-timeout", type=float, default=2.0)
+    args = parser.parse_args()
+
+    url = f"http://127.0.0.1:{args.port}/openai/v1/chat/completions"
+    server, stats = start_server(port=args.port, stall_seconds=args.stall_seconds)
+    policy = {
+        **DEFAULT_STREAM_POLICY,
+        "first_token_timeout": args.first_token_timeout,
+        "idle_timeout": args.stall_seconds / 2,
+        "hedge_after": "p95",
+        "hedge_fallback": 0.5,
+    }
+    window = LatencyWindow()
+
+    try:
+        run("plain", args.requests, args.concurrency,
+            lambda: _sse_tokens(url, timeout=args.stall_seconds * 2))
+        run("resilient", args.requests, args.concurrency,
+            lambda: resilient_stream(lambda: text_tokens(_sse_tokens(url, timeout=policy["idle_timeout"])),
+                                     policy=policy, window=window))
+        print(f"injected: {json.dumps(stats)}")
+        print(f"observed TTFT p95: {window.percentile(95):.3f}s")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
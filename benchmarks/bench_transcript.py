@@ -0,0 +1,83 @@
+"""
+PDF Intelligence — Transcript Rerun Benchmark
+Reruns app.py headlessly (Streamlit AppTest) with synthetic transcripts of
+growing length and reports rerun time and the markdown payload sent to the
+browser, with the transcript window on and off.
+
+    python -m benchmarks.bench_transcript --lengths 2 10 50 200
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def _transcript(exchanges: int) -> list:
+    messages = []
+    for i in range(exchanges):
+        query = f"What does section {i} say about revenue recognition and lease liabilities?"
+        messages.append({"role": "user", "content": query, "timestamp": "09:00"})
+        messages.append({
+            "role": "assistant",
+            "content": (f"## Section {i}\n\n**Revenue** is recognised *over time* for `services`.\n\n"
+                        "- Lease liabilities are measured at present value\n- Discount rate: incremental borrowing rate\n"),
+            "timestamp": "09:00",
+            "query": query,
+            "sources": [
+                {"filename": f"annual-report-{j}.pdf", "page": j + 1, "score": 0.9 - j * 0.1,
+                 "snippet": "Revenue from services is recognised over time as the customer receives "
+                            "the benefit; lease liabilities are measured at present value. " * 3}
+                for j in range(3)
+            ],
+            "retrieval_info": {"chunks": []},
+        })
+    return messages
+
+
+def _payload_bytes(at: AppTest) -> int:
+    return sum(len(el.value.encode()) for el in at.markdown)
+
+
+def measure(exchanges: int, window: int, rounds: int):
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    for key in ("GROQ_API_KEY", "ASTRA_DB_APPLICATION_TOKEN", "ASTRA_DB_API_ENDPOINT"):
+        at.secrets[key] = "bench"
+    at.session_state["messages"] = _transcript(exchanges)
+    at.session_state["documents"] = [
+        {"id": "bench", "name": "annual-report.pdf", "size": 1 << 20, "pages": 120, "status": "ready"}
+    ]
+    if window:
+        at.session_state["history_window"] = window
+    at.run()  # first run pays the one-time HTML prerender
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), _payload_bytes(at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rerun cost against transcript length")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2, 10, 50, 200])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'exchanges':>9}  {'windowed':>18}  {'full transcript':>18}")
+    for n in args.lengths:
+        win_s, win_b = measure(n, 0, args.rounds)
+        full_s, full_b = measure(n, 10 ** 9, args.rounds)
+        print(f"{n:>9}  {win_s * 1e3:7.1f} ms {win_b / 1024:6.1f} KB  "
+              f"{full_s * 1e3:7.1f} ms {full_b / 1024:6.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+PDF Intelligence — Fault-Injecting LLM Stand-in
+A local server speaking Groq's OpenAI-compatible streaming chat API that
+injects stalls, errors and slow tokens on a configurable share of requests.
+
+Point the app at it with GROQ_API_BASE=http://127.0.0.1:8765 and any key:
+
+    python -m benchmarks.fault_server --stall-rate 0.05 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_FAULTS = {
+    "stall_rate": 0.05,        # no first token for `stall_seconds`
+    "midstream_rate": 0.02,    # stream stalls after a few tokens
+    "error_rate": 0.05,        # immediate 503
+    "slow_rate": 0.10,         # first token arrives after `slow_seconds`
+    "stall_seconds": 30.0,
+    "slow_seconds": 1.5,
+    "base_ttft": 0.15,
+    "token_interval": 0.005,
+    "tokens": 40,
+}
+
+_WORDS = ("the filing reports revenue growth across segments while operating "
+          "margin narrowed due to higher input costs and currency effects").split()
+
+
+def _chunk(text: str, finish: bool = False, role: bool = False) -> bytes:
+    if finish:
+        delta = {}
+    elif role:
+        # Groq opens every stream with this, immediately, before any text
+        delta = {"role": "assistant", "content": ""}
+    else:
+        delta = {"content": text}
+    payload = {
+        "id": "chatcmpl-standin",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "stand-in",
+        "choices": [{
+            "index": 0,
+            "delta": delta,
+            "finish_reason": "stop" if finish else None,
+        }],
+    }
+    return f"data: {json.dumps(payload)}\n\n".encode()
+
+
+def make_handler(faults: dict, rng: random.Random, stats: dict):
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+
+            with lock:
+                roll = rng.random()
+                stats["requests"] = stats.get("requests", 0) + 1
+
+            edges = [
+                ("error", faults["error_rate"]),
+                ("stall", faults["stall_rate"]),
+                ("midstream", faults["midstream_rate"]),
+                ("slow", faults["slow_rate"]),
+            ]
+            fault, acc = "ok", 0.0
+            for name, rate in edges:
+                acc += rate
+                if roll < acc:
+                    fault = name
+                    break
+            with lock:
+                stats[fault] = stats.get(fault, 0) + 1
+
+            if fault == "error":
+                body = json.dumps({"error": {"message": "injected overload", "type": "server_error"}}).encode()
+                self.send_response(503)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            try:
+                self.wfile.write(_chunk("", role=True))
+                self.wfile.flush()
+                if fault == "stall":
+                    time.sleep(faults["stall_seconds"])
+                elif fault == "slow":
+                    time.sleep(faults["slow_seconds"])
+                else:
+                    time.sleep(faults["base_ttft"])
+
+                for i in range(faults["tokens"]):
+                    if fault == "midstream" and i == 5:
+                        time.sleep(faults["stall_seconds"])
+                    self.wfile.write(_chunk(_WORDS[i % len(_WORDS)] + " "))
+                    self.wfile.flush()
+                    time.sleep(faults["token_interval"])
+                self.wfile.write(_chunk("", finish=True))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client cancelled (e.g. a losing hedge)
+
+    return Handler
+
+
+def start_server(port: int = 8765, seed: int = 7, **overrides):
+    """Start the stand-in in a daemon thread. Returns (server, stats)."""
+    faults = {**DEFAULT_FAULTS, **overrides}
+    stats = {}
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(faults, random.Random(seed), stats))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="fault-server").start()
+    return server, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault-injecting Groq stand-in server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=7)
+    for key, value in DEFAULT_FAULTS.items():
+        parser.add_argument(f"--{key.replace('_', '-')}", type=type(value), default=value)
+    args = vars(parser.parse_args())
+    port, seed = args.pop("port"), args.pop("seed")
+
+    server, stats = start_server(port=port, seed=seed, **args)
+    print(f"Fault-injecting stand-in listening on http://127.0.0.1:{port}")
+    try:
+        while True:
+            time.sleep(10)
+            print(json.dumps(stats))
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
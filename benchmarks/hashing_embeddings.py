@@ -0,0 +1,37 @@
+"""
+PDF Intelligence — Hashing Embeddings
+Deterministic bag-of-words feature-hashing embedder with the LangChain
+Embeddings interface. Lexically meaningful (shared words → higher cosine)
+and needs no model download, so benchmarks run offline and in CI. Use the
+real model (`--embeddings model`) for numbers that include encode cost.
+"""
+
+import re
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list:
+        tokens = _TOKEN.findall(text.lower())
+        vector = np.zeros(self.dim, dtype=np.float32)
+        if tokens:
+            hashes = np.fromiter((zlib.crc32(t.encode()) for t in tokens), dtype=np.uint32, count=len(tokens))
+            signs = np.where(hashes & 1, 1.0, -1.0).astype(np.float32)
+            np.add.at(vector, (hashes >> 1) % self.dim, signs)
+            vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        return vector.tolist()
+
+    def embed_documents(self, texts: list) -> list:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list:
+        return self._embed(text)
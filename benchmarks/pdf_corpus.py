@@ -0,0 +1,211 @@
+"""
+PDF Intelligence — Synthetic PDF Corpus
+Deterministic PDFs of configurable page count, text density and layout,
+written with no PDF library. Every page carries one unique "fact"
+sentence with a matching question, so retrieval benchmarks get a
+labelled question → page set for free.
+
+    python -m benchmarks.pdf_corpus out/ --docs 4 --pages 20 --words 400 --layout columns
+"""
+
+import argparse
+import json
+import os
+import random
+
+
+LAYOUTS = ("single", "columns", "report")
+
+_PAGE_W, _PAGE_H, _MARGIN = 612, 792, 54
+_SYLLABLES = ("ka", "lo", "mi", "ra", "ven", "tor", "sa", "quin", "del", "ox", "bri", "um", "zen", "pa")
+_WORDS = (
+    "revenue margin segment growth guidance quarter fiscal liquidity capital expenditure "
+    "dividend impairment goodwill covenant lease amortization forecast currency headwind "
+    "backlog pipeline supplier inventory logistics compliance audit reserve pension equity "
+    "debt maturity hedge exposure volume pricing contract renewal churn retention region"
+).split()
+_MONTHS = ("January", "February", "March", "April", "May", "June", "July", "August",
+           "September", "October", "November", "December")
+
+
+# ─── Text ─────────────────────────────────────────────────────────────────────
+def _codename(rng: random.Random, used: set) -> str:
+    while True:
+        name = "".join(rng.choice(_SYLLABLES) for _ in range(3)).capitalize()
+        if name not in used:
+            used.add(name)
+            return name
+
+
+def _sentences(rng: random.Random, words: int) -> list:
+    out = []
+    while words > 0:
+        n = min(words, rng.randint(8, 18))
+        sentence = " ".join(rng.choice(_WORDS) for _ in range(n))
+        out.append(sentence.capitalize() + ".")
+        words -= n
+    return out
+
+
+def _fact(rng: random.Random, codename: str) -> dict:
+    units = rng.randint(100, 99999)
+    month = rng.choice(_MONTHS)
+    return {
+        "codename": codename,
+        "fact": f"The {codename} facility reported {units} units in {month}.",
+        "question": f"How many units did the {codename} facility report in {month}?",
+        "answer": str(units),
+    }
+
+
+def _wrap(text: str, width: int) -> list:
+    lines, line = [], ""
+    for word in text.split():
+        if line and len(line) + 1 + len(word) > width:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# ─── Page layout ──────────────────────────────────────────────────────────────
+def _text_block(lines: list, x: float, y: float, size: float, font: str = "F1") -> str:
+    leading = size * 1.2
+    body = " T* ".join(f"({_escape(line)}) Tj" for line in lines)
+    return f"BT /{font} {size:.1f} Tf {leading:.1f} TL {x:.1f} {y:.1f} Td {body} ET"
+
+
+def _fit(lines_needed: int, height: float, size: float = 10.0) -> float:
+    """Shrink the font until `lines_needed` lines fit in `height` points (min 5pt)."""
+    while size > 5 and lines_needed * size * 1.2 > height:
+        size -= 0.5
+    return size
+
+
+def _page_stream(text: str, layout: str, page_no: int, title: str) -> str:
+    top = _PAGE_H - _MARGIN
+    width = _PAGE_W - 2 * _MARGIN
+    parts = []
+
+    if layout == "report":
+        parts.append(_text_block([title], _MARGIN, top, 13, "F2"))
+        parts.append(_text_block([f"Page {page_no}"], _PAGE_W / 2 - 15, _MARGIN / 2, 8))
+        top -= 28
+
+    height = top - _MARGIN
+    if layout == "columns":
+        gutter = 18
+        col_width = (width - gutter) / 2
+        lines = _wrap(text, int(col_width / 5))
+        half = (len(lines) + 1) // 2
+        size = _fit(half, height)
+        lines = _wrap(text, int(col_width / (size * 0.5)))
+        half = (len(lines) + 1) // 2
+        parts.append(_text_block(lines[:half], _MARGIN, top, size))
+        parts.append(_text_block(lines[half:], _MARGIN + col_width + gutter, top, size))
+    else:
+        size = _fit(len(_wrap(text, int(width / 5))), height)
+        parts.append(_text_block(_wrap(text, int(width / (size * 0.5))), _MARGIN, top, size))
+
+    return "\n".join(parts)
+
+
+# ─── PDF writer ───────────────────────────────────────────────────────────────
+def _write_pdf(path: str, streams: list):
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled once page object numbers are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for stream in streams:
+        data = stream.encode("latin-1")
+        objects.append(f"<< /Length {len(data)} >>\nstream\n{stream}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_PAGE_W} {_PAGE_H}] "
+            f"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents {content_ref} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{off:010d} 00000 n \n" for off in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def make_pdf(path: str, pages: int = 10, words_per_page: int = 400, layout: str = "single",
+             seed: int = 0, used_names: set = None) -> list:
+    """
+    Write one deterministic PDF. Returns its facts:
+    [{page (0-based), codename, fact, question, answer}]
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {LAYOUTS}")
+    rng = random.Random(seed)
+    used_names = used_names if used_names is not None else set()
+
+    streams, facts = [], []
+    for page in range(pages):
+        fact = _fact(rng, _codename(rng, used_names))
+        sentences = _sentences(rng, max(words_per_page - len(fact["fact"].split()), 0))
+        sentences.insert(rng.randint(0, len(sentences)), fact["fact"])
+        title = f"Section {page + 1}: {rng.choice(_WORDS).capitalize()} review"
+        streams.append(_page_stream(" ".join(sentences), layout, page + 1, title))
+        facts.append({"page": page, **fact})
+
+    _write_pdf(path, streams)
+    return facts
+
+
+def make_corpus(out_dir: str, docs: int = 4, pages: int = 10, words_per_page: int = 400,
+                layout: str = "single", seed: int = 0) -> list:
+    """Write `docs` PDFs into `out_dir`. Returns [{path, name, facts}]; codenames are unique corpus-wide."""
+    os.makedirs(out_dir, exist_ok=True)
+    used = set()
+    corpus = []
+    for i in range(docs):
+        name = f"synthetic_{layout}_{pages}p_{words_per_page}w_{seed}_{i:03d}.pdf"
+        path = os.path.join(out_dir, name)
+        facts = make_pdf(path, pages, words_per_page, layout, seed=seed * 100003 + i, used_names=used)
+        corpus.append({"path": path, "name": name, "facts": facts})
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic PDF corpus")
+    parser.add_argument("out_dir")
+    parser.add_argument("--docs", type=int, default=4)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--words", type=int, default=400, help="Words per page")
+    parser.add_argument("--layout", default="single", choices=LAYOUTS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.out_dir, args.docs, args.pages, args.words, args.layout, args.seed)
+    with open(os.path.join(args.out_dir, "facts.jsonl"), "w", encoding="utf-8") as f:
+        for doc in corpus:
+            for fact in doc["facts"]:
+                f.write(json.dumps({"name": doc["name"], **fact}) + "\n")
+    print(f"Wrote {len(corpus)} PDFs ({args.pages} pages each) to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+PDF Intelligence — Upload Spool
+Content-addressed on-disk store for upload bytes. Sessions keep only the
+digest; each put registers a ref, and the bytes are deleted when the
+last ref is released (e.g. once ingestion commits). An owner holding the
+same bytes twice (two uploads with identical content) holds two refs.
+
+Layout under `root`:
+    objects/ab/abcdef...   the bytes, named by SHA-256
+    refs/abcdef.../<owner>.<token>  one empty file per put
+    tmp/                   partial writes
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+
+class BlobStore:
+    """Content-addressed blob spool with counted per-owner refs."""
+
+    CHUNK = 1 << 20
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        for sub in ("objects", "refs", "tmp"):
+            os.makedirs(os.path.join(root, sub), exist_ok=True)
+
+    # ─── Paths ────────────────────────────────────────────────────────────
+    def path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _ref_dir(self, digest: str) -> str:
+        return os.path.join(self.root, "refs", digest)
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self.path(digest))
+
+    # ─── Write ────────────────────────────────────────────────────────────
+    def put(self, fileobj, owner: str) -> str:
+        """
+        Stream `fileobj` to disk and register `owner` as a holder.
+        Returns the SHA-256 hex digest that addresses the bytes.
+        """
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+
+        sha = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    block = fileobj.read(self.CHUNK)
+                    if not block:
+                        break
+                    sha.update(block)
+                    out.write(block)
+            digest = sha.hexdigest()
+
+            with self._lock:
+                final = self.path(digest)
+                if os.path.exists(final):
+                    os.unlink(tmp_path)
+                else:
+                    os.makedirs(os.path.dirname(final), exist_ok=True)
+                    os.replace(tmp_path, final)
+                os.makedirs(self._ref_dir(digest), exist_ok=True)
+                open(os.path.join(self._ref_dir(digest), f"{owner}.{uuid.uuid4().hex[:12]}"), "w").close()
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return digest
+
+    # ─── Release / GC ─────────────────────────────────────────────────────
+    def release(self, digest: str, owner: str):
+        """Drop one of `owner`'s refs (one per put); delete the bytes once no refs remain."""
+        with self._lock:
+            ref_dir = self._ref_dir(digest)
+            held = [name for name in (os.listdir(ref_dir) if os.path.isdir(ref_dir) else ())
+                    if name.rpartition(".")[0] == owner]
+            if held:
+                os.unlink(os.path.join(ref_dir, held[0]))
+            self._collect(digest)
+
+    def _collect(self, digest: str):
+        ref_dir = self._ref_dir(digest)
+        if os.path.isdir(ref_dir) and os.listdir(ref_dir):
+            return
+        shutil.rmtree(ref_dir, ignore_errors=True)
+        try:
+            os.unlink(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def sweep(self, max_age: float = 24 * 3600) -> int:
+        """
+        Expire refs older than `max_age` seconds (sessions that never
+        ingested) and delete unreferenced blobs. Returns blobs removed.
+        """
+        cutoff = time.time() - max_age
+        removed = 0
+        with self._lock:
+            refs_root = os.path.join(self.root, "refs")
+            for digest in os.listdir(refs_root):
+                ref_dir = os.path.join(refs_root, digest)
+                for name in os.listdir(ref_dir):
+                    ref = os.path.join(ref_dir, name)
+                    if os.path.getmtime(ref) < cutoff:
+                        os.unlink(ref)
+
+            objects_root = os.path.join(self.root, "objects")
+            for prefix in os.listdir(objects_root):
+                for digest in os.listdir(os.path.join(objects_root, prefix)):
+                    ref_dir = self._ref_dir(digest)
+                    if os.path.isdir(ref_dir) and os.listdir(ref_dir):
+                        continue
+                    self._collect(digest)
+                    removed += 1
+
+            tmp_root = os.path.join(self.root, "tmp")
+            for name in os.listdir(tmp_root):
+                partial = os.path.join(tmp_root, name)
+                if os.path.getmtime(partial) < cutoff:
+                    os.unlink(partial)
+        return removed
@@ -0,0 +1,1267 @@
+"""
+PDF Intelligence — Engine
+Streamlit-free RAG core: explicit config, vector store handles and progress
+callbacks. Safe to import from worker processes, CLIs and services; the
+Streamlit adapter lives in backend.py.
+"""
+
+import asyncio
+import os
+import re
+import hashlib
+import time
+import uuid
+import functools
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from registry import DocumentRegistry, file_hash
+from resilience import DEFAULT_STREAM_POLICY, aresilient_stream, resilient_stream, text_tokens
+
+# Lazy imports for better startup time
+def _import_pdf_tools():
+    from langchain_community.document_loaders import PyPDFLoader
+    try:
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+    except ImportError:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+    return PyPDFLoader, RecursiveCharacterTextSplitter
+
+def _import_embeddings():
+    from langchain_huggingface import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings
+
+def _import_astra():
+    from langchain_astradb import AstraDBVectorStore
+    return AstraDBVectorStore
+
+def _import_local_store():
+    from local_store import LocalVectorStore
+    return LocalVectorStore
+
+def _import_quantized_store():
+    from quantized_store import QuantizedVectorStore
+    return QuantizedVectorStore
+
+def _import_snapshot():
+    import snapshot
+    return snapshot
+
+def _import_reranker():
+    from rerank import Reranker
+    return Reranker
+
+def _import_groq():
+    from langchain_groq import ChatGroq
+    return ChatGroq
+
+
+# ─── Config ───────────────────────────────────────────────────────────────────
+CONFIG_KEYS = {
+    "groq_api_key": "GROQ_API_KEY",
+    "groq_api_base": "GROQ_API_BASE",
+    "astra_token": "ASTRA_DB_APPLICATION_TOKEN",
+    "astra_endpoint": "ASTRA_DB_API_ENDPOINT",
+    "data_dir": "PAGEWISE_DATA_DIR",
+    "tenant": "PAGEWISE_TENANT",
+    "tenant_mode": "PAGEWISE_TENANT_MODE",
+    "vector_store": "PAGEWISE_VECTOR_STORE",
+    "embedding_model": "PAGEWISE_EMBEDDING_MODEL",
+    "embedding_version": "PAGEWISE_EMBEDDING_VERSION",
+    "vector_quantization": "PAGEWISE_VECTOR_QUANTIZATION",
+    "snapshot": "PAGEWISE_SNAPSHOT",
+    "shared_partition": "PAGEWISE_SHARED_PARTITION",
+    "rerank_model": "PAGEWISE_RERANK_MODEL",
+    "rerank_candidates": "PAGEWISE_RERANK_CANDIDATES",
+    "progressive_pages": "PAGEWISE_PROGRESSIVE_PAGES",
+    "partition_ttl_hours": "PAGEWISE_PARTITION_TTL_HOURS",
+    "metrics_port": "PAGEWISE_METRICS_PORT",
+    "metrics_host": "PAGEWISE_METRICS_HOST",
+}
+
+DEFAULT_CONFIG = {
+    "groq_api_key": "",
+    "groq_api_base": "",
+    "astra_token": "",
+    "astra_endpoint": "",
+    "collection_name": "pdf_intelligence_docs",
+    "embedding_model": "sentence-transformers/all-MiniLM-L6-v2",
+    "embedding_version": "1",  # bump when vectors change without a model rename
+    "llm_model": "llama-3.3-70b-versatile",
+    "chunk_size": 1000,
+    "chunk_overlap": 150,
+    "data_dir": ".pagewise",   # local state: upload spool, document registry
+    "tenant": "default",
+    "tenant_mode": "metadata", # "metadata" (shared collection) | "collection"
+    "vector_store": "astra",   # "astra" | "local" (in-process NumPy index)
+    "vector_quantization": "none",  # local store: "none" | "int8" | "binary" (rescored from disk)
+    "snapshot": "",            # local store: index snapshot directory to serve (see snapshot.py)
+    "shared_partition": "shared",  # partition every session searches too: ingest.py corpora, snapshots
+    "rerank_model": "",        # cross-encoder for a rerank stage, e.g. cross-encoder/ms-marco-MiniLM-L-6-v2
+    "rerank_candidates": 20,   # chunks retrieved for the reranker to choose k from
+    "progressive_pages": 25,   # uploads: pages indexed before returning, the rest in background; 0 = all
+    "partition_ttl_hours": 24.0,  # session partitions unused this long are dropped; 0 = keep forever
+    "metrics_port": 9464,      # Prometheus /metrics endpoint; 0 disables
+    "metrics_host": "127.0.0.1",
+}
+
+TENANT_MODES = ("metadata", "collection")
+VECTOR_STORES = ("astra", "local")
+QUANTIZATIONS = ("none", "int8", "binary")
+
+
+def load_secrets_file(path: str = ".streamlit/secrets.toml") -> dict:
+    """Read a Streamlit-style secrets.toml without importing Streamlit."""
+    import tomllib
+    try:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    except (FileNotFoundError, tomllib.TOMLDecodeError):
+        return {}
+
+
+def _coerce(value, default):
+    """Secrets and env vars arrive as strings; match the default's type."""
+    if isinstance(default, bool):
+        return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes", "on")
+    if isinstance(default, (int, float)) and not isinstance(value, (int, float)):
+        return type(default)(value)
+    return value
+
+
+def load_config(secrets: dict = None, **overrides) -> dict:
+    """
+    Build an engine config. Values come from `overrides`, then `secrets`,
+    then the environment, then DEFAULT_CONFIG. The result is a plain dict,
+    so it can be pickled into worker processes.
+    """
+    secrets = secrets or {}
+    config = dict(DEFAULT_CONFIG)
+    for field, key in CONFIG_KEYS.items():
+        # Presence, not truthiness: a TOML `= 0` or `= false` is a setting
+        value = secrets.get(key)
+        if value in ("", None):
+            value = os.environ.get(key, "")
+        if value not in ("", None):
+            config[field] = _coerce(value, DEFAULT_CONFIG[field])
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    if config["tenant_mode"] not in TENANT_MODES:
+        raise ValueError(f"tenant_mode must be one of {TENANT_MODES}, got {config['tenant_mode']!r}")
+    if config["vector_store"] not in VECTOR_STORES:
+        raise ValueError(f"vector_store must be one of {VECTOR_STORES}, got {config['vector_store']!r}")
+    if config["vector_quantization"] not in QUANTIZATIONS:
+        raise ValueError(f"vector_quantization must be one of {QUANTIZATIONS}, "
+                         f"got {config['vector_quantization']!r}")
+    if config["snapshot"] and config["vector_quantization"] != "none":
+        raise ValueError("snapshot and vector_quantization cannot be combined: a snapshot is served "
+                         "from its memory-mapped float32 vectors")
+    return config
+
+
+# ─── Embeddings (cached per process) ──────────────────────────────────────────
+_EMBEDDINGS_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _load_embeddings(model_name: str):
+    HuggingFaceEmbeddings = _import_embeddings()
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs={"device": "cpu"},
+        encode_kwargs={"normalize_embeddings": True},
+    )
+
+
+metrics.track_lru_cache("embedding_model", _load_embeddings)
+
+
+@functools.lru_cache(maxsize=2)
+def _load_reranker(model_name: str):
+    return _import_reranker()(model_name)
+
+
+metrics.track_lru_cache("rerank_model", _load_reranker)
+
+
+def get_reranker(config: dict):
+    """Shared cross-encoder reranker, or None when config["rerank_model"] is unset."""
+    if not config["rerank_model"]:
+        return None
+    with _EMBEDDINGS_LOCK:
+        return _load_reranker(config["rerank_model"])
+
+
+def get_embeddings(model_name: str = DEFAULT_CONFIG["embedding_model"]):
+    # Serialized so a request arriving mid warm-up waits for that load
+    # instead of loading a second copy of the model
+    with _EMBEDDINGS_LOCK:
+        return _load_embeddings(model_name)
+
+
+# ─── Vector Store ─────────────────────────────────────────────────────────────
+# Tenancy is chosen by config["tenant_mode"]:
+#   "metadata"   — one shared collection; chunks carry a tenant tag that is
+#                  pushed into every search filter.
+#   "collection" — one collection per tenant, so search cost only depends on
+#                  that tenant's corpus.
+# Either way, store handles are pooled per process and shared by sessions.
+TENANT_KEY = "tenant"
+_STORES = {}
+_STORES_LOCK = threading.Lock()
+
+
+def base_collection(config: dict) -> str:
+    """Configured collection for `config`'s tenant, before any embedding migration."""
+    if config["tenant_mode"] != "collection":
+        return config["collection_name"]
+    # Astra collection names: letters, digits and underscores, at most 48 chars.
+    # Slugging and truncation can map two tenants to one name ("a-b", "a.b"),
+    # so a digest of the raw tenant keeps their collections apart
+    tenant = str(config["tenant"])
+    prefix = f"{config['collection_name']}_{re.sub(r'[^A-Za-z0-9_]', '_', tenant)}"
+    return f"{prefix[:39]}_{hashlib.md5(tenant.encode()).hexdigest()[:8]}"
+
+
+def tenant_collection(config: dict) -> str:
+    """Collection holding `config`'s tenant (the live one, once live_config() has run)."""
+    return config.get("collection") or base_collection(config)
+
+
+def open_vector_store(config: dict):
+    """Open a new handle to the tenant's collection."""
+    if config["vector_store"] == "local":
+        # In-process index: nothing to connect to, contents live with the process
+        if config["snapshot"]:
+            # Memory-mapped from disk: shared page cache, no rebuild on restart
+            return _import_snapshot().open_store(config, config["snapshot"])
+        embeddings = get_embeddings(config["embedding_model"])
+        if config["vector_quantization"] != "none":
+            # Codes in RAM, full-precision rows in a scratch file for rescoring
+            rescore_dir = os.path.join(config["data_dir"], "vectors")
+            os.makedirs(rescore_dir, exist_ok=True)
+            return _import_quantized_store()(embeddings, config["vector_quantization"], rescore_dir=rescore_dir)
+        return _import_local_store()(embeddings)
+
+    AstraDBVectorStore = _import_astra()
+
+    if not config["astra_token"] or not config["astra_endpoint"]:
+        raise ValueError("Missing AstraDB credentials. Please set ASTRA_DB_APPLICATION_TOKEN and ASTRA_DB_API_ENDPOINT.")
+
+    return AstraDBVectorStore(
+        embedding=get_embeddings(config["embedding_model"]),
+        collection_name=tenant_collection(config),
+        token=config["astra_token"],
+        api_endpoint=config["astra_endpoint"],
+    )
+
+
+def get_vector_store(config: dict):
+    """Pooled handle to the tenant's collection, shared across sessions."""
+    key = (config["vector_store"], config["vector_quantization"], config["snapshot"], config["astra_endpoint"],
+           config["astra_token"], tenant_collection(config), config["embedding_model"])
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = open_vector_store(config)
+        return _STORES[key]
+
+
+# ─── Embedding Versions ───────────────────────────────────────────────────────
+# Every chunk is stamped with the model and version that embedded it. The
+# registry records which collection and model are live for each base
+# collection; migration.py re-embeds into a shadow collection and flips that
+# record in one transaction, so readers switch over on their next lookup.
+# Before its final copy pass the migration pauses writes: uploads fail fast
+# (and in-flight jobs at their next batch) until the cutover, rather than
+# being recorded as indexed in a collection the copy has already passed.
+def embedding_stamp(config: dict) -> dict:
+    return {"embedding_model": config["embedding_model"], "embedding_version": str(config["embedding_version"])}
+
+
+def shadow_collection(config: dict, model: str, version: str) -> str:
+    """Deterministic collection name for the base collection re-embedded with (model, version)."""
+    digest = hashlib.md5(f"{model}@{version}".encode()).hexdigest()[:8]
+    return f"{base_collection(config)[:38]}_e{digest}"
+
+
+def live_config(config: dict) -> dict:
+    """
+    `config` with the collection and embedding model currently live for
+    its base collection. The first call records `config`'s own model as
+    live, so changing PAGEWISE_EMBEDDING_MODEL alone never mixes vectors.
+    """
+    live = get_registry(config).live_embedding(base_collection(config), {
+        "collection": base_collection(config), **embedding_stamp(config),
+    })
+    return {**config, **live}
+
+
+def clear_store(vstore):
+    """Delete every vector in the store's collection (all partitions)."""
+    vstore.clear()
+
+
+# ─── Partitions ───────────────────────────────────────────────────────────────
+# Every chunk is tagged with the partition it was ingested into and every
+# search is filtered to one partition. Resetting a knowledge base swaps to a
+# fresh partition id; the old partition is deleted in the background.
+PARTITION_KEY = "partition"
+_DROPPER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pagewise-drop")
+
+
+def new_partition() -> str:
+    return uuid.uuid4().hex
+
+
+def partition_filter(partition: str = None):
+    """Metadata filter restricting a search to `partition` (None = whole collection)."""
+    return {PARTITION_KEY: partition} if partition else None
+
+
+def scope(config: dict, partition: str = None) -> dict:
+    """
+    Metadata that scopes chunks to a tenant and optional partition. Used
+    both as the tags written at ingest and as the filter applied at search.
+    """
+    tags = {}
+    if config["tenant_mode"] == "metadata":
+        tags[TENANT_KEY] = config["tenant"]
+    if partition:
+        tags[PARTITION_KEY] = partition
+    return tags
+
+
+def search_scope(config: dict, partition: str = None) -> dict:
+    """
+    Search filter for a session partition: its own chunks plus those of the
+    shared partition, where ingest.py and snapshots load corpora for all.
+    """
+    tags = scope(config, partition)
+    shared = config["shared_partition"]
+    if partition and partition != shared:
+        tags[PARTITION_KEY] = {"$in": [partition, shared]}
+    return tags
+
+
+def search_scope_keys(config: dict, partition: str = None) -> list:
+    """Registry keys of the scopes `search_scope` covers."""
+    keys = [scope_key(config, partition)]
+    if partition and partition != config["shared_partition"]:
+        keys.append(scope_key(config, config["shared_partition"]))
+    return keys
+
+
+def scope_key(config: dict, partition: str = None) -> str:
+    """Registry key for a scope: collection plus its metadata tags."""
+    tags = scope(config, partition)
+    return "/".join([tenant_collection(config)] + [f"{k}={tags[k]}" for k in sorted(tags)])
+
+
+def delete_where(vstore, metadata_filter: dict) -> int:
+    """Delete every vector matching `metadata_filter`, counting store failures."""
+    try:
+        return vstore.delete_by_metadata_filter(metadata_filter)
+    except Exception:
+        metrics.STORE_ERRORS.inc(op="delete")
+        raise
+
+
+def drop_partition(vstore, partition: str) -> int:
+    """Delete every vector tagged with `partition`. Returns the number deleted."""
+    return delete_where(vstore, partition_filter(partition))
+
+
+def drop_partition_async(vstore, partition: str):
+    """Queue `drop_partition` on a background thread. Returns a Future."""
+    return _DROPPER.submit(drop_partition, vstore, partition)
+
+
+# ─── Document Registry ────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=None)
+def _open_registry(path: str) -> DocumentRegistry:
+    return DocumentRegistry(path)
+
+
+def get_registry(config: dict) -> DocumentRegistry:
+    """Process-wide handle to the registry under config["data_dir"]."""
+    if config["vector_store"] == "local":
+        # The local index lives in process memory, so must its registry
+        return _open_registry(":memory:")
+    os.makedirs(config["data_dir"], exist_ok=True)
+    return _open_registry(os.path.abspath(os.path.join(config["data_dir"], "registry.sqlite3")))
+
+
+def remove_document(config: dict, vstore, doc_id: str, partition: str = None):
+    """Forget `doc_id` in the registry and delete its vectors in the background."""
+    jobs = _cancel_jobs(scope_key(config, partition), doc_id)
+    get_registry(config).remove(scope_key(config, partition), doc_id)
+    doc_filter = {**scope(config, partition), "doc_id": doc_id}
+    return _DROPPER.submit(_after, jobs, delete_where, vstore, doc_filter)
+
+
+def forget_partition(config: dict, vstore, partition: str):
+    """Forget a partition in the registry and drop its vectors in the background."""
+    jobs = _cancel_jobs(scope_key(config, partition))
+    registry = get_registry(config)
+    registry.remove_scope(scope_key(config, partition))
+    registry.remove_partition(scope_key(config), partition)
+    return _DROPPER.submit(_after, jobs, drop_partition, vstore, partition)
+
+
+def touch_partition(config: dict, partition: str):
+    """Mark a session partition as in use, keeping it out of `sweep_partitions`."""
+    get_registry(config).touch_partition(scope_key(config), partition)
+
+
+def sweep_partitions(config: dict) -> list:
+    """
+    Forget every session partition unused for config["partition_ttl_hours"]
+    (sessions that ended without a reset) and drop their vectors in the
+    background. Returns the partitions swept.
+    """
+    if not config["partition_ttl_hours"]:
+        return []
+    idle = get_registry(config).idle_partitions(scope_key(config),
+                                                time.time() - config["partition_ttl_hours"] * 3600)
+    for partition in idle:
+        forget_partition(config, get_vector_store(config), partition)
+    return idle
+
+
+# ─── PDF Ingestion ────────────────────────────────────────────────────────────
+def make_splitter(config: dict):
+    _, RecursiveCharacterTextSplitter = _import_pdf_tools()
+    return RecursiveCharacterTextSplitter(
+        chunk_size=config["chunk_size"],
+        chunk_overlap=config["chunk_overlap"],
+        separators=["\n\n", "\n", ". ", " ", ""],
+        length_function=len,
+    )
+
+
+def chunk_id(doc_id: str, page: int, n: int, tags: dict = None) -> str:
+    """
+    Deterministic id of the n-th chunk of a page, so re-ingesting upserts in
+    place. Scoped by `tags` so the same document in two partitions of a
+    shared collection does not collide.
+    """
+    return scoped_id(f"{doc_id}:{page}:{n}", tags)
+
+
+def scoped_id(local_id: str, tags: dict = None) -> str:
+    """`local_id` prefixed with a digest of `tags` (unchanged without tags)."""
+    if not tags:
+        return local_id
+    prefix = hashlib.md5(repr(sorted(tags.items())).encode()).hexdigest()[:10]
+    return f"{prefix}/{local_id}"
+
+
+def split_file(splitter, path: str, fname: str, doc_id: str, tags: dict = None, on_progress=None,
+               stamp: dict = None) -> tuple:
+    """
+    Load and split one PDF. Chunks carry source_file, doc_id, page,
+    `tags` and `stamp` metadata, and a deterministic `id` (from `tags`
+    only, so re-embedding keeps ids stable).
+
+    Returns:
+        tuple: (pages, chunks) as lists of Documents
+    """
+    PyPDFLoader, _ = _import_pdf_tools()
+    notify = on_progress or (lambda stage, fname, **info: None)
+
+    notify("splitting", fname)
+    pages = PyPDFLoader(path).load()
+
+    notify("embedding", fname, pages=len(pages))
+    return pages, split_pages(splitter, pages, fname, doc_id, tags, stamp)
+
+
+def split_pages(splitter, pages: list, fname: str, doc_id: str, tags: dict = None, stamp: dict = None) -> list:
+    """Tag loaded pages (in place) and split them into chunks with deterministic ids."""
+    for page in pages:
+        page.metadata["source_file"] = fname
+        page.metadata["doc_id"] = doc_id
+        if tags:
+            page.metadata.update(tags)
+        if stamp:
+            page.metadata.update(stamp)
+
+    chunks = splitter.split_documents(pages)
+
+    per_page = {}
+    for chunk in chunks:
+        page = chunk.metadata.get("page", 0)
+        chunk.id = chunk_id(doc_id, page, per_page.get(page, 0), tags)
+        per_page[page] = per_page.get(page, 0) + 1
+
+    return chunks
+
+
+def ingest_file(vstore, splitter, path: str, fname: str, doc_id: str, on_progress=None,
+                tags: dict = None, stamp: dict = None) -> dict:
+    """
+    Load, split and store one PDF from disk.
+
+    Args:
+        on_progress: optional callback(stage, fname, **info) where stage is
+            "splitting", "embedding" or "storing"
+        tags: extra chunk metadata, normally `scope(config, partition)`
+        stamp: metadata outside the chunk id, normally `embedding_stamp(config)`
+
+    Returns:
+        dict: {pages: int, chunks: int}
+    """
+    notify = on_progress or (lambda stage, fname, **info: None)
+    start = time.perf_counter()
+    pages, chunks = split_file(splitter, path, fname, doc_id, tags, notify, stamp)
+
+    notify("storing", fname, chunks=len(chunks))
+    store_chunks(vstore, chunks)
+
+    elapsed = time.perf_counter() - start
+    metrics.INGEST_PAGES.inc(len(pages))
+    metrics.INGEST_CHUNKS.inc(len(chunks))
+    metrics.INGEST_BUSY.inc(elapsed)
+    metrics.INGEST_SECONDS.observe(elapsed)
+
+    return {"pages": len(pages), "chunks": len(chunks)}
+
+
+def store_chunks(vstore, chunks: list):
+    try:
+        vstore.add_documents(chunks, ids=[chunk.id for chunk in chunks])
+    except Exception:
+        metrics.STORE_ERRORS.inc(op="add")
+        raise
+
+
+def update_metadata(vstore, id_to_metadata: dict):
+    try:
+        vstore.update_metadata(id_to_metadata)
+    except Exception:
+        metrics.STORE_ERRORS.inc(op="update")
+        raise
+
+
+def delete_ids(vstore, ids: list):
+    try:
+        vstore.delete(ids=ids)
+    except Exception:
+        metrics.STORE_ERRORS.inc(op="delete")
+        raise
+
+
+def ingest_tracked(config: dict, vstore, splitter, path: str, fname: str, doc_id: str,
+                   content_hash: str, partition: str = None, on_progress=None) -> dict:
+    """
+    `ingest_file` with registry bookkeeping. Skips documents already indexed
+    in this scope with the same content and embedding model; for a doc_id
+    whose content changed, re-embeds only the pages that differ (see Page
+    Deltas).
+
+    Returns:
+        dict: {pages: int, chunks: int, embedded_pages: int, skipped: bool}
+    """
+    key = scope_key(config, partition)
+    tags = scope(config, partition)
+
+    cached = _registry_hit(config, partition, doc_id, content_hash)
+    if cached:
+        return cached
+    get_registry(config).check_writable(key)
+    previous = previous_pages(config, vstore, key, tags, doc_id, fname)
+
+    PyPDFLoader, _ = _import_pdf_tools()
+    notify = on_progress or (lambda stage, fname, **info: None)
+    start = time.perf_counter()
+    notify("splitting", fname)
+    pages = PyPDFLoader(path).load()
+
+    notify("embedding", fname, pages=len(pages))
+    delta = store_page_delta(config, vstore, splitter, key, pages, fname, doc_id, tags,
+                             embedding_stamp(config), previous)
+    drop_removed_pages(config, vstore, key, doc_id, tags, previous, len(pages))
+
+    elapsed = time.perf_counter() - start
+    metrics.INGEST_PAGES.inc(delta["embedded_pages"])
+    metrics.INGEST_CHUNKS.inc(delta["embedded_chunks"])
+    metrics.INGEST_BUSY.inc(elapsed)
+    metrics.INGEST_SECONDS.observe(elapsed)
+
+    get_registry(config).record(key, doc_id, fname, content_hash, len(pages), delta["chunks"],
+                                config["embedding_model"])
+    return {"pages": len(pages), "chunks": delta["chunks"], "embedded_pages": delta["embedded_pages"],
+            "skipped": False}
+
+
+def _registry_hit(config: dict, partition: str, doc_id: str, content_hash: str):
+    """
+    Stats of an unchanged, already indexed document, or None. A document new
+    to a session partition also hits when the shared partition, which every
+    session searches, already holds the same content under any doc_id.
+    """
+    registry = get_registry(config)
+    entry = registry.get(scope_key(config, partition), doc_id)
+    if entry is None and partition and partition != config["shared_partition"]:
+        entry = registry.find_content(scope_key(config, config["shared_partition"]), content_hash,
+                                      config["embedding_model"])
+    if entry and entry["content_hash"] == content_hash and entry["embedding_model"] == config["embedding_model"]:
+        metrics.CACHE.inc(cache="ingest_registry", result="hit")
+        return {"pages": entry["pages"], "chunks": entry["chunks"], "embedded_pages": 0, "skipped": True}
+    metrics.CACHE.inc(cache="ingest_registry", result="miss")
+    return None
+
+
+def ingest_job(config: dict, files: list, threads: int = 1) -> dict:
+    """
+    Ingest `files` ([{path, name, id, content_hash?}, ...]) on up to
+    `threads` threads, through this process's pooled store handle.
+    Takes and returns only plain data, so it can run in a process pool.
+    Chunks are scoped to the config's tenant and optional "partition".
+
+    Returns:
+        dict mapping doc_id -> {pages, chunks, skipped} or {error}
+    """
+    vstore = get_vector_store(config)
+    splitter = make_splitter(config)
+
+    def _one(f):
+        try:
+            return f["id"], ingest_tracked(
+                config, vstore, splitter, f["path"], f["name"], f["id"],
+                f.get("content_hash") or file_hash(f["path"]), partition=config.get("partition"),
+            )
+        except Exception as e:
+            return f["id"], {"error": str(e)[:500]}
+
+    if threads <= 1:
+        return dict(map(_one, files))
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="ingest") as pool:
+        return dict(pool.map(_one, files))
+
+
+# ─── Page Deltas ──────────────────────────────────────────────────────────────
+# The registry keeps a fingerprint and chunk count for every stored page. A
+# new version of a document (same doc_id and embedding model) re-embeds only
+# the pages whose text changed, upserting over their old chunk ids, then
+# deletes the chunk ids the shorter or removed pages no longer use. When the
+# version has a new file name, the chunks of unchanged pages get the new
+# source_file in place. Pages are compared by position, so inserting a page
+# re-embeds everything after it.
+def page_fingerprint(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8", "replace")).hexdigest()
+
+
+def previous_pages(config: dict, vstore, key: str, tags: dict, doc_id: str, fname: str) -> dict:
+    """
+    {page: (fingerprint, chunks)} an update of `doc_id` can reuse; {} after
+    deleting whatever is stored when it cannot (new model, or no page
+    records).
+    """
+    registry = get_registry(config)
+    entry = registry.get(key, doc_id)
+    previous = registry.pages(key, doc_id)
+    if entry and previous and entry["embedding_model"] == config["embedding_model"]:
+        registry.mark_stale(key, doc_id)
+        return previous
+    if entry or previous:
+        delete_where(vstore, {**tags, "doc_id": doc_id})
+        registry.forget_pages(key, doc_id)
+    return {}
+
+
+def store_page_delta(config: dict, vstore, splitter, key: str, pages: list, fname: str, doc_id: str,
+                     tags: dict = None, stamp: dict = None, previous: dict = None) -> dict:
+    """
+    Split, embed and store the loaded `pages` whose text differs from
+    `previous`, drop chunk ids they no longer fill, and record their
+    fingerprints. Kept chunks recorded under another name are renamed.
+
+    Returns:
+        dict: {embedded_pages, embedded_chunks, chunks} with chunks counting every page in `pages`
+    """
+    previous = previous or {}
+    prints, changed = {}, []
+    for page in pages:
+        n = page.metadata.get("page", 0)
+        prints[n] = page_fingerprint(page.page_content)
+        if previous.get(n, ("",))[0] != prints[n]:
+            changed.append(page)
+    metrics.CACHE.inc(len(pages) - len(changed), cache="page_fingerprint", result="hit")
+    metrics.CACHE.inc(len(changed), cache="page_fingerprint", result="miss")
+
+    chunks = split_pages(splitter, changed, fname, doc_id, tags, stamp)
+    counts = {page.metadata.get("page", 0): 0 for page in changed}
+    for chunk in chunks:
+        counts[chunk.metadata.get("page", 0)] += 1
+    if chunks:
+        store_chunks(vstore, chunks)
+    stale = [chunk_id(doc_id, page, n, tags) for page, count in counts.items()
+             for n in range(count, previous.get(page, ("", 0))[1])]
+    if stale:
+        delete_ids(vstore, stale)
+    if counts:
+        get_registry(config).record_pages(key, doc_id, {page: (prints[page], counts[page]) for page in counts})
+
+    kept_pages = [p for p in prints if p not in counts]
+    entry = get_registry(config).get(key, doc_id) if kept_pages else None
+    if entry and entry["name"] != fname:
+        # The document's row keeps the old name until the version is recorded
+        update_metadata(vstore, {chunk_id(doc_id, page, n, tags): {"source_file": fname}
+                                 for page in kept_pages for n in range(previous[page][1])})
+    kept = sum(previous[p][1] for p in kept_pages)
+    return {"embedded_pages": len(changed), "embedded_chunks": len(chunks), "chunks": kept + len(chunks)}
+
+
+def drop_removed_pages(config: dict, vstore, key: str, doc_id: str, tags: dict, previous: dict, pages: int):
+    """Delete the chunks and page records of `previous` pages at or beyond `pages` (the new length)."""
+    removed = [page for page in previous if page >= pages]
+    if not removed:
+        return
+    delete_ids(vstore, [chunk_id(doc_id, page, n, tags) for page in removed for n in range(previous[page][1])])
+    get_registry(config).forget_pages(key, doc_id, removed)
+
+
+# ─── Progressive Ingestion ────────────────────────────────────────────────────
+# Uploads store the first config["progressive_pages"] pages before returning;
+# the remaining pages are split, embedded and stored on a background thread
+# in batches of the same size, each searchable as soon as it lands. The
+# registry records a document only once every page is in, so an interrupted
+# job is simply redone on the next upload, from the page records of the
+# batches it did store.
+_BACKGROUND = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pagewise-ingest")
+_JOBS = {}   # (scope key, doc_id) -> ProgressiveIngest
+_JOBS_LOCK = threading.Lock()
+_JOB_TTL = 600.0   # seconds a finished job's coverage stays readable
+
+
+def count_pages(path: str) -> int:
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+
+class ProgressiveIngest:
+    """One document indexed front to back, its tail pages in the background."""
+
+    def __init__(self, config: dict, vstore, splitter, path: str, fname: str, doc_id: str,
+                 content_hash: str, partition: str = None, total_pages: int = 0, previous: dict = None):
+        PyPDFLoader, _ = _import_pdf_tools()
+        self.config, self.vstore, self.splitter = config, vstore, splitter
+        self.fname, self.doc_id, self.content_hash = fname, doc_id, content_hash
+        self.key = scope_key(config, partition)
+        self.tags = scope(config, partition)
+        self.stamp = embedding_stamp(config)
+        self.batch_pages = config["progressive_pages"]
+        self.total_pages = total_pages
+        self.previous = previous or {}
+        self.indexed_pages = self.embedded_pages = self.chunks = 0
+        self.busy_s = 0.0
+        self.state = "indexing"   # "indexing" | "ready" | "failed" | "cancelled"
+        self.error = None
+        self.finished = None
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self._pages = PyPDFLoader(path).lazy_load()
+
+    def store_next(self) -> int:
+        """Split, embed and store the next batch of pages. Returns pages stored (0 at the end)."""
+        start = time.perf_counter()
+        pages = list(itertools.islice(self._pages, self.batch_pages))
+        if not pages:
+            return 0
+        delta = store_page_delta(self.config, self.vstore, self.splitter, self.key, pages, self.fname,
+                                 self.doc_id, self.tags, self.stamp, self.previous)
+        self.indexed_pages += len(pages)
+        self.embedded_pages += delta["embedded_pages"]
+        self.chunks += delta["chunks"]
+
+        elapsed = time.perf_counter() - start
+        self.busy_s += elapsed
+        metrics.INGEST_PAGES.inc(delta["embedded_pages"])
+        metrics.INGEST_CHUNKS.inc(delta["embedded_chunks"])
+        metrics.INGEST_BUSY.inc(elapsed)
+        return len(pages)
+
+    def run(self, on_done=None):
+        """Store the remaining pages, then record the document (unless cancelled)."""
+        try:
+            while not self.cancelled.is_set() and self.store_next():
+                pass
+            if not self.cancelled.is_set():
+                drop_removed_pages(self.config, self.vstore, self.key, self.doc_id, self.tags, self.previous,
+                                   self.indexed_pages)
+            with _JOBS_LOCK:
+                # Under the lock, so a cancel either wins or sees the record to remove
+                if self.cancelled.is_set():
+                    self.state = "cancelled"
+                else:
+                    get_registry(self.config).record(self.key, self.doc_id, self.fname, self.content_hash,
+                                                     self.indexed_pages, self.chunks,
+                                                     self.config["embedding_model"])
+                    metrics.INGEST_SECONDS.observe(self.busy_s)
+                    self.state = "ready"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)[:200]
+        finally:
+            # Release before signalling, so a waiter never sees a finished job still holding its upload
+            try:
+                if on_done:
+                    on_done()
+            finally:
+                self.finished = time.time()
+                self.done.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.done.wait(timeout)
+
+    def coverage(self) -> dict:
+        return {
+            "state": self.state,
+            "indexed_pages": self.indexed_pages,
+            "embedded_pages": self.embedded_pages,
+            "total_pages": self.total_pages,
+            "chunks": self.chunks,
+            "error": self.error,
+        }
+
+
+def ingest_progressive(config: dict, vstore, splitter, path: str, fname: str, doc_id: str,
+                       content_hash: str, partition: str = None, on_progress=None, on_done=None) -> dict:
+    """
+    `ingest_tracked` for interactive uploads: returns once the first
+    config["progressive_pages"] pages are stored and indexes the rest in
+    the background (see ingest_status). `on_done()` runs once nothing
+    reads `path` any more, e.g. to release the upload's bytes.
+
+    Returns:
+        dict: {pages, indexed_pages, embedded_pages, chunks, skipped, pending}
+    """
+    notify = on_progress or (lambda stage, fname, **info: None)
+    finish = on_done or (lambda: None)
+    first = config["progressive_pages"]
+    key = scope_key(config, partition)
+
+    with _JOBS_LOCK:
+        for stale in [k for k, job in _JOBS.items() if job.finished and time.time() - job.finished > _JOB_TTL]:
+            del _JOBS[stale]
+        running = _JOBS.get((key, doc_id))
+    if running and running.state == "indexing":
+        if running.content_hash == content_hash:
+            finish()
+            return {"pages": running.total_pages, "indexed_pages": running.indexed_pages,
+                    "embedded_pages": running.embedded_pages, "chunks": running.chunks,
+                    "skipped": True, "pending": True}
+        # A new version while the old one is still streaming in: stop it; the
+        # pages it stored are recorded, so the new version diffs against them
+        for job in _cancel_jobs(key, doc_id):
+            job.wait()
+
+    handed_off = False
+    try:
+        total = count_pages(path)
+        if not first or total <= first:
+            stats = ingest_tracked(config, vstore, splitter, path, fname, doc_id, content_hash,
+                                   partition, on_progress)
+            return {**stats, "indexed_pages": stats["pages"], "pending": False}
+
+        cached = _registry_hit(config, partition, doc_id, content_hash)
+        if cached:
+            return {**cached, "indexed_pages": cached["pages"], "pending": False}
+        get_registry(config).check_writable(key)
+        previous = previous_pages(config, vstore, key, scope(config, partition), doc_id, fname)
+
+        notify("splitting", fname)
+        job = ProgressiveIngest(config, vstore, splitter, path, fname, doc_id, content_hash, partition, total,
+                                previous)
+        notify("embedding", fname, pages=first)
+        job.store_next()
+
+        with _JOBS_LOCK:
+            _JOBS[(key, doc_id)] = job
+        _BACKGROUND.submit(job.run, finish)
+        handed_off = True
+    finally:
+        # Small, unchanged or failed uploads are done with `path` here; job.run releases the rest
+        if not handed_off:
+            finish()
+    return {"pages": total, "indexed_pages": job.indexed_pages, "embedded_pages": job.embedded_pages,
+            "chunks": job.chunks, "skipped": False, "pending": True}
+
+
+def ingest_status(config: dict, doc_id: str, partition: str = None):
+    """Coverage of a progressive ingest in this process (see ProgressiveIngest.coverage), or None."""
+    with _JOBS_LOCK:
+        job = _JOBS.get((scope_key(config, partition), doc_id))
+    return job.coverage() if job else None
+
+
+def _cancel_jobs(key: str, doc_id: str = None) -> list:
+    """Stop background ingests in scope `key` (one doc or all). Returns them, to wait on."""
+    with _JOBS_LOCK:
+        jobs = [k for k in _JOBS if k[0] == key and (doc_id is None or k[1] == doc_id)]
+        jobs = [_JOBS.pop(k) for k in jobs]
+        for job in jobs:
+            job.cancelled.set()
+    return jobs
+
+
+def _after(jobs: list, fn, *args):
+    """Run fn(*args) once every job has stopped writing."""
+    for job in jobs:
+        job.wait()
+    return fn(*args)
+
+
+# ─── Mode Prompts ─────────────────────────────────────────────────────────────
+MODE_PROMPTS = {
+    "⚡ Factual Answer": {
+        "system": """You are PDF Intelligence, a precise document analysis AI.
+Answer the question DIRECTLY and CONCISELY based solely on the provided context.
+Do not add unnecessary elaboration. If the context doesn't contain the answer, say so clearly.
+Be factual and confident.""",
+        "temperature": 0.1,
+    },
+    "📋 Detailed Explanation": {
+        "system": """You are PDF Intelligence, a thorough document analysis AI.
+Provide a comprehensive, detailed explanation based on the provided context.
+Cover all relevant aspects, provide background where useful, and ensure completeness.
+Structure your response clearly with logical flow.""",
+        "temperature": 0.2,
+    },
+    "• Bullet Summary": {
+        "system": """You are PDF Intelligence, a document analysis AI.
+Format your response as a well-organized bullet list.
+Extract and present key points clearly and concisely.
+Use nested bullets for sub-points when appropriate.
+Start with a one-sentence summary, then bullets.""",
+        "temperature": 0.15,
+    },
+    "⚖ Compare Sections": {
+        "system": """You are PDF Intelligence, a document analysis AI specializing in comparison.
+Identify similarities and differences across the provided context sections.
+Use a structured format: first list similarities, then differences, then synthesis.
+Be precise about which source each point comes from.""",
+        "temperature": 0.15,
+    },
+    "📊 Executive Summary": {
+        "system": """You are PDF Intelligence, a document analysis AI.
+Create a concise executive summary suitable for a business briefing.
+Format: Key Finding (1-2 sentences), then 3-5 key takeaways, then a brief conclusion.
+Focus on actionable insights and high-level conclusions.""",
+        "temperature": 0.2,
+    },
+}
+
+
+# ─── Stream Policy ────────────────────────────────────────────────────────────
+# Hedge a second Groq request once the first token is later than the observed
+# p95 TTFT; the slower stream is cancelled as soon as one produces a token.
+STREAM_POLICY = {
+    **DEFAULT_STREAM_POLICY,
+    "hedge_after": "p95",
+}
+
+
+# ─── Build RAG Chain ──────────────────────────────────────────────────────────
+def make_chain(vstore, k: int = 3, strict: bool = False, mode: str = "⚡ Factual Answer",
+               search_filter: dict = None, reranker=None, candidates: int = 20):
+    """
+    Build the RAG retrieval chain over an explicit vector store. Pass
+    `scope(config, partition)` as `search_filter` to search one tenant/partition.
+    With a `reranker` (get_reranker), the retriever fetches `candidates`
+    chunks and `rerank_docs` keeps the best `k` of them.
+
+    Returns:
+        tuple: (chain_config dict, retriever)
+    """
+    search_kwargs = {"k": max(k, candidates) if reranker else k}
+    if search_filter:
+        search_kwargs["filter"] = search_filter
+
+    retriever = vstore.as_retriever(
+        search_type="similarity",
+        search_kwargs=search_kwargs,
+    )
+
+    mode_cfg = MODE_PROMPTS.get(mode, MODE_PROMPTS["⚡ Factual Answer"])
+    temperature = 0.05 if strict else mode_cfg["temperature"]
+
+    chain_config = {
+        "retriever": retriever,
+        "temperature": temperature,
+        "mode": mode,
+        "system_prompt": mode_cfg["system"],
+        "strict": strict,
+        "reranker": reranker,
+        "k": k,
+    }
+
+    return chain_config, retriever
+
+
+def rerank_docs(chain, question: str, docs: list) -> tuple:
+    """(best `k` docs, rerank info) through the chain's reranker; (docs, None) without one."""
+    reranker = chain.get("reranker")
+    if reranker is None or not docs:
+        return docs, None
+    return reranker.rerank(question, docs, chain["k"])
+
+
+# ─── Prompt & LLM ─────────────────────────────────────────────────────────────
+def build_prompt(chain, question: str, docs: list, chat_history: list) -> str:
+    """Assemble the full LLM prompt from retrieved docs and history."""
+    system_prompt = chain.get("system_prompt", "Answer based on context only.")
+    strict = chain.get("strict", False)
+
+    # Build context
+    context_parts = []
+    for doc in docs:
+        fname = doc.metadata.get("source_file", doc.metadata.get("source", "Unknown"))
+        page = doc.metadata.get("page", 0)
+        context_parts.append(f"[Source: {fname}, Page {page + 1}]\n{doc.page_content}")
+
+    context = "\n\n---\n\n".join(context_parts)
+
+    # Build conversation history string
+    history_str = ""
+    if chat_history:
+        pairs = []
+        for i in range(0, len(chat_history) - 1, 2):
+            if i + 1 < len(chat_history):
+                human_msg = chat_history[i][1] if isinstance(chat_history[i], tuple) else chat_history[i]
+                ai_msg = chat_history[i+1][1] if isinstance(chat_history[i+1], tuple) else chat_history[i+1]
+                pairs.append(f"Human: {human_msg}\nAssistant: {ai_msg}")
+        if pairs:
+            history_str = "\n\n".join(pairs[-4:])  # last 4 exchanges
+
+    # Build full prompt
+    strict_instruction = "\nIMPORTANT: Answer ONLY from the provided context. Do not use external knowledge." if strict else ""
+
+    return f"""{system_prompt}{strict_instruction}
+
+CONVERSATION HISTORY:
+{history_str if history_str else "No previous conversation."}
+
+RETRIEVED CONTEXT:
+{context if context else "No relevant context found in the documents."}
+
+QUESTION: {question}
+
+If the context doesn't contain relevant information, respond: "I couldn't find relevant information in your documents for this question."
+
+Answer:"""
+
+
+@functools.lru_cache(maxsize=16)
+def _get_llm(groq_key: str, api_base: str, model_name: str, temperature: float):
+    """Shared ChatGroq client per temperature, so HTTP connection pools are reused."""
+    ChatGroq = _import_groq()
+    return ChatGroq(
+        groq_api_key=groq_key,
+        groq_api_base=api_base or None,
+        model_name=model_name,
+        temperature=temperature,
+        streaming=True,
+        max_retries=0,  # retries are handled by resilient_stream
+        timeout=STREAM_POLICY["idle_timeout"],
+    )
+
+
+metrics.track_lru_cache("llm_client", _get_llm)
+
+
+def _llm_for(config: dict, chain):
+    if not config["groq_api_key"]:
+        raise ValueError("Missing GROQ_API_KEY. Please add it to Streamlit Secrets.")
+    return _get_llm(config["groq_api_key"], config["groq_api_base"], config["llm_model"],
+                    chain.get("temperature", 0.1))
+
+
+def _token_text(chunk) -> str:
+    return chunk.content if hasattr(chunk, 'content') else str(chunk)
+
+
+def stream_answer(config: dict, chain, full_prompt: str):
+    """Yield answer tokens for a prompt through the resilient Groq stream."""
+    llm = _llm_for(config, chain)
+
+    def _start_stream():
+        return text_tokens(_token_text(chunk) for chunk in llm.stream(full_prompt))
+
+    yield from resilient_stream(_start_stream, policy=STREAM_POLICY, on_event=metrics.stream_event)
+
+
+async def astream_answer(config: dict, chain, full_prompt: str):
+    """Async variant of `stream_answer`; attempts run as tasks, not threads."""
+    llm = _llm_for(config, chain)
+
+    async def _tokens():
+        async for chunk in llm.astream(full_prompt):
+            text = _token_text(chunk)
+            if text:   # see text_tokens
+                yield text
+
+    async for token in aresilient_stream(_tokens, policy=STREAM_POLICY, on_event=metrics.stream_event):
+        yield token
+
+
+# ─── Query ────────────────────────────────────────────────────────────────────
+async def aquery_events(config: dict, chain, retriever, question: str, chat_history: list):
+    """
+    Async query path: yields ("docs", docs) once retrieval (and reranking)
+    completes, then ("rerank", info) if the chain reranks, then
+    ("token", text) for each streamed answer token.
+    """
+    timer = metrics.QueryTimer()
+    outcome = "error"
+    try:
+        try:
+            docs = await retriever.ainvoke(question)
+        except Exception:
+            metrics.STORE_ERRORS.inc(op="search")
+            raise
+        timer.retrieved()
+        rerank_info = None
+        if chain.get("reranker"):
+            # CPU-bound: off the shared loop, so other sessions keep streaming
+            docs, rerank_info = await asyncio.get_running_loop().run_in_executor(
+                None, rerank_docs, chain, question, docs)
+            timer.reranked()
+        yield "docs", docs
+        if rerank_info:
+            yield "rerank", rerank_info
+
+        full_prompt = build_prompt(chain, question, docs, chat_history)
+        async for token in astream_answer(config, chain, full_prompt):
+            timer.token()
+            yield "token", token
+        outcome = "ok"
+    except (GeneratorExit, asyncio.CancelledError):
+        outcome = "cancelled"
+        raise
+    finally:
+        timer.finish(outcome)
+
+
+def answer_question(config: dict, chain, retriever, question: str, chat_history: list = None) -> dict:
+    """
+    Execute a RAG query without any UI, for batch and scripted use.
+
+    Returns:
+        dict: {answer, sources, retrieval_info, timings, error}
+    """
+    timer = metrics.QueryTimer()
+    try:
+        docs = retriever.invoke(question)
+    except Exception:
+        metrics.STORE_ERRORS.inc(op="search")
+        timer.finish("error")
+        raise
+    timer.retrieved()
+    docs, rerank_info = rerank_docs(chain, question, docs)
+    if rerank_info:
+        timer.reranked()
+
+    full_prompt = build_prompt(chain, question, docs, chat_history or [])
+
+    response_text, error = "", None
+    try:
+        for token in stream_answer(config, chain, full_prompt):
+            timer.token()
+            response_text += token
+    except Exception as e:
+        error = str(e)[:500]
+    timer.finish("error" if error else "ok")
+
+    return {
+        "answer": response_text,
+        "sources": extract_sources(docs, question),
+        "retrieval_info": build_retrieval_info(
+            docs=docs,
+            k=len(docs),
+            temperature=chain.get("temperature", 0.1),
+            strict=chain.get("strict", False),
+            mode=chain.get("mode", "⚡ Factual Answer"),
+            rerank=rerank_info,
+        ),
+        "timings": {**timer.timings(), **({"rerank_s": rerank_info["seconds"]} if rerank_info else {})},
+        "error": error,
+    }
+
+
+# ─── Helper: Source extraction ─────────────────────────────────────────────────
+def extract_sources(docs, query: str) -> list:
+    """Extract and score source documents."""
+    sources = []
+    query_words = set(query.lower().split())
+
+    for i, doc in enumerate(docs):
+        fname = doc.metadata.get("source_file", doc.metadata.get("source", "Unknown"))
+        page = doc.metadata.get("page", 0)
+
+        # Approximate similarity score based on keyword overlap
+        doc_words = set(doc.page_content.lower().split())
+        overlap = len(query_words & doc_words)
+        max_possible = max(len(query_words), 1)
+        base_score = min(0.95, 0.5 + (overlap / max_possible) * 0.45)
+
+        # Decay by rank
+        score = base_score * (1 - i * 0.08)
+        score = round(max(0.35, score), 3)
+
+        snippet = doc.page_content.strip()[:400]
+        if len(doc.page_content) > 400:
+            snippet += "..."
+
+        sources.append({
+            "filename": fname,
+            "page": page + 1,
+            "score": score,
+            "snippet": snippet,
+            "chunk_text": doc.page_content,
+        })
+
+    return sources
+
+
+# ─── Helper: Retrieval info ────────────────────────────────────────────────────
+def build_retrieval_info(docs, k, temperature, strict, mode, rerank: dict = None):
+    return {
+        "model": "gemma2-9b-it",
+        "embedding_model": next((d.metadata["embedding_model"].split("/")[-1] for d in docs
+                                 if "embedding_model" in d.metadata), "all-MiniLM-L6-v2"),
+        "dimensions": 384,
+        "similarity_metric": "cosine",
+        "k": k,
+        "temperature": temperature,
+        "strict_mode": strict,
+        "query_mode": mode,
+        "chunks_retrieved": len(docs),
+        "rerank": rerank,
+        "chunks": [
+            {
+                "source": doc.metadata.get("source_file", "Unknown"),
+                "page": doc.metadata.get("page", 0) + 1,
+                "text": doc.page_content,
+                "length": len(doc.page_content),
+                "rerank_score": doc.metadata.get("rerank_score"),
+            }
+            for doc in docs
+        ],
+    }
+
+
+# ─── Retrieval Config (for dev panel) ────────────────────────────────────────
+def retrieval_config(config: dict) -> dict:
+    return {
+        "model": "gemma2-9b-it (Groq)",
+        "embedding": "all-MiniLM-L6-v2",
+        "dimensions": 384,
+        "metric": "cosine",
+        "vector_store": "AstraDB",
+        "rerank": config["rerank_model"] or "off",
+        "chunk_size": config["chunk_size"],
+        "chunk_overlap": config["chunk_overlap"],
+    }
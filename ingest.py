@@ -0,0 +1,258 @@
+"""
+PDF Intelligence — Bulk Ingestion
+Loads a directory tree or manifest of PDFs into the collection the app
+and batch.py query, with the same chunk ids, metadata and registry
+records as uploads. Files are deduplicated by content hash, then split,
+embedded and written by a pool of worker processes, each running
+several threads.
+
+    python ingest.py filings/ archive/2023/ --processes 4 --threads 4
+    python ingest.py --manifest corpus.jsonl --tenant acme --partition reports
+    python ingest.py filings/ --processes 0 --snapshot snapshots/filings
+
+A manifest line is a path, a JSON string, or {"path": ..., "name"?, "id"?};
+relative paths resolve against the manifest's directory. Document ids
+derive from the absolute path (or the manifest "id"), so re-running over
+the same tree skips unchanged files and re-embeds only the changed pages
+of changed ones.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import engine
+from registry import file_hash
+
+
+# ─── Discovery ────────────────────────────────────────────────────────────────
+def walk_pdfs(root: str) -> list:
+    """Every *.pdf under `root` (case-insensitive), in a stable order."""
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        found.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.lower().endswith(".pdf"))
+    return found
+
+
+def load_manifest(path: str) -> list:
+    base = os.path.dirname(os.path.abspath(path))
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = json.loads(line) if line[0] in "{\"" else line
+            if isinstance(item, str):
+                item = {"path": item}
+            if not item.get("path"):
+                raise ValueError(f"{path}:{lineno}: missing 'path'")
+            item["path"] = os.path.join(base, item["path"])
+            entries.append(item)
+    return entries
+
+
+def doc_id_for(path: str) -> str:
+    return hashlib.md5(os.path.abspath(path).encode()).hexdigest()[:16]
+
+
+def discover(paths: list, manifest: str = None) -> list:
+    """[{path, name, id}] from directories, single files and an optional manifest."""
+    entries = []
+    for p in paths:
+        if os.path.isdir(p):
+            entries.extend({"path": f} for f in walk_pdfs(p))
+        else:
+            entries.append({"path": p})
+    if manifest:
+        entries.extend(load_manifest(manifest))
+
+    files = []
+    for e in entries:
+        path = os.path.abspath(e["path"])
+        files.append({
+            "path": path,
+            "name": e.get("name") or os.path.basename(path),
+            "id": str(e.get("id") or doc_id_for(path)),
+        })
+    return files
+
+
+def dedup(files: list, threads: int = 8) -> tuple:
+    """
+    Hash every file and keep the first of each identical set.
+    Returns (unique files with content_hash, duplicates [(path, kept path)], unreadable [(path, error)]).
+    A file whose id is taken by an earlier file with different content is
+    reported as unreadable, since ingesting it would overwrite that file.
+    """
+    def _hash(f):
+        try:
+            return f, file_hash(f["path"]), None
+        except OSError as e:
+            return f, None, str(e)
+
+    unique, duplicates, unreadable = [], [], []
+    seen_hash, seen_id = {}, {}
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for f, digest, error in pool.map(_hash, files):
+            if error:
+                unreadable.append((f["path"], error))
+            elif digest in seen_hash:
+                duplicates.append((f["path"], seen_hash[digest]))
+            elif f["id"] in seen_id:
+                unreadable.append((f["path"], f"duplicate id of {seen_id[f['id']]}"))
+            else:
+                seen_hash[digest] = seen_id[f["id"]] = f["path"]
+                unique.append({**f, "content_hash": digest})
+    return unique, duplicates, unreadable
+
+
+# ─── Workers ──────────────────────────────────────────────────────────────────
+def _init_worker(torch_threads: int):
+    # Spawned interpreters import torch lazily, so this caps its intra-op
+    # threads before first use; N processes x all cores would oversubscribe
+    os.environ.setdefault("OMP_NUM_THREADS", str(torch_threads))
+    os.environ.setdefault("MKL_NUM_THREADS", str(torch_threads))
+
+
+def batches(files: list, size: int) -> list:
+    return [files[i:i + size] for i in range(0, len(files), size)]
+
+
+class Progress:
+    """Running totals plus a one-line status: files, pages/s, chunks/s, ETA."""
+
+    def __init__(self, total: int, log=print):
+        self.total = total
+        self.log = log
+        self.start = time.perf_counter()
+        self.done = self.pages = self.chunks = self.skipped = 0
+        self.failed = []
+
+    def update(self, files: list, results: dict):
+        for f in files:
+            stats = results.get(f["id"], {"error": "no result"})
+            self.done += 1
+            if "error" in stats:
+                self.failed.append((f["path"], stats["error"]))
+                self.log(f"  ✕ {f['name']}: {stats['error']}")
+            elif stats["skipped"]:
+                self.skipped += 1
+            else:
+                self.pages += stats["pages"]
+                self.chunks += stats["chunks"]
+
+        elapsed = time.perf_counter() - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        eta = (self.total - self.done) / rate if rate else 0.0
+        self.log(f"  [{self.done}/{self.total}] {self.pages} pages, {self.chunks} chunks, "
+                 f"{self.skipped} unchanged · {self.pages / elapsed:.1f} pages/s, "
+                 f"{self.chunks / elapsed:.1f} chunks/s · ETA {eta:.0f}s")
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.start
+        return {
+            "files": self.done,
+            "ingested": self.done - self.skipped - len(self.failed),
+            "unchanged": self.skipped,
+            "failed": len(self.failed),
+            "pages": self.pages,
+            "chunks": self.chunks,
+            "seconds": round(elapsed, 2),
+            "pages_per_s": round(self.pages / elapsed, 2) if elapsed else 0.0,
+            "chunks_per_s": round(self.chunks / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+def ingest_all(config: dict, files: list, processes: int, threads: int, batch_size: int, log=print) -> dict:
+    """
+    Ingest `files` with `processes` worker processes x `threads` threads
+    (processes=0 runs in this process). Returns the run summary.
+    """
+    progress = Progress(len(files), log)
+    work = batches(files, batch_size)
+
+    if processes <= 0:
+        for batch in work:
+            progress.update(batch, engine.ingest_job(config, batch, threads))
+        return progress.summary()
+
+    torch_threads = max(1, (os.cpu_count() or 1) // processes)
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(torch_threads,)) as pool:
+        pending = {pool.submit(engine.ingest_job, config, batch, threads): batch for batch in work}
+        for future in as_completed(pending):
+            batch = pending[future]
+            try:
+                results = future.result()
+            except Exception as e:
+                # A worker died (e.g. out of memory); its whole batch failed
+                results = {f["id"]: {"error": f"worker failed: {str(e)[:200]}"} for f in batch}
+            progress.update(batch, results)
+    return progress.summary()
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-ingest a directory tree or manifest of PDFs")
+    parser.add_argument("paths", nargs="*", help="PDF files or directories (searched recursively)")
+    parser.add_argument("--manifest", help="File listing PDFs, one path or JSON object per line")
+    parser.add_argument("--processes", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Worker processes (0 = ingest in this process)")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per worker process")
+    parser.add_argument("--batch-size", type=int, help="Files per worker task (default: 2 x threads)")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml", help="Secrets file (env vars also work)")
+    parser.add_argument("--tenant", help="Tenant to ingest into (default: PAGEWISE_TENANT)")
+    parser.add_argument("--partition", help="Partition tag for the chunks (default: PAGEWISE_SHARED_PARTITION, "
+                                            "which every app session searches)")
+    parser.add_argument("--snapshot", help="Afterwards, export the ingested scope as an index snapshot here")
+    parser.add_argument("--dry-run", action="store_true", help="Discover and dedup only")
+    args = parser.parse_args(argv)
+    if not args.paths and not args.manifest:
+        parser.error("give PDF paths/directories or --manifest")
+
+    log = lambda message: print(message, file=sys.stderr)
+
+    config = engine.live_config(engine.load_config(engine.load_secrets_file(args.secrets), tenant=args.tenant))
+    config["partition"] = args.partition or config["shared_partition"]
+
+    files = discover(args.paths, args.manifest)
+    files, duplicates, unreadable = dedup(files, threads=max(args.threads, 4))
+    log(f"{len(files)} unique PDF(s), {len(duplicates)} duplicate(s) skipped, {len(unreadable)} unreadable")
+    for path, error in unreadable:
+        log(f"  ✕ {path}: {error}")
+    if config["vector_store"] == "local" and args.snapshot:
+        # The snapshot is written from this process's store
+        args.processes = 0
+    elif config["vector_store"] == "local":
+        log("Note: PAGEWISE_VECTOR_STORE=local keeps vectors in the worker processes only; "
+            "they are discarded when the run exits")
+    if args.dry_run or not files:
+        return 1 if unreadable else 0
+
+    threads = max(1, args.threads)
+    batch_size = args.batch_size or 2 * threads
+    log(f"Ingesting into {engine.scope_key(config, config.get('partition'))} with "
+        f"{args.processes or 'in-process'} process(es) x {threads} thread(s)...")
+    summary = ingest_all(config, files, args.processes, threads, batch_size, log=log)
+    summary["duplicates"] = len(duplicates)
+    summary["unreadable"] = len(unreadable)
+
+    if args.snapshot:
+        import snapshot
+        manifest = snapshot.export_snapshot(config, engine.get_vector_store(config), args.snapshot,
+                                            config.get("partition"))
+        log(f"Wrote snapshot {args.snapshot}: {manifest['count']} chunks, {len(manifest['documents'])} document(s)")
+
+    log(json.dumps(summary))
+    return 1 if summary["failed"] or unreadable else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+PDF Intelligence — Local Vector Store
+In-process LangChain VectorStore over a NumPy matrix: exact cosine search,
+equality (and {"$in": [...]}) metadata filters and upserts by id. Used when
+config["vector_store"] == "local" (air-gapped installs, benchmarks) and as
+the exact baseline that approximate indexes are measured against.
+
+A store can also start from a memory-mapped index snapshot (snapshot.py):
+its rows are served straight from the mapped files and later writes land
+in memory on top of them.
+"""
+
+import threading
+import uuid
+from collections import defaultdict
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+
+
+_INDEXABLE = (str, int, float, bool, type(None))
+
+
+def normalize(vectors) -> np.ndarray:
+    """Rows scaled to unit length (float32), so dot product is cosine."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the `k` highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Exact (brute-force) cosine search. Rows are appended into a growing
+    matrix; deletes tombstone rows and the matrix is compacted once more
+    than half of it is dead. Scores match AstraDB's cosine scale: (1 + cos) / 2.
+
+    Rows below `_base_rows` belong to a snapshot (see from_snapshot): their
+    ids, texts and metadata are read from it on demand, and only rows
+    added afterwards are held in the lists, dict and postings below.
+    """
+
+    def __init__(self, embedding, dim: int = None):
+        self._embedding = embedding
+        self._lock = threading.RLock()
+        self._reset(dim)
+
+    def _reset(self, dim: int = None):
+        self._dim = dim
+        self._size = self._live = 0
+        self._base, self._base_rows = None, 0
+        self._allocate(0, dim or 0)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids, self._texts, self._metadatas = [], [], []
+        self._row_of = {}
+        self._postings = defaultdict(set)   # (key, value) -> rows
+
+    @classmethod
+    def from_snapshot(cls, snapshot, embedding):
+        """
+        Store over an opened snapshot.Snapshot. Opening is O(1) in the
+        number of rows: the matrix is the snapshot's read-only memory map,
+        shared through the page cache with every process mapping the same
+        files, until the first write copies it into private memory.
+        """
+        store = cls(embedding, snapshot.dim)
+        store._base, store._base_rows = snapshot, len(snapshot)
+        store._vectors = snapshot.vectors
+        store._size = store._live = len(snapshot)
+        store._alive = np.ones(len(snapshot), dtype=bool)
+        return store
+
+    @property
+    def embeddings(self):
+        return self._embedding
+
+    def __len__(self) -> int:
+        return self._live
+
+    # ─── Row data ─────────────────────────────────────────────────────────
+    def _id(self, row: int) -> str:
+        return self._base.id(row) if row < self._base_rows else self._ids[row - self._base_rows]
+
+    def _text(self, row: int) -> str:
+        return self._base.text(row) if row < self._base_rows else self._texts[row - self._base_rows]
+
+    def _metadata(self, row: int) -> dict:
+        return self._base.metadata(row) if row < self._base_rows else self._metadatas[row - self._base_rows]
+
+    def _find(self, doc_id: str):
+        """Live row holding `doc_id`, or None."""
+        row = self._row_of.get(doc_id)
+        if row is None and self._base is not None:
+            row = self._base.row_of(doc_id)
+            if row is not None and not self._alive[row]:
+                row = None
+        return row
+
+    # ─── Vector storage (overridden by quantized_store) ───────────────────
+    def _allocate(self, capacity: int, dim: int):
+        """(Re)allocate vector storage for `capacity` rows, keeping the first `_size`."""
+        grown = np.zeros((capacity, dim), dtype=np.float32)
+        if self._size:
+            grown[:self._size] = self._vectors[:self._size]
+        self._vectors = grown
+
+    def _capacity(self) -> int:
+        return len(self._vectors)
+
+    def _write(self, start: int, vectors: np.ndarray):
+        self._vectors[start:start + len(vectors)] = vectors
+
+    def _read(self, rows) -> np.ndarray:
+        """Full-precision vectors of `rows`."""
+        return self._vectors[rows]
+
+    def _rank(self, rows, query: np.ndarray, k: int) -> tuple:
+        """Best `k` of `rows` (None = every row, dead ones included) as (rows, cosine scores)."""
+        if rows is None:
+            rows = np.arange(self._size)
+            scores = self._vectors[:self._size] @ query
+            scores[~self._alive[:self._size]] = -np.inf
+        else:
+            scores = self._vectors[rows] @ query if len(rows) else np.zeros(0, dtype=np.float32)
+        best = top_k(scores, k)
+        best = best[np.isfinite(scores[best])]
+        return rows[best], scores[best]
+
+    def vector_bytes(self) -> int:
+        """Bytes of vector data held in memory."""
+        return self._vectors[:self._size].nbytes
+
+    # ─── Write ────────────────────────────────────────────────────────────
+    def add_texts(self, texts, metadatas=None, *, ids=None, **kwargs) -> list:
+        texts = list(texts)
+        vectors = self._embedding.embed_documents(texts)
+        return self.add_vectors(vectors, texts, metadatas, ids)
+
+    def add_vectors(self, vectors, texts: list, metadatas: list = None, ids: list = None) -> list:
+        """Insert precomputed embeddings; existing ids are replaced."""
+        vectors = normalize(vectors)
+        metadatas = metadatas or [{} for _ in texts]
+        ids = [str(i) for i in ids] if ids else [uuid.uuid4().hex for _ in texts]
+
+        with self._lock:
+            self._delete_rows([row for row in map(self._find, ids) if row is not None])
+            self._reserve(len(texts), vectors.shape[1])
+            start = self._size
+            self._write(start, vectors)
+            self._alive[start:start + len(texts)] = True
+            for offset, (doc_id, text, meta) in enumerate(zip(ids, texts, metadatas)):
+                row = start + offset
+                self._ids.append(doc_id)
+                self._texts.append(text)
+                self._metadatas.append(dict(meta))
+                self._row_of[doc_id] = row
+                for key, value in meta.items():
+                    if isinstance(value, _INDEXABLE):
+                        self._postings[(key, value)].add(row)
+            self._size += len(texts)
+            self._live += len(texts)
+        return ids
+
+    def _reserve(self, extra: int, dim: int):
+        if self._dim != dim:
+            if self._size:
+                raise ValueError(f"Embedding dimension {dim} does not match index dimension {self._dim}")
+            self._dim = dim
+            self._allocate(0, dim)
+        needed = self._size + extra
+        if needed > self._capacity():
+            capacity = max(needed, 2 * self._capacity(), 1024)
+            self._allocate(capacity, dim)
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:self._size] = self._alive[:self._size]
+            self._alive = alive
+
+    def update_metadata(self, id_to_metadata: dict, **kwargs) -> int:
+        """
+        Merge new metadata into existing rows, as AstraDBVectorStore.update_metadata
+        does; unknown ids are ignored. Snapshot rows are copied out first.
+        Returns the number of rows updated.
+        """
+        updated, base = 0, []
+        with self._lock:
+            for doc_id, meta in id_to_metadata.items():
+                row = self._find(str(doc_id))
+                if row is None:
+                    continue
+                updated += 1
+                if row < self._base_rows:
+                    base.append((row, {**self._metadata(row), **meta}))
+                    continue
+                current = self._metadatas[row - self._base_rows]
+                for key, value in current.items():
+                    if key in meta and isinstance(value, _INDEXABLE):
+                        self._postings[(key, value)].discard(row)
+                current.update(meta)
+                for key, value in meta.items():
+                    if isinstance(value, _INDEXABLE):
+                        self._postings[(key, value)].add(row)
+            if base:
+                rows = [row for row, _ in base]
+                self.add_vectors(self._read(np.array(rows)), [self._text(r) for r in rows],
+                                 [meta for _, meta in base], [self._id(r) for r in rows])
+        return updated
+
+    # ─── Delete ───────────────────────────────────────────────────────────
+    def delete(self, ids: list = None, **kwargs) -> bool:
+        with self._lock:
+            if ids is None:
+                self.clear()
+                return True
+            rows = [row for row in map(self._find, map(str, ids)) if row is not None]
+            self._delete_rows(rows)
+        return True
+
+    def delete_by_metadata_filter(self, filter: dict) -> int:
+        """Delete every row matching `filter` (equality on each key). Returns rows deleted."""
+        if not filter:
+            raise ValueError("Refusing to delete with an empty filter; use clear()")
+        with self._lock:
+            rows = self._matching_rows(filter).tolist()
+            self._delete_rows(rows)
+        return len(rows)
+
+    def clear(self):
+        with self._lock:
+            self._reset(self._dim)
+
+    def _delete_rows(self, rows: list):
+        for row in rows:
+            if not self._alive[row]:
+                continue
+            self._alive[row] = False
+            self._live -= 1
+            if row < self._base_rows:
+                continue
+            del self._row_of[self._id(row)]
+            for key, value in self._metadata(row).items():
+                if isinstance(value, _INDEXABLE):
+                    self._postings[(key, value)].discard(row)
+        if self._size and self._live < self._size // 2:
+            self._compact()
+
+    def _compact(self):
+        keep = np.flatnonzero(self._alive[:self._size])
+        vectors = self._read(keep)
+        texts = [self._text(r) for r in keep]
+        metadatas = [self._metadata(r) for r in keep]
+        ids = [self._id(r) for r in keep]
+        self._reset(self._dim)
+        if len(keep):
+            self.add_vectors(vectors, texts, metadatas, ids)
+
+    # ─── Search ───────────────────────────────────────────────────────────
+    def _matching_rows(self, filter: dict) -> np.ndarray:
+        rows = None
+        for key, value in filter.items():
+            values = value["$in"] if isinstance(value, dict) else (value,)
+            posting = set().union(*(self._postings.get((key, v), ()) for v in values))
+            rows = posting if rows is None else rows & posting
+            if not rows:
+                break
+        rows = np.fromiter(rows or (), dtype=np.int64)
+        if self._base is None:
+            return rows
+        base = self._base.rows_where(filter)
+        return np.concatenate([base[self._alive[base]], rows])
+
+    def similarity_search_with_score_by_vector(self, embedding, k: int = 4, filter: dict = None, **kwargs) -> list:
+        query = normalize(embedding)
+        with self._lock:
+            if not self._live:
+                # Nothing to rank; an empty index may not even have a dimension yet
+                return []
+            rows = self._matching_rows(filter) if filter else None
+            rows, scores = self._rank(rows, query, k)
+            return [
+                (self._document(row), float((1.0 + score) / 2.0))
+                for row, score in zip(rows, scores)
+            ]
+
+    def iter_documents(self, batch_size: int = 256):
+        """Yield every live row as lists of Documents (with ids), in insertion order."""
+        row = 0
+        while True:
+            with self._lock:
+                if row >= self._size:
+                    return
+                rows = [r for r in range(row, min(row + batch_size, self._size)) if self._alive[r]]
+                batch = [self._document(r) for r in rows]
+                row += batch_size
+            if batch:
+                yield batch
+
+    def iter_embeddings(self, batch_size: int = 256, filter: dict = None):
+        """Like iter_documents, but yields (Documents, unit vectors) and only rows matching `filter`."""
+        with self._lock:
+            rows = np.sort(self._matching_rows(filter)) if filter else np.flatnonzero(self._alive[:self._size])
+        for lo in range(0, len(rows), batch_size):
+            with self._lock:
+                batch = [r for r in rows[lo:lo + batch_size] if self._alive[r]]
+                if batch:
+                    yield [self._document(r) for r in batch], self._read(np.array(batch))
+
+    def _document(self, row: int) -> Document:
+        return Document(id=self._id(row), page_content=self._text(row), metadata=dict(self._metadata(row)))
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter: dict = None, **kwargs) -> list:
+        return self.similarity_search_with_score_by_vector(self._embedding.embed_query(query), k, filter)
+
+    def similarity_search_by_vector(self, embedding, k: int = 4, filter: dict = None, **kwargs) -> list:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search(self, query: str, k: int = 4, filter: dict = None, **kwargs) -> list:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def _select_relevance_score_fn(self):
+        return lambda score: score
+
+    @classmethod
+    def from_texts(cls, texts, embedding, metadatas=None, *, ids=None, **kwargs):
+        store = cls(embedding)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
@@ -0,0 +1,148 @@
+"""
+PDF Intelligence — Markdown → HTML
+Single-pass converter for the markdown subset the LLM emits (headers, bold,
+italic, inline code, bullet and numbered lists, paragraphs). Shared by the
+chat history renderer and the streaming renderer; MarkdownStream re-renders
+only the trailing open block on each appended token.
+"""
+
+import re
+
+
+# ─── Patterns (compiled once) ─────────────────────────────────────────────────
+_HEADER = re.compile(r'^(#{1,3}) (.+)$')
+_ORDERED = re.compile(r'^\d+\.\s')
+_INLINE = re.compile(r'\*\*(?P<b>.+?)\*\*|\*(?P<i>.+?)\*|`(?P<c>.+?)`')
+_BULLETS = ('- ', '* ', '• ')
+
+_HEADER_TAGS = {
+    1: '<h1 style="font-family:var(--font-prose);font-size:24px;margin:20px 0 12px 0;color:var(--text-primary);">',
+    2: '<h2 style="font-family:var(--font-prose);font-size:20px;margin:18px 0 10px 0;color:var(--text-primary);">',
+    3: '<h3 style="font-family:var(--font-prose);font-size:18px;margin:16px 0 8px 0;color:var(--text-primary);">',
+}
+_LIST_OPEN = {
+    "ul": '<ul style="margin:8px 0;padding-left:22px;">',
+    "ol": '<ol style="margin:8px 0;padding-left:22px;">',
+}
+_LI = '<li style="margin:4px 0;">'
+_P = '<p style="margin:0 0 12px 0;">'
+
+
+def _escape(text: str) -> str:
+    if "&" in text:
+        text = text.replace("&", "&amp;")
+    if "<" in text or ">" in text:
+        text = text.replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def _inline_sub(m) -> str:
+    if m.group('b') is not None:
+        return f'<strong>{_INLINE.sub(_inline_sub, m.group("b"))}</strong>'
+    if m.group('i') is not None:
+        return f'<em>{_INLINE.sub(_inline_sub, m.group("i"))}</em>'
+    return f'<code>{m.group("c")}</code>'
+
+
+def _inline(line: str) -> str:
+    """Escape one line and apply bold/italic/code in a single scan."""
+    escaped = _escape(line)
+    if '*' not in escaped and '`' not in escaped:
+        return escaped
+    return _INLINE.sub(_inline_sub, escaped)
+
+
+# ─── Block tokenizer ──────────────────────────────────────────────────────────
+def _render_blocks(text: str) -> list:
+    """Tokenize `text` line by line into a list of rendered HTML blocks."""
+    blocks = []
+    para = []
+    list_kind = None
+    items = []
+
+    def _flush_para():
+        if para:
+            blocks.append(f'{_P}{"<br>".join(para)}</p>')
+            para.clear()
+
+    def _flush_list():
+        nonlocal list_kind
+        if list_kind:
+            blocks.append(_LIST_OPEN[list_kind] + "\n".join(items) + f'</{list_kind}>')
+            items.clear()
+            list_kind = None
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+
+        if not stripped:
+            _flush_para()
+            _flush_list()
+            continue
+
+        header = _HEADER.match(line) if line[0] == '#' else None
+        if header:
+            _flush_para()
+            _flush_list()
+            level = len(header.group(1))
+            blocks.append(f'{_HEADER_TAGS[level]}{_inline(header.group(2))}</h{level}>')
+            continue
+
+        if stripped.startswith(_BULLETS):
+            kind, item = "ul", stripped[2:]
+        elif stripped[0].isdigit() and _ORDERED.match(stripped):
+            kind, item = "ol", _ORDERED.sub('', stripped, count=1)
+        else:
+            kind = None
+
+        if kind:
+            _flush_para()
+            if list_kind != kind:
+                _flush_list()
+                list_kind = kind
+            items.append(f'{_LI}{_inline(item)}</li>')
+        else:
+            _flush_list()
+            para.append(_inline(stripped))
+
+    _flush_para()
+    _flush_list()
+    return blocks
+
+
+def markdown_to_html(text: str) -> str:
+    """Convert markdown to HTML for AI response rendering."""
+    return "\n".join(_render_blocks(text))
+
+
+# ─── Streaming ────────────────────────────────────────────────────────────────
+class MarkdownStream:
+    """
+    Incremental converter for streamed tokens.
+
+    Blocks never span a blank line, so everything before the last blank
+    line is rendered once and frozen; each append only re-renders the
+    trailing open block.
+    """
+
+    def __init__(self):
+        self._closed_html = ""
+        self._tail = ""
+
+    def append(self, text: str) -> str:
+        """Add streamed text and return HTML for everything received so far."""
+        self._tail += text
+        cut = self._tail.rfind("\n\n")
+        if cut >= 0:
+            frozen = "\n".join(_render_blocks(self._tail[:cut]))
+            if frozen:
+                self._closed_html = f"{self._closed_html}\n{frozen}" if self._closed_html else frozen
+            self._tail = self._tail[cut + 2:]
+        return self.html
+
+    @property
+    def html(self) -> str:
+        tail_html = "\n".join(_render_blocks(self._tail))
+        if self._closed_html and tail_html:
+            return f"{self._closed_html}\n{tail_html}"
+        return self._closed_html or tail_html
@@ -0,0 +1,278 @@
+"""
+PDF Intelligence — Metrics
+Process-wide counters, gauges and histograms for the ingestion and query
+hot paths, exposed in Prometheus text format (0.0.4) from a small local
+HTTP endpoint started alongside the app:
+
+    curl http://127.0.0.1:9464/metrics
+
+Values are aggregated across every session, batch worker and thread in the
+process. Label sets are small and fixed (stage, cache, op, event).
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.label_names)
+
+    def expose(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._sample_lines(key, value))
+        return lines
+
+    def _sample_lines(self, key, value) -> list:
+        return [f"{self.name}{_labels(self.label_names, key)} {_number(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels):
+        """For counters mirrored from an external running total (e.g. cache_info())."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = _LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _sample_lines(self, key, state) -> list:
+        counts, total, count = state
+        lines, cumulative = [], 0
+        for bound, n in zip(self.buckets, counts):
+            cumulative += n
+            lines.append(f"{self.name}_bucket{_labels(self.label_names + ('le',), key + (f'{bound:g}',))} {cumulative}")
+        lines.append(f"{self.name}_bucket{_labels(self.label_names + ('le',), key + ('+Inf',))} {count}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, key)} {count}")
+        return lines
+
+
+REGISTRY = []
+_SCRAPE_HOOKS = []
+
+
+def on_scrape(fn):
+    """Register fn() to refresh pull-style values right before each scrape."""
+    _SCRAPE_HOOKS.append(fn)
+    return fn
+
+
+# ─── Hot-path metrics ─────────────────────────────────────────────────────────
+QUERY_SECONDS = Histogram("pagewise_query_seconds", "Query latency by stage (retrieve, rerank, generate, total).",
+                          ("stage",))
+TTFT_SECONDS = Histogram("pagewise_ttft_seconds", "Time from end of retrieval (and reranking) to first answer token.")
+TOKENS = Counter("pagewise_tokens_streamed_total", "Answer tokens streamed to clients.")
+QUERIES = Counter("pagewise_queries_total", "Queries answered, by outcome (ok, error, cancelled).", ("outcome",))
+IN_FLIGHT = Gauge("pagewise_queries_in_flight", "Queries currently retrieving or streaming.")
+STREAM_EVENTS = Counter("pagewise_llm_stream_events_total", "Resilient stream retries and hedges.", ("event",))
+
+INGEST_PAGES = Counter("pagewise_ingest_pages_total", "PDF pages ingested.")
+INGEST_CHUNKS = Counter("pagewise_ingest_chunks_total", "Chunks embedded and stored.")
+INGEST_BUSY = Counter("pagewise_ingest_seconds_total",
+                      "Wall time spent ingesting; pages/s = rate(pages) / rate(seconds).")
+INGEST_SECONDS = Histogram("pagewise_ingest_document_seconds", "Per-document ingestion time.",
+                           buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+CACHE = Counter("pagewise_cache_requests_total", "Cache lookups by cache and result (hit, miss).",
+                ("cache", "result"))
+STORE_ERRORS = Counter("pagewise_vector_store_errors_total", "Vector store failures by operation.", ("op",))
+
+
+def track_lru_cache(name: str, cached_fn):
+    """Mirror a functools.lru_cache's hits and misses into pagewise_cache_requests_total."""
+    def _sync():
+        info = cached_fn.cache_info()
+        CACHE.set_total(info.hits, cache=name, result="hit")
+        CACHE.set_total(info.misses, cache=name, result="miss")
+    on_scrape(_sync)
+
+
+def stream_event(name: str, **info):
+    """on_event hook for resilience streams."""
+    if name in ("retry", "hedge"):
+        STREAM_EVENTS.inc(event=name)
+
+
+class QueryTimer:
+    """
+    Per-query stage clock that feeds the query metrics. Call retrieved()
+    after retrieval, reranked() after a rerank stage (which records its own
+    time), token() for each streamed token and finish(outcome) exactly
+    once; timings() returns the same numbers as a dict.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.t_retrieved = self.t_reranked = self.t_first = self.t_done = None
+        self.tokens = 0
+        IN_FLIGHT.inc()
+
+    def retrieved(self):
+        self.t_retrieved = time.perf_counter()
+        QUERY_SECONDS.observe(self.t_retrieved - self.start, stage="retrieve")
+
+    def reranked(self):
+        self.t_reranked = time.perf_counter()
+
+    def _ready(self):
+        """When generation could start: after reranking, else after retrieval."""
+        return self.t_reranked or self.t_retrieved
+
+    def token(self):
+        if self.t_first is None:
+            self.t_first = time.perf_counter()
+            TTFT_SECONDS.observe(self.t_first - (self._ready() or self.start))
+        self.tokens += 1
+        TOKENS.inc()
+
+    def finish(self, outcome: str = "ok"):
+        if self.t_done is not None:
+            return
+        self.t_done = time.perf_counter()
+        IN_FLIGHT.dec()
+        QUERIES.inc(outcome=outcome)
+        if outcome == "ok":
+            if self._ready() is not None:
+                QUERY_SECONDS.observe(self.t_done - self._ready(), stage="generate")
+            QUERY_SECONDS.observe(self.t_done - self.start, stage="total")
+
+    def timings(self) -> dict:
+        end = self.t_done or time.perf_counter()
+        retrieved = self.t_retrieved or end
+        ready = self._ready() or end
+        return {
+            "retrieve_s": round(retrieved - self.start, 4),
+            "ttft_s": round(self.t_first - ready, 4) if self.t_first is not None else None,
+            "generate_s": round(end - ready, 4),
+            "total_s": round(end - self.start, 4),
+        }
+
+
+def exposition() -> str:
+    for fn in _SCRAPE_HOOKS:
+        try:
+            fn()
+        except Exception:
+            continue
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+# ─── HTTP endpoint ────────────────────────────────────────────────────────────
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = exposition().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_SERVER = None
+_SERVER_ERROR = None
+_SERVER_LOCK = threading.Lock()
+
+
+def start_server(port: int, host: str = "127.0.0.1"):
+    """
+    Serve /metrics on a daemon thread, once per process. Returns the server,
+    or None if the port was taken; a failed bind is not retried.
+    """
+    global _SERVER, _SERVER_ERROR
+    with _SERVER_LOCK:
+        if _SERVER is None:
+            if _SERVER_ERROR is not None:
+                return None
+            try:
+                _SERVER = ThreadingHTTPServer((host, port), _Handler)
+            except OSError as e:
+                # Port taken (e.g. a second app process on this host): run
+                # without an endpoint rather than fail the app, and stop
+                # trying on every rerun
+                _SERVER_ERROR = e
+                return None
+            _SERVER.daemon_threads = True
+            threading.Thread(target=_SERVER.serve_forever, name="pagewise-metrics", daemon=True).start()
+        return _SERVER
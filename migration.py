@@ -0,0 +1,254 @@
+"""
+PDF Intelligence — Embedding Migration
+Moves a collection to a new embedding model (or version) without downtime
+or re-uploads: chunks are read back from the live collection, re-embedded
+from their stored text into a shadow collection in throttled batches, and
+the registry's live-embedding record is flipped in one transaction once
+the shadow is in sync. Readers pick up the new collection on their next
+engine.live_config() call; writers keep using the old one until then.
+
+    python migration.py --model sentence-transformers/all-mpnet-base-v2 --rate 200
+    python migration.py --version 2                 # same model, new vectors
+    python migration.py --status
+
+Sync passes repeat until one finds nothing to copy or delete, so uploads
+and removals made during the migration are carried over. Writes to the old
+collection are then paused and the passes repeat once more, so nothing is
+recorded as indexed after the last copy; uploads fail until the cutover. A
+killed run resumes: text already in the shadow collection is not
+re-embedded. A run killed while writes are paused leaves them paused until
+it is rerun (or `--abort`).
+
+    python migration.py --abort                     # resume writes, keep the old collection live
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import threading
+import time
+
+import engine
+
+
+def _digest(text: str) -> str:
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+def scan(vstore, batch_size: int = 256):
+    """Yield every stored chunk as lists of Documents with ids."""
+    if hasattr(vstore, "iter_documents"):
+        yield from vstore.iter_documents(batch_size)
+        return
+    # AstraDB: plain find() without a vector sort pages through the collection
+    batch = []
+    for raw in vstore.astra_env.collection.find({}):
+        hit = vstore.full_decode_astra_db_found_document(raw)
+        if hit is None:
+            continue
+        hit.document.id = hit.id
+        batch.append(hit.document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Migration:
+    """One re-embedding run from the live collection to a shadow collection, ending in cutover."""
+
+    def __init__(self, config: dict, model: str, version: str, batch_size: int = 64,
+                 max_chunks_per_s: float = None, max_passes: int = 5, log=None):
+        self.source_config = engine.live_config(config)
+        self.target_config = {
+            **self.source_config,
+            "collection": engine.shadow_collection(self.source_config, model, version),
+            "embedding_model": model,
+            "embedding_version": str(version),
+        }
+        self.batch_size = batch_size
+        self.max_chunks_per_s = max_chunks_per_s
+        self.max_passes = max_passes
+        self.log = log or (lambda message: None)
+        self.state = "pending"
+        self.passes = self.copied = self.deleted = 0
+        self.error = None
+        self.started = self.finished = None
+        self.done = threading.Event()
+        self._thread = threading.Thread(target=self.run, name="pagewise-migration", daemon=True)
+
+    # ─── Sync ─────────────────────────────────────────────────────────────
+    def _throttle(self, chunks: int, started: float):
+        if self.max_chunks_per_s:
+            budget = chunks / self.max_chunks_per_s
+            time.sleep(max(0.0, budget - (time.perf_counter() - started)))
+
+    def _sync(self, source, shadow, present: dict) -> int:
+        """One pass: re-embed new or changed chunks, delete ones gone from the source. Returns changes."""
+        stamp = engine.embedding_stamp(self.target_config)
+        seen, changes = set(), 0
+        for docs in scan(source, self.batch_size):
+            started = time.perf_counter()
+            todo = []
+            for doc in docs:
+                seen.add(doc.id)
+                digest = _digest(doc.page_content)
+                if present.get(doc.id) != digest:
+                    doc.metadata.update(stamp)
+                    todo.append((doc, digest))
+            if todo:
+                shadow.add_documents([doc for doc, _ in todo], ids=[doc.id for doc, _ in todo])
+                present.update((doc.id, digest) for doc, digest in todo)
+                self.copied += len(todo)
+                changes += len(todo)
+                self._throttle(len(todo), started)
+
+        stale = [doc_id for doc_id in present if doc_id not in seen]
+        if stale:
+            shadow.delete(ids=stale)
+            for doc_id in stale:
+                del present[doc_id]
+            self.deleted += len(stale)
+            changes += len(stale)
+        return changes
+
+    def _converge(self, source, shadow, present: dict):
+        """Sync passes until one changes nothing."""
+        for _ in range(self.max_passes):
+            self.passes += 1
+            changes = self._sync(source, shadow, present)
+            self.log(f"  pass {self.passes}: {changes} change(s), {len(present)} chunks in shadow")
+            if changes == 0:
+                return
+        raise RuntimeError(f"source still changing after {self.passes} passes; run again")
+
+    def run(self) -> dict:
+        """Sync until clean, then cut over. Returns status()."""
+        self.started = time.time()
+        try:
+            source_live = engine.embedding_stamp(self.source_config)
+            if source_live == engine.embedding_stamp(self.target_config):
+                raise ValueError(f"{self.source_config['collection']} already uses "
+                                 f"{source_live['embedding_model']} v{source_live['embedding_version']}")
+
+            source = engine.get_vector_store(self.source_config)
+            shadow = engine.get_vector_store(self.target_config)
+
+            # Resume: whatever the shadow already holds was embedded by the target model
+            self.state = "resuming"
+            present = {doc.id: _digest(doc.page_content) for docs in scan(shadow) for doc in docs}
+
+            self.state = "syncing"
+            self._converge(source, shadow, present)
+
+            # Writers that recorded before the pause stored their vectors first, so
+            # one more clean pass has them; later ones are refused until the cutover
+            registry = engine.get_registry(self.source_config)
+            registry.pause_writes(self.source_config["collection"], self.target_config["collection"])
+            try:
+                self.state = "finalizing"
+                self._converge(source, shadow, present)
+                registry.cutover(
+                    engine.base_collection(self.source_config),
+                    self.source_config["collection"],
+                    {k: self.target_config[k] for k in ("collection", "embedding_model", "embedding_version")},
+                )
+            except Exception:
+                registry.resume_writes(self.source_config["collection"])
+                raise
+            self.state = "done"
+        except Exception as e:
+            self.state = "failed"
+            self.error = str(e)[:500]
+        finally:
+            self.finished = time.time()
+            self.done.set()
+        return self.status()
+
+    # ─── Background ───────────────────────────────────────────────────────
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.done.wait(timeout)
+
+    def status(self) -> dict:
+        end = self.finished or time.time()
+        return {
+            "state": self.state,
+            "from": self.source_config["collection"],
+            "to": self.target_config["collection"],
+            "embedding_model": self.target_config["embedding_model"],
+            "embedding_version": self.target_config["embedding_version"],
+            "passes": self.passes,
+            "copied": self.copied,
+            "deleted": self.deleted,
+            "elapsed_s": round(end - self.started, 3) if self.started else 0.0,
+            "error": self.error,
+        }
+
+
+def drop_collection(config: dict, collection: str):
+    """Delete a retired collection (e.g. the pre-cutover one)."""
+    vstore = engine.get_vector_store({**config, "collection": collection})
+    if hasattr(vstore, "delete_collection"):
+        vstore.delete_collection()
+    else:
+        vstore.clear()
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-embed the live collection and cut over atomically")
+    parser.add_argument("--model", help="Target embedding model (default: PAGEWISE_EMBEDDING_MODEL)")
+    parser.add_argument("--version", help="Target embedding version (default: PAGEWISE_EMBEDDING_VERSION)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Chunks per read/re-embed batch")
+    parser.add_argument("--rate", type=float, help="Max chunks re-embedded per second")
+    parser.add_argument("--max-passes", type=int, default=5)
+    parser.add_argument("--drop-old", action="store_true", help="Delete the old collection after cutover")
+    parser.add_argument("--grace", type=float, default=60.0,
+                        help="Seconds to wait before --drop-old, for in-flight queries")
+    parser.add_argument("--status", action="store_true", help="Print the live embedding and exit")
+    parser.add_argument("--abort", action="store_true",
+                        help="Resume writes paused by a killed run, keeping the old collection live")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    parser.add_argument("--tenant", help="Tenant whose collection to migrate (collection tenant mode)")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    config = engine.load_config(engine.load_secrets_file(args.secrets), tenant=args.tenant)
+
+    if args.status:
+        live = engine.live_config(config)
+        status = {k: live[k] for k in ("collection", "embedding_model", "embedding_version")}
+        status["paused_for"] = engine.get_registry(live).paused_writes().get(live["collection"])
+        print(json.dumps(status))
+        return 0
+
+    if args.abort:
+        live = engine.live_config(config)
+        engine.get_registry(live).resume_writes(live["collection"])
+        log(f"Writes to {live['collection']} resumed")
+        return 0
+
+    run = Migration(config, args.model or config["embedding_model"], args.version or config["embedding_version"],
+                    args.batch_size, args.rate, args.max_passes, log=log)
+    log(f"Re-embedding {run.source_config['collection']} → {run.target_config['collection']} "
+        f"({run.target_config['embedding_model']} v{run.target_config['embedding_version']})")
+    status = run.run()
+    log(json.dumps(status))
+    if status["state"] != "done":
+        return 1
+
+    if args.drop_old and status["from"] != status["to"]:
+        log(f"Dropping {status['from']} in {args.grace:.0f}s...")
+        time.sleep(args.grace)
+        drop_collection(run.source_config, status["from"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+"""
+PDF Intelligence — Profiler Capture
+One-shot profiling of a single query or ingestion on a live process,
+armed from Developer Mode. Two modes:
+
+- "sampling": a background thread samples the stacks of the calling
+  thread plus the shared event-loop / executor threads every few ms.
+  Low overhead and sees retrieval and streaming, which run off the
+  session thread. Raw output is collapsed stacks (flamegraph.pl,
+  speedscope).
+- "deterministic": cProfile on the calling thread. Exact call counts,
+  but only for work done on that thread (ingestion, prompt building).
+  Raw output is a pstats file (`python -m pstats`, snakeviz).
+
+Either can also trace allocations with tracemalloc, which costs far more
+than the profilers themselves (several times the wall time), so wall
+times from an allocation capture are only comparable with each other.
+The event loop and tracemalloc are process-wide, so a capture includes
+whatever other sessions were doing at the same time.
+"""
+
+import cProfile
+import io
+import marshal
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+MODES = ("sampling", "deterministic")
+
+# Threads sampled alongside the caller: the shared loop and its executor
+SHARED_THREADS = ("pagewise-event-loop", "aio-fallback")
+
+# Leaf frames that mean "blocked, not working"
+_IDLE = {("selectors.py", "select"), ("threading.py", "wait"), ("threading.py", "_wait_for_tstate_lock")}
+
+_ALLOC_FRAMES = 1
+
+
+def _where(filename: str, lineno: int, name: str) -> str:
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+# ─── Sampler ──────────────────────────────────────────────────────────────────
+class _Sampler:
+    """Periodically records the stacks of selected threads via sys._current_frames()."""
+
+    def __init__(self, thread_ids: set, thread_names: tuple, interval: float):
+        self.thread_ids = thread_ids
+        self.thread_names = thread_names
+        self.interval = interval
+        self.stacks = Counter()    # tuple of (file, line, name), root first -> samples
+        self.samples = self.idle = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="pagewise-profiler", daemon=True)
+
+    def _targets(self) -> set:
+        ids = set(self.thread_ids)
+        for t in threading.enumerate():
+            if t.name.startswith(self.thread_names):
+                ids.add(t.ident)
+        return ids
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            targets = self._targets()
+            for ident, frame in sys._current_frames().items():
+                if ident not in targets:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE:
+                    self.idle += 1
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append((frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name))
+                    frame = frame.f_back
+                self.stacks[tuple(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def top(self, limit: int) -> list:
+        own, total = Counter(), Counter()
+        for stack, n in self.stacks.items():
+            own[stack[-1]] += n
+            for frame in set(stack):
+                total[frame] += n
+        samples = max(self.samples, 1)
+        return [
+            {"frame": _where(*frame), "self_pct": round(100 * n / samples, 1),
+             "total_pct": round(100 * total[frame] / samples, 1), "samples": n}
+            for frame, n in own.most_common(limit)
+        ]
+
+    def collapsed(self) -> bytes:
+        lines = [
+            ";".join(_where(*frame) for frame in stack) + f" {n}"
+            for stack, n in self.stacks.most_common()
+        ]
+        return ("\n".join(lines) + "\n").encode()
+
+
+# ─── Capture ──────────────────────────────────────────────────────────────────
+class Capture:
+    """
+    Context manager wrapping one unit of work:
+
+        with Capture("sampling") as cap:
+            ingest(...)
+        cap.report()   # {mode, wall_s, top_frames, top_allocs, ...}
+        cap.raw()      # (filename, bytes)
+    """
+
+    def __init__(self, mode: str = "sampling", trace_allocs: bool = True, interval: float = 0.005,
+                 top: int = 15, thread_names: tuple = SHARED_THREADS):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        self.mode = mode
+        self.trace_allocs = trace_allocs
+        self.interval = interval
+        self.limit = top
+        self.thread_names = thread_names
+        self.wall_s = 0.0
+        self.error = None
+        self._profile = self._sampler = None
+        self._snapshot = self._allocs = None
+        self._peak = 0
+        self._owns_tracemalloc = False
+
+    def __enter__(self):
+        if self.trace_allocs:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(_ALLOC_FRAMES)
+                self._owns_tracemalloc = True
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+            self._snapshot = tracemalloc.take_snapshot()
+
+        if self.mode == "deterministic":
+            self._profile = cProfile.Profile()
+        else:
+            self._sampler = _Sampler({threading.get_ident()}, self.thread_names, self.interval)
+            self._sampler.start()
+        self._start = time.perf_counter()
+        if self._profile:
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profile:
+            self._profile.disable()
+        self.wall_s = time.perf_counter() - self._start
+        if self._sampler:
+            self._sampler.stop()
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {str(exc)[:200]}"
+
+        if self._snapshot is not None:
+            self._peak = tracemalloc.get_traced_memory()[1] - self._baseline
+            after = tracemalloc.take_snapshot()
+            if self._owns_tracemalloc:
+                tracemalloc.stop()
+            ignore = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+            self._allocs = after.filter_traces(ignore).compare_to(self._snapshot.filter_traces(ignore), "lineno")
+            self._snapshot = None
+        return False
+
+    # ─── Results ──────────────────────────────────────────────────────────
+    def top_frames(self) -> list:
+        if self._sampler:
+            return self._sampler.top(self.limit)
+        import pstats
+        stats = pstats.Stats(self._profile).stats
+        rows = sorted(stats.items(), key=lambda kv: kv[1][2], reverse=True)[:self.limit]
+        wall = max(self.wall_s, 1e-9)
+        return [
+            {"frame": _where(*func), "self_s": round(tt, 4), "total_s": round(ct, 4), "calls": nc,
+             "self_pct": round(100 * tt / wall, 1)}
+            for func, (cc, nc, tt, ct, callers) in rows
+        ]
+
+    def top_allocs(self) -> list:
+        grown = [s for s in self._allocs or [] if s.size_diff > 0]
+        grown.sort(key=lambda s: s.size_diff, reverse=True)
+        return [
+            {"site": f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+             "kib": round(s.size_diff / 1024, 1), "blocks": s.count_diff}
+            for s in grown[:self.limit]
+        ]
+
+    def report(self) -> dict:
+        return {
+            "mode": self.mode,
+            "wall_s": round(self.wall_s, 4),
+            "samples": self._sampler.samples if self._sampler else None,
+            "idle_samples": self._sampler.idle if self._sampler else None,
+            "trace_allocs": self.trace_allocs,
+            "peak_alloc_kib": round(self._peak / 1024, 1) if self.trace_allocs else None,
+            "top_frames": self.top_frames(),
+            "top_allocs": self.top_allocs(),
+            "error": self.error,
+        }
+
+    def raw(self) -> tuple:
+        """(filename, bytes) of the full profile for offline analysis."""
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        if self._sampler:
+            return f"pagewise-{stamp}.collapsed.txt", self._sampler.collapsed()
+        self._profile.create_stats()
+        buf = io.BytesIO()
+        marshal.dump(self._profile.stats, buf)
+        return f"pagewise-{stamp}.prof", buf.getvalue()
@@ -0,0 +1,143 @@
+"""
+PDF Intelligence — Quantized Local Vector Store
+LocalVectorStore variant that keeps only compact codes in memory and the
+full-precision vectors in a scratch file on disk:
+
+- "int8": per-row symmetric scalar quantization (dim bytes + a float32
+  scale per vector, ~4x smaller than float32)
+- "binary": one sign bit per dimension (dim / 8 bytes per vector, 32x
+  smaller), scored against the float query rather than by Hamming
+  distance, which lost most of the recall on sparse embeddings
+
+A search scores every candidate row on the codes, reads the best
+`k * oversample` full-precision rows back from disk and returns the exact
+cosine top k of those. Used when config["vector_quantization"] is set;
+benchmarks/bench_retrieval.py --quantization measures the recall cost.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from local_store import LocalVectorStore, top_k
+
+
+QUANTIZATIONS = ("int8", "binary")
+DEFAULT_OVERSAMPLE = {"int8": 4, "binary": 64}
+
+# Rows scored per block: keeps the int8 -> float32 temporaries cache-sized
+_BLOCK = 1024
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple:
+    """(int8 codes, float32 per-row scales) with vectors ≈ codes * scale."""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """Sign bits, packed 8 dimensions per byte."""
+    return np.packbits(vectors > 0, axis=-1)
+
+
+class QuantizedVectorStore(LocalVectorStore):
+    """
+    Quantized codes in RAM, float32 rows in an unlinked scratch file
+    (memory-mapped) under `rescore_dir`, rescored exactly per search.
+    """
+
+    def __init__(self, embedding, quantization: str = "int8", oversample: int = None,
+                 rescore_dir: str = None, dim: int = None):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"quantization must be one of {QUANTIZATIONS}, got {quantization!r}")
+        self.quantization = quantization
+        self.oversample = oversample or DEFAULT_OVERSAMPLE[quantization]
+        fd, path = tempfile.mkstemp(prefix="pagewise-vectors-", suffix=".f32", dir=rescore_dir)
+        self._file = os.fdopen(fd, "r+b")
+        try:
+            # Scratch data: freed with the process, never left behind
+            os.unlink(path)
+        except OSError:
+            pass
+        self._codes = self._scales = self._disk = None
+        super().__init__(embedding, dim)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, embedding):
+        raise TypeError("Snapshots are served from their mapped float32 matrix; "
+                        "open them with LocalVectorStore")
+
+    # ─── Vector storage ───────────────────────────────────────────────────
+    def _allocate(self, capacity: int, dim: int):
+        width = dim if self.quantization == "int8" else (dim + 7) // 8
+        dtype = np.int8 if self.quantization == "int8" else np.uint8
+        codes = np.zeros((capacity, width), dtype=dtype)
+        scales = np.ones(capacity, dtype=np.float32)
+        if self._size:
+            codes[:self._size] = self._codes[:self._size]
+            scales[:self._size] = self._scales[:self._size]
+        self._codes, self._scales = codes, scales
+
+        # Grows (or resets) the file; rows already written stay in place
+        self._disk = None
+        self._file.truncate(capacity * dim * 4)
+        if capacity and dim:
+            self._disk = np.memmap(self._file, dtype=np.float32, mode="r+", shape=(capacity, dim))
+
+    def _capacity(self) -> int:
+        return len(self._codes)
+
+    def _write(self, start: int, vectors: np.ndarray):
+        end = start + len(vectors)
+        if self.quantization == "int8":
+            self._codes[start:end], self._scales[start:end] = quantize_int8(vectors)
+        else:
+            self._codes[start:end] = quantize_binary(vectors)
+        self._disk[start:end] = vectors
+
+    def _read(self, rows) -> np.ndarray:
+        return np.array(self._disk[rows])
+
+    def _approx_scores(self, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Approximate similarity of `rows` to `query` from the codes alone (higher is closer)."""
+        out = np.empty(len(rows), dtype=np.float32)
+        for lo in range(0, len(rows), _BLOCK):
+            block = rows[lo:lo + _BLOCK]
+            # `rows` is sorted, so a block spanning exactly its length is a slice (no gather copy)
+            contiguous = block[-1] - block[0] == len(block) - 1
+            index = slice(block[0], block[-1] + 1) if contiguous else block
+            if self.quantization == "int8":
+                out[lo:lo + len(block)] = (self._codes[index].astype(np.float32) @ query) * self._scales[index]
+            else:
+                # bits · q ranks rows exactly like signs · q (= 2 bits · q - sum(q))
+                bits = np.unpackbits(self._codes[index], axis=1, count=self._dim)
+                out[lo:lo + len(block)] = bits.astype(np.float32) @ query
+        return out
+
+    def _rank(self, rows, query: np.ndarray, k: int) -> tuple:
+        if rows is None:
+            rows = np.arange(self._size)
+            approx = self._approx_scores(rows, query)
+            approx[~self._alive[:self._size]] = -np.inf
+        else:
+            rows = np.sort(rows)
+            approx = self._approx_scores(rows, query)
+
+        candidates = top_k(approx, k * self.oversample)
+        candidates = np.sort(rows[candidates[np.isfinite(approx[candidates])]])  # sequential disk reads
+        if not len(candidates):
+            return candidates, np.zeros(0, dtype=np.float32)
+        exact = self._disk[candidates] @ query
+        best = top_k(exact, k)
+        return candidates[best], exact[best]
+
+    def vector_bytes(self) -> int:
+        return self._codes[:self._size].nbytes + (self._scales[:self._size].nbytes
+                                                  if self.quantization == "int8" else 0)
+
+    def close(self):
+        self._disk = None
+        self._file.close()
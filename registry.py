@@ -0,0 +1,326 @@
+"""
+PDF Intelligence — Document Registry
+Embedded SQLite record of what is actually stored in the vector collection:
+one row per (scope, doc_id) with content hash, page and chunk counts,
+embedding model and ingest timestamps, plus a fingerprint and chunk count
+per stored page so a revised document only re-embeds the pages that
+changed. Survives restarts and is shared by every process using the same
+data directory.
+
+A scope is the string from engine.scope_key() — collection, tenant and
+partition. Each scope carries a version that is bumped on every change, so
+callers can key caches on (scope, version) without scanning the store.
+
+It also records which collection and embedding model are live for each
+base collection (see engine.live_config and migration.py), which
+collections a migration has paused writes to, and when each
+session partition was last used, so partitions of sessions that ended
+without a reset can be swept.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    scope            TEXT NOT NULL,
+    doc_id           TEXT NOT NULL,
+    name             TEXT NOT NULL,
+    content_hash     TEXT NOT NULL,
+    pages            INTEGER NOT NULL,
+    chunks           INTEGER NOT NULL,
+    embedding_model  TEXT NOT NULL,
+    first_ingested   REAL NOT NULL,
+    last_ingested    REAL NOT NULL,
+    PRIMARY KEY (scope, doc_id)
+);
+CREATE TABLE IF NOT EXISTS pages (
+    scope        TEXT NOT NULL,
+    doc_id       TEXT NOT NULL,
+    page         INTEGER NOT NULL,
+    fingerprint  TEXT NOT NULL,
+    chunks       INTEGER NOT NULL,
+    PRIMARY KEY (scope, doc_id, page)
+);
+CREATE TABLE IF NOT EXISTS partitions (
+    base       TEXT NOT NULL,
+    partition  TEXT NOT NULL,
+    last_seen  REAL NOT NULL,
+    PRIMARY KEY (base, partition)
+);
+CREATE TABLE IF NOT EXISTS scopes (
+    scope    TEXT PRIMARY KEY,
+    version  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    collection  TEXT PRIMARY KEY,
+    target      TEXT NOT NULL,
+    started     REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    base               TEXT PRIMARY KEY,
+    collection         TEXT NOT NULL,
+    embedding_model    TEXT NOT NULL,
+    embedding_version  TEXT NOT NULL,
+    activated          REAL NOT NULL
+);
+"""
+
+_FIELDS = ("doc_id", "name", "content_hash", "pages", "chunks", "embedding_model",
+           "first_ingested", "last_ingested")
+
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file, same digest the upload spool addresses blobs by."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class DocumentRegistry:
+    """Thread-safe SQLite registry of indexed documents."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _check_writable(self, scope: str):
+        collection = scope.split("/", 1)[0]
+        row = self._conn.execute("SELECT target FROM migrations WHERE collection = ?", (collection,)).fetchone()
+        if row:
+            raise RuntimeError(f"{collection} is being migrated to {row[0]}; retry after the cutover")
+
+    def _bump(self, scope: str):
+        self._conn.execute(
+            "INSERT INTO scopes (scope, version) VALUES (?, 1) "
+            "ON CONFLICT(scope) DO UPDATE SET version = version + 1",
+            (scope,),
+        )
+
+    # ─── Read ─────────────────────────────────────────────────────────────
+    def get(self, scope: str, doc_id: str):
+        """Registry row for `doc_id` as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM documents WHERE scope = ? AND doc_id = ?",
+                (scope, doc_id),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def find_content(self, scope: str, content_hash: str, embedding_model: str):
+        """A document in `scope` with this content and embedding model, as a dict, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM documents "
+                "WHERE scope = ? AND content_hash = ? AND embedding_model = ? LIMIT 1",
+                (scope, content_hash, embedding_model),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def documents(self, scope: str) -> list:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_FIELDS)} FROM documents WHERE scope = ? ORDER BY first_ingested",
+                (scope,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def totals(self, scope: str) -> dict:
+        """{documents, pages, chunks} stored in `scope`."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(pages), 0), COALESCE(SUM(chunks), 0) "
+                "FROM documents WHERE scope = ?",
+                (scope,),
+            ).fetchone()
+        return {"documents": row[0], "pages": row[1], "chunks": row[2]}
+
+    def pages(self, scope: str, doc_id: str) -> dict:
+        """{page: (fingerprint, chunks)} of the pages of `doc_id` stored in `scope`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT page, fingerprint, chunks FROM pages WHERE scope = ? AND doc_id = ?", (scope, doc_id)
+            ).fetchall()
+        return {r[0]: (r[1], r[2]) for r in rows}
+
+    def idle_partitions(self, base: str, before: float) -> list:
+        """Partitions under `base` (an untagged scope key) last used before `before`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT partition FROM partitions WHERE base = ? AND last_seen < ?", (base, before)
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def version(self, scope: str) -> int:
+        """Corpus version of `scope`; changes whenever its documents do."""
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM scopes WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else 0
+
+    def check_writable(self, scope: str):
+        """Raise RuntimeError while a migration has writes to `scope`'s collection paused."""
+        with self._lock:
+            self._check_writable(scope)
+
+    def live_embedding(self, base: str, default: dict) -> dict:
+        """
+        {collection, embedding_model, embedding_version} live for `base`.
+        Records `default` if nothing is recorded yet.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO embeddings (base, collection, embedding_model, embedding_version, activated) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (base, default["collection"], default["embedding_model"], default["embedding_version"], time.time()),
+            )
+            row = self._conn.execute(
+                "SELECT collection, embedding_model, embedding_version FROM embeddings WHERE base = ?", (base,)
+            ).fetchone()
+        return dict(row)
+
+    # ─── Write ────────────────────────────────────────────────────────────
+    def record(self, scope: str, doc_id: str, name: str, content_hash: str,
+               pages: int, chunks: int, embedding_model: str):
+        """Insert or replace a document after its vectors are stored."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._check_writable(scope)
+            self._conn.execute(
+                "INSERT INTO documents (scope, doc_id, name, content_hash, pages, chunks, "
+                "embedding_model, first_ingested, last_ingested) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(scope, doc_id) DO UPDATE SET name = excluded.name, "
+                "content_hash = excluded.content_hash, pages = excluded.pages, chunks = excluded.chunks, "
+                "embedding_model = excluded.embedding_model, last_ingested = excluded.last_ingested",
+                (scope, doc_id, name, content_hash, pages, chunks, embedding_model, now, now),
+            )
+            self._bump(scope)
+
+    def record_pages(self, scope: str, doc_id: str, pages: dict):
+        """Insert or replace {page: (fingerprint, chunks)} once those pages' vectors are stored."""
+        with self._lock, self._conn:
+            self._check_writable(scope)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (scope, doc_id, page, fingerprint, chunks) VALUES (?, ?, ?, ?, ?)",
+                [(scope, doc_id, page, fingerprint, chunks) for page, (fingerprint, chunks) in pages.items()],
+            )
+
+    def forget_pages(self, scope: str, doc_id: str, pages: list = None):
+        """Drop the page rows of `doc_id` (only `pages`, if given)."""
+        with self._lock, self._conn:
+            if pages is None:
+                self._conn.execute("DELETE FROM pages WHERE scope = ? AND doc_id = ?", (scope, doc_id))
+            else:
+                self._conn.executemany("DELETE FROM pages WHERE scope = ? AND doc_id = ? AND page = ?",
+                                       [(scope, doc_id, page) for page in pages])
+
+    def mark_stale(self, scope: str, doc_id: str):
+        """
+        Clear a document's content hash while its pages are rewritten, so an
+        interrupted update is redone even for the version recorded before.
+        """
+        with self._lock, self._conn:
+            if self._conn.execute("UPDATE documents SET content_hash = '' WHERE scope = ? AND doc_id = ?",
+                                  (scope, doc_id)).rowcount:
+                self._bump(scope)
+
+    def touch_partition(self, base: str, partition: str):
+        """Record that a live session is using `partition`."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO partitions (base, partition, last_seen) VALUES (?, ?, ?) "
+                "ON CONFLICT(base, partition) DO UPDATE SET last_seen = excluded.last_seen",
+                (base, partition, time.time()),
+            )
+
+    def remove_partition(self, base: str, partition: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM partitions WHERE base = ? AND partition = ?", (base, partition))
+
+    def remove(self, scope: str, doc_id: str) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE scope = ? AND doc_id = ?", (scope, doc_id))
+            deleted = self._conn.execute(
+                "DELETE FROM documents WHERE scope = ? AND doc_id = ?", (scope, doc_id)
+            ).rowcount
+            if deleted:
+                self._bump(scope)
+        return bool(deleted)
+
+    def remove_scope(self, scope: str) -> int:
+        """Forget every document in `scope`. Returns rows removed."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM documents WHERE scope = ?", (scope,)).rowcount
+            self._conn.execute("DELETE FROM pages WHERE scope = ?", (scope,))
+            self._bump(scope)
+        return deleted
+
+    def pause_writes(self, collection: str, target: str):
+        """
+        Refuse `record` and `record_pages` into `collection`'s scopes until
+        `cutover` (or `resume_writes`), so nothing is recorded as indexed
+        after a migration's final copy pass.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO migrations (collection, target, started) VALUES (?, ?, ?)",
+                               (collection, target, time.time()))
+
+    def resume_writes(self, collection: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM migrations WHERE collection = ?", (collection,))
+
+    def paused_writes(self) -> dict:
+        """{collection: target} of every collection with writes paused."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT collection, target FROM migrations").fetchall())
+
+    def cutover(self, base: str, old_collection: str, live: dict):
+        """
+        Atomically make `live` ({collection, embedding_model, embedding_version})
+        the live embedding for `base`, moving document rows from the old
+        collection's scopes to the new one's and resuming writes to it. A
+        scope is the bare collection name when it has no tags (collection
+        tenant mode, no partition).
+        """
+        old, new = old_collection, live["collection"]
+        # substr rather than LIKE: collection names contain "_", a LIKE wildcard
+        in_old = "(scope = ? OR substr(scope, 1, ?) = ?)"
+        args = (old, len(old) + 1, f"{old}/")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE embeddings SET collection = ?, embedding_model = ?, embedding_version = ?, activated = ? "
+                "WHERE base = ?",
+                (live["collection"], live["embedding_model"], live["embedding_version"], time.time(), base),
+            )
+            scopes = [r[0] for r in self._conn.execute(
+                f"SELECT scope FROM documents WHERE {in_old} UNION SELECT scope FROM pages WHERE {in_old}",
+                args + args,
+            )]
+            for scope in scopes:
+                moved = new + scope[len(old):]
+                self._conn.execute("DELETE FROM documents WHERE scope = ?", (moved,))
+                self._conn.execute(
+                    "UPDATE documents SET scope = ?, embedding_model = ? WHERE scope = ?",
+                    (moved, live["embedding_model"], scope),
+                )
+                # Chunk text is copied verbatim, so page fingerprints still hold
+                self._conn.execute("DELETE FROM pages WHERE scope = ?", (moved,))
+                self._conn.execute("UPDATE pages SET scope = ? WHERE scope = ?", (moved, scope))
+                self._bump(moved)
+            for partition_base in [r[0] for r in self._conn.execute(
+                    "SELECT DISTINCT base FROM partitions WHERE base = ? OR substr(base, 1, ?) = ?", args)]:
+                self._conn.execute("UPDATE OR REPLACE partitions SET base = ? WHERE base = ?",
+                                   (new + partition_base[len(old):], partition_base))
+            self._conn.execute("DELETE FROM migrations WHERE collection = ?", (old,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
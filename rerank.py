@@ -0,0 +1,91 @@
+"""
+PDF Intelligence — Cross-Encoder Reranking
+Optional second retrieval stage: the retriever fetches a wider candidate
+set, a small CPU cross-encoder scores every (question, chunk) pair in one
+batch, and only the best few chunks reach the prompt. Bi-encoder cosine
+alone is coarse, so without this users raise k "to be safe" and pay for it
+in prompt length and generation time.
+
+Scores are cached per (question, chunk text), so a repeated or regenerated
+question re-scores nothing, and a follow-up question only scores the chunks
+it has not seen.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+
+DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+def _import_cross_encoder():
+    from sentence_transformers import CrossEncoder
+    return CrossEncoder
+
+
+def _chunk_key(text: str) -> bytes:
+    return hashlib.md5(text.encode()).digest()
+
+
+class Reranker:
+    """Batched cross-encoder scoring with an LRU cache of pair scores."""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, batch_size: int = 32, cache_size: int = 4096,
+                 max_length: int = 512):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.model = _import_cross_encoder()(model_name, max_length=max_length, device="cpu")
+        self._cache = OrderedDict()   # (question, chunk digest) -> score
+        self._lock = threading.Lock()
+
+    def score(self, question: str, texts: list) -> list:
+        """Relevance score of each text to `question` (higher is better)."""
+        return self._score(question, texts)[0]
+
+    def _score(self, question: str, texts: list) -> tuple:
+        keys = [(question, _chunk_key(t)) for t in texts]
+        scores = [None] * len(texts)
+        with self._lock:
+            for i, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[i] = self._cache[key]
+        todo = [i for i, s in enumerate(scores) if s is None]
+        if todo:
+            predicted = self.model.predict([(question, texts[i]) for i in todo], batch_size=self.batch_size,
+                                           show_progress_bar=False)
+            with self._lock:
+                for i, s in zip(todo, predicted):
+                    scores[i] = self._cache[keys[i]] = float(s)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        metrics.CACHE.inc(len(texts) - len(todo), cache="rerank", result="hit")
+        metrics.CACHE.inc(len(todo), cache="rerank", result="miss")
+        return scores, len(texts) - len(todo)
+
+    def rerank(self, question: str, docs: list, top_n: int) -> tuple:
+        """
+        The `top_n` best of `docs`, each with metadata["rerank_score"], and
+        {model, candidates, kept, cached, seconds}.
+        """
+        start = time.perf_counter()
+        scores, cached = self._score(question, [d.page_content for d in docs])
+        order = sorted(range(len(docs)), key=lambda i: scores[i], reverse=True)[:top_n]
+        kept = []
+        for i in order:
+            docs[i].metadata["rerank_score"] = round(scores[i], 4)
+            kept.append(docs[i])
+        elapsed = time.perf_counter() - start
+        metrics.QUERY_SECONDS.observe(elapsed, stage="rerank")
+        return kept, {
+            "model": self.model_name,
+            "candidates": len(docs),
+            "kept": len(kept),
+            "cached": cached,
+            "seconds": round(elapsed, 4),
+        }
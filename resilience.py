@@ -0,0 +1,348 @@
+"""
+PDF Intelligence — Stream Resilience
+Handles: first-token deadlines, bounded retries with jittered backoff,
+hedged requests for sync and async LLM token streams
+"""
+
+import asyncio
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+
+# ─── Policy ───────────────────────────────────────────────────────────────────
+DEFAULT_STREAM_POLICY = {
+    "first_token_timeout": 8.0,   # seconds to wait for the first token
+    "idle_timeout": 20.0,         # max gap between tokens once streaming
+    "max_retries": 2,             # extra attempts after the first one
+    "backoff_base": 0.4,          # seconds, doubled per retry
+    "backoff_max": 4.0,
+    "hedge_after": None,          # seconds, "p95", or None to disable hedging
+    "hedge_fallback": 2.5,        # used by "p95" until enough samples exist
+    "hedge_min_samples": 20,
+}
+
+
+class StreamTimeout(Exception):
+    """Raised when a stream misses its first-token or idle deadline."""
+
+
+# ─── TTFT tracking (adaptive hedge threshold) ─────────────────────────────────
+class LatencyWindow:
+    """Rolling window of time-to-first-token samples."""
+
+    def __init__(self, size: int = 200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        idx = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[idx]
+
+    def __len__(self):
+        return len(self._samples)
+
+
+TTFT_WINDOW = LatencyWindow()
+
+
+def _hedge_delay(policy: dict, window: LatencyWindow):
+    hedge_after = policy.get("hedge_after")
+    if hedge_after is None:
+        return None
+    if hedge_after == "p95":
+        if len(window) < policy["hedge_min_samples"]:
+            return policy["hedge_fallback"]
+        return window.percentile(95)
+    return float(hedge_after)
+
+
+def _backoff(policy: dict, retry: int) -> float:
+    """Full-jitter exponential backoff."""
+    cap = min(policy["backoff_max"], policy["backoff_base"] * (2 ** (retry - 1)))
+    return random.uniform(0, cap)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Client errors (bad key, bad request) are not worth retrying."""
+    if isinstance(exc, StreamTimeout):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500:
+        return status in (408, 409, 429)
+    return True
+
+
+def text_tokens(tokens):
+    """
+    Drop empty deltas (e.g. the role-only first chunk of an OpenAI-style
+    stream), so only real text counts as a first token or resets the idle
+    deadline.
+    """
+    return (token for token in tokens if token)
+
+
+# ─── Stream attempt ───────────────────────────────────────────────────────────
+class _StreamAttempt(threading.Thread):
+    """Drains one provider stream into a shared event queue."""
+
+    def __init__(self, attempt_id: int, start_stream, events: queue.Queue):
+        super().__init__(daemon=True, name=f"llm-stream-{attempt_id}")
+        self.attempt_id = attempt_id
+        self.started_at = time.monotonic()
+        self._start_stream = start_stream
+        self._events = events
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        stream = None
+        try:
+            stream = self._start_stream()
+            for token in stream:
+                if self._cancelled.is_set():
+                    break
+                self._events.put((self.attempt_id, "token", token))
+            else:
+                self._events.put((self.attempt_id, "done", None))
+        except Exception as e:
+            self._events.put((self.attempt_id, "error", e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+
+# ─── Resilient stream ─────────────────────────────────────────────────────────
+def resilient_stream(start_stream, policy: dict = None, window: LatencyWindow = TTFT_WINDOW,
+                     on_event=None):
+    """
+    Yield tokens from `start_stream()` with deadlines, retries and hedging.
+
+    Args:
+        start_stream: zero-arg callable returning a fresh token iterator
+        policy: overrides for DEFAULT_STREAM_POLICY
+        window: TTFT samples used by the "p95" hedge threshold
+        on_event: optional callback(name, **info) for "retry", "hedge", "first_token"
+
+    Retries and hedging only apply before the first token is delivered; once
+    tokens have been yielded, a failure or idle stall is raised to the caller.
+    """
+    policy = {**DEFAULT_STREAM_POLICY, **(policy or {})}
+    notify = on_event or (lambda name, **info: None)
+    next_id = 0
+    retry = 0
+
+    while True:
+        events = queue.Queue()
+        primary = _StreamAttempt(next_id, start_stream, events)
+        next_id += 1
+        primary.start()
+        live = {primary.attempt_id: primary}
+        started = primary.started_at
+        hedge_delay = _hedge_delay(policy, window)
+        winner, first = None, None
+        last_error = None
+
+        while winner is None and live:
+            now = time.monotonic()
+            deadline = started + policy["first_token_timeout"]
+            hedge_at = started + hedge_delay if hedge_delay is not None else None
+            wait_until = min(deadline, hedge_at) if hedge_at is not None else deadline
+            try:
+                attempt_id, kind, payload = events.get(timeout=max(0.0, wait_until - now))
+            except queue.Empty:
+                if hedge_at is not None and time.monotonic() >= hedge_at and deadline > hedge_at:
+                    hedge = _StreamAttempt(next_id, start_stream, events)
+                    next_id += 1
+                    hedge.start()
+                    live[hedge.attempt_id] = hedge
+                    hedge_delay = None
+                    notify("hedge", after=hedge_at - started)
+                    continue
+                last_error = StreamTimeout(
+                    f"No first token within {policy['first_token_timeout']:.1f}s"
+                )
+                break
+
+            if attempt_id not in live:
+                continue
+            if kind == "error":
+                live.pop(attempt_id)
+                last_error = payload
+                if not is_retryable(payload):
+                    break
+            else:
+                winner, first = live.pop(attempt_id), (kind, payload)
+
+        for loser in live.values():
+            loser.cancel()
+
+        if winner is not None:
+            break
+
+        primary.cancel()
+        retry += 1
+        if retry > policy["max_retries"] or not is_retryable(last_error):
+            raise last_error
+        delay = _backoff(policy, retry)
+        notify("retry", attempt=retry, delay=delay, error=last_error)
+        time.sleep(delay)
+
+    ttft = time.monotonic() - winner.started_at
+    window.add(ttft)
+    notify("first_token", ttft=ttft, attempt=winner.attempt_id)
+
+    try:
+        kind, payload = first
+        while kind == "token":
+            yield payload
+            while True:
+                try:
+                    attempt_id, kind, payload = events.get(timeout=policy["idle_timeout"])
+                except queue.Empty:
+                    raise StreamTimeout(
+                        f"Stream stalled for {policy['idle_timeout']:.1f}s"
+                    ) from None
+                if attempt_id == winner.attempt_id:
+                    break
+        if kind == "error":
+            raise payload
+    finally:
+        winner.cancel()
+
+
+# ─── Async resilient stream ───────────────────────────────────────────────────
+async def _adrain(attempt_id: int, start_stream, events):
+    """Drain one async provider stream into a shared asyncio queue."""
+    try:
+        stream = start_stream()
+        try:
+            async for token in stream:
+                events.put_nowait((attempt_id, "token", token))
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        events.put_nowait((attempt_id, "done", None))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        events.put_nowait((attempt_id, "error", e))
+
+
+async def aresilient_stream(start_stream, policy: dict = None, window: LatencyWindow = TTFT_WINDOW,
+                            on_event=None):
+    """
+    Async counterpart of `resilient_stream`.
+
+    `start_stream()` must return a fresh async token iterator. Attempts run
+    as tasks on the current event loop, so a losing hedge or a timed-out
+    attempt is cancelled outright instead of left to drain in a thread.
+    """
+    policy = {**DEFAULT_STREAM_POLICY, **(policy or {})}
+    notify = on_event or (lambda name, **info: None)
+    next_id = 0
+    retry = 0
+
+    while True:
+        events = asyncio.Queue()
+        live = {}
+
+        def _launch():
+            nonlocal next_id
+            task = asyncio.ensure_future(_adrain(next_id, start_stream, events))
+            live[next_id] = (task, time.monotonic())
+            next_id += 1
+
+        _launch()
+        started = time.monotonic()
+        hedge_delay = _hedge_delay(policy, window)
+        winner, first = None, None
+        last_error = None
+
+        try:
+            while winner is None and live:
+                now = time.monotonic()
+                deadline = started + policy["first_token_timeout"]
+                hedge_at = started + hedge_delay if hedge_delay is not None else None
+                wait_until = min(deadline, hedge_at) if hedge_at is not None else deadline
+                try:
+                    attempt_id, kind, payload = await asyncio.wait_for(
+                        events.get(), timeout=max(0.0, wait_until - now)
+                    )
+                except asyncio.TimeoutError:
+                    if hedge_at is not None and time.monotonic() >= hedge_at and deadline > hedge_at:
+                        _launch()
+                        hedge_delay = None
+                        notify("hedge", after=hedge_at - started)
+                        continue
+                    last_error = StreamTimeout(
+                        f"No first token within {policy['first_token_timeout']:.1f}s"
+                    )
+                    break
+
+                if attempt_id not in live:
+                    continue
+                if kind == "error":
+                    live.pop(attempt_id)
+                    last_error = payload
+                    if not is_retryable(payload):
+                        break
+                else:
+                    winner, first = (attempt_id, *live.pop(attempt_id)), (kind, payload)
+        finally:
+            for task, _ in live.values():
+                task.cancel()
+
+        if winner is not None:
+            break
+
+        retry += 1
+        if retry > policy["max_retries"] or not is_retryable(last_error):
+            raise last_error
+        delay = _backoff(policy, retry)
+        notify("retry", attempt=retry, delay=delay, error=last_error)
+        await asyncio.sleep(delay)
+
+    winner_id, winner_task, winner_started = winner
+    ttft = time.monotonic() - winner_started
+    window.add(ttft)
+    notify("first_token", ttft=ttft, attempt=winner_id)
+
+    try:
+        kind, payload = first
+        while kind == "token":
+            yield payload
+            while True:
+                try:
+                    attempt_id, kind, payload = await asyncio.wait_for(
+                        events.get(), timeout=policy["idle_timeout"]
+                    )
+                except asyncio.TimeoutError:
+                    raise StreamTimeout(
+                        f"Stream stalled for {policy['idle_timeout']:.1f}s"
+                    ) from None
+                if attempt_id == winner_id:
+                    break
+        if kind == "error":
+            raise payload
+    finally:
+        winner_task.cancel()
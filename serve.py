@@ -0,0 +1,51 @@
+"""
+PDF Intelligence — Server Launcher
+Starts the engine warm-up and the /metrics endpoint at server boot, then
+runs Streamlit in the same process so sessions reuse the already-loaded model. Optionally blocks
+until warm and touches a readiness file for orchestrator probes.
+
+    python serve.py                                  # = streamlit run app.py
+    python serve.py --ready-file /tmp/ready -- --server.port 8080
+"""
+
+import argparse
+import os
+import sys
+import threading
+
+import engine
+import metrics
+import warmup
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm up the engine, then serve the Streamlit app")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    parser.add_argument("--ready-file", help="Touched once warm-up finishes (for readiness probes)")
+    parser.add_argument("--wait", action="store_true", help="Block until warm before accepting traffic")
+    parser.add_argument("streamlit_args", nargs="*", help="Passed through to `streamlit run` (after --)")
+    args = parser.parse_args(argv)
+
+    config = engine.live_config(engine.load_config(engine.load_secrets_file(args.secrets)))
+    run = warmup.start(config)
+    if config["metrics_port"]:
+        metrics.start_server(config["metrics_port"], config["metrics_host"])
+
+    if args.ready_file:
+        def _mark_ready():
+            run.wait()
+            with open(args.ready_file, "w") as f:
+                f.write("ok\n" if run.status()["ok"] else "degraded\n")
+        threading.Thread(target=_mark_ready, name="pagewise-ready", daemon=True).start()
+
+    if args.wait:
+        run.wait()
+
+    from streamlit.web import cli as stcli
+    app = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+    sys.argv = ["streamlit", "run", app, *args.streamlit_args]
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
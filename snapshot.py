@@ -0,0 +1,352 @@
+"""
+PDF Intelligence — Index Snapshots
+A portable, write-once copy of one scope of a collection: its unit
+embedding matrix, chunk texts, ids and metadata, plus the registry rows of
+its documents. A local store opens a snapshot by memory-mapping it, so a
+replica cold-starts without re-embedding or parsing anything, and every
+process serving the same files shares one copy in the page cache.
+
+    python ingest.py filings/ --processes 0 --snapshot snapshots/filings   # build
+    python snapshot.py export snapshots/filings --partition shared        # from AstraDB
+    python snapshot.py import snapshots/filings --tenant acme             # into a collection
+    PAGEWISE_VECTOR_STORE=local PAGEWISE_SNAPSHOT=snapshots/filings       # serve it
+
+Layout (one directory, little-endian):
+
+    manifest.json     format, count, dim, embedding stamp, scope tags,
+                      metadata keys and value tables, documents
+    vectors.f32       float32 [count, dim], unit rows, row-major
+    text.bin          UTF-8 chunk texts back to back
+    text_offsets.npy  int64 [count + 1] byte offsets into text.bin
+    ids.npy           chunk ids (fixed-width UTF-8), in row order
+    id_index.npy      the same ids sorted, and id_rows.npy their rows
+    meta.npy          int32 [count, keys]: index into each key's value
+                      table, -1 where a chunk lacks the key
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+
+import engine
+import metrics
+from local_store import normalize
+
+
+FORMAT = 1
+
+
+def _encode(value) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+def _map(path: str, dtype, shape: tuple):
+    if not np.prod(shape):
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+# ─── Reader ───────────────────────────────────────────────────────────────────
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot directory."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("format") != FORMAT:
+            raise ValueError(f"{path}: unsupported snapshot format {self.manifest.get('format')!r}")
+        self.count, self.dim = self.manifest["count"], self.manifest["dim"]
+        self.keys = self.manifest["keys"]
+        self._values = self.manifest["values"]
+        self._codes = {}   # key -> {encoded value: index}, built on first filter by key
+        self._fixed = {}   # key -> value every row reads as (see rescope)
+
+        self.vectors = _map(os.path.join(path, "vectors.f32"), np.float32, (self.count, self.dim))
+        self._text = _map(os.path.join(path, "text.bin"), np.uint8, (self.manifest["text_bytes"],))
+        self._offsets = self._load("text_offsets.npy")
+        self._ids = self._load("ids.npy")
+        self._id_index = self._load("id_index.npy")
+        self._id_rows = self._load("id_rows.npy")
+        self._meta = self._load("meta.npy")
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, name), mmap_mode="r")
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def scope(self) -> dict:
+        return self.manifest["scope"]
+
+    @property
+    def documents(self) -> list:
+        return self.manifest["documents"]
+
+    def id(self, row: int) -> str:
+        return self._ids[row].decode()
+
+    def text(self, row: int) -> str:
+        return self._text[self._offsets[row]:self._offsets[row + 1]].tobytes().decode()
+
+    def metadata(self, row: int) -> dict:
+        stored = {key: self._values[j][code] for j, (key, code) in enumerate(zip(self.keys, self._meta[row]))
+                  if code >= 0}
+        return {**stored, **self._fixed}
+
+    def rescope(self, tags: dict):
+        """Serve every row as if tagged with `tags` (e.g. the shared partition), whatever it was exported with."""
+        self._fixed = dict(tags)
+
+    def row_of(self, chunk_id: str):
+        """Row of `chunk_id` (binary search over the sorted ids), or None."""
+        key = chunk_id.encode()
+        i = int(np.searchsorted(self._id_index, key))
+        if i < self.count and self._id_index[i] == key:
+            return int(self._id_rows[i])
+        return None
+
+    def rows_where(self, filter: dict) -> np.ndarray:
+        """Rows whose metadata equals every item of `filter` (or is one of a {"$in": [...]})."""
+        mask = np.ones(self.count, dtype=bool)
+        for key, value in filter.items():
+            values = value["$in"] if isinstance(value, dict) else (value,)
+            if key in self._fixed:
+                if self._fixed[key] not in values:
+                    return np.zeros(0, dtype=np.int64)
+                continue
+            if key not in self.keys:
+                return np.zeros(0, dtype=np.int64)
+            if key not in self._codes:
+                self._codes[key] = {_encode(v): i for i, v in enumerate(self._values[self.keys.index(key)])}
+            codes = [self._codes[key][_encode(v)] for v in values if _encode(v) in self._codes[key]]
+            if not codes:
+                return np.zeros(0, dtype=np.int64)
+            mask &= np.isin(self._meta[:, self.keys.index(key)], codes)
+        return np.flatnonzero(mask)
+
+
+# ─── Writer ───────────────────────────────────────────────────────────────────
+class SnapshotWriter:
+    """
+    Streams rows into a temporary sibling directory; finish() writes the
+    index files and manifest, then moves it over `path` in one rename.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+        self.tmp = f"{self.path}.tmp-{os.getpid()}"
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        os.makedirs(self.tmp)
+        self._vectors = open(os.path.join(self.tmp, "vectors.f32"), "wb")
+        self._text = open(os.path.join(self.tmp, "text.bin"), "wb")
+        self._offsets = [0]
+        self._ids, self._metadatas = [], []
+        self.dim = None
+
+    def add(self, docs: list, vectors):
+        vectors = normalize(vectors)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match snapshot dimension {self.dim}")
+        self._vectors.write(vectors.astype("<f4").tobytes())
+        for doc in docs:
+            text = doc.page_content.encode()
+            self._text.write(text)
+            self._offsets.append(self._offsets[-1] + len(text))
+            self._ids.append(doc.id)
+            self._metadatas.append(doc.metadata)
+
+    def finish(self, info: dict) -> dict:
+        self._vectors.close()
+        self._text.close()
+        keys = sorted({key for meta in self._metadatas for key in meta})
+        tables = {key: {} for key in keys}   # key -> {encoded value: index}
+        meta = np.full((len(self._ids), len(keys)), -1, dtype=np.int32)
+        for row, metadata in enumerate(self._metadatas):
+            for j, key in enumerate(keys):
+                if key in metadata:
+                    meta[row, j] = tables[key].setdefault(_encode(metadata[key]), len(tables[key]))
+
+        ids = np.array([i.encode() for i in self._ids], dtype=bytes) if self._ids else np.zeros(0, dtype="S1")
+        order = np.argsort(ids, kind="stable")
+        np.save(os.path.join(self.tmp, "text_offsets.npy"), np.array(self._offsets, dtype=np.int64))
+        np.save(os.path.join(self.tmp, "ids.npy"), ids)
+        np.save(os.path.join(self.tmp, "id_index.npy"), ids[order])
+        np.save(os.path.join(self.tmp, "id_rows.npy"), order.astype(np.int64))
+        np.save(os.path.join(self.tmp, "meta.npy"), meta)
+
+        manifest = {
+            "format": FORMAT,
+            "count": len(self._ids),
+            "dim": self.dim or 0,
+            "text_bytes": self._offsets[-1],
+            "created": time.time(),
+            **info,
+            "keys": keys,
+            "values": [[json.loads(v) for v in tables[key]] for key in keys],
+        }
+        with open(os.path.join(self.tmp, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        old = f"{self.path}.old-{os.getpid()}"
+        if os.path.exists(self.path):
+            os.rename(self.path, old)
+        os.rename(self.tmp, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+        return manifest
+
+
+# ─── Export / Import ──────────────────────────────────────────────────────────
+def scan_embeddings(vstore, filter: dict = None, batch_size: int = 256):
+    """Yield (Documents with ids, vectors) for every stored chunk matching `filter`."""
+    if hasattr(vstore, "iter_embeddings"):
+        yield from vstore.iter_embeddings(batch_size, filter)
+        return
+    # AstraDB: page through the collection with vectors projected in
+    codec = vstore.document_codec
+    docs, vectors = [], []
+    for raw in vstore.astra_env.collection.find(codec.encode_filter(filter or {}), projection={"*": True}):
+        doc, vector = codec.decode(raw), codec.decode_vector(raw)
+        if doc is None or vector is None:
+            continue
+        doc.id = codec.get_id(raw)
+        docs.append(doc)
+        vectors.append(vector)
+        if len(docs) >= batch_size:
+            yield docs, np.asarray(vectors, dtype=np.float32)
+            docs, vectors = [], []
+    if docs:
+        yield docs, np.asarray(vectors, dtype=np.float32)
+
+
+def export_snapshot(config: dict, vstore, path: str, partition: str = None, batch_size: int = 256) -> dict:
+    """Write the chunks and registry documents of one scope to a snapshot at `path`. Returns the manifest."""
+    tags = engine.scope(config, partition)
+    writer = SnapshotWriter(path)
+    try:
+        for docs, vectors in scan_embeddings(vstore, tags, batch_size):
+            writer.add(docs, vectors)
+        return writer.finish({
+            **engine.embedding_stamp(config),
+            "collection": engine.tenant_collection(config),
+            "scope": tags,
+            "documents": engine.get_registry(config).documents(engine.scope_key(config, partition)),
+        })
+    except BaseException:
+        shutil.rmtree(writer.tmp, ignore_errors=True)
+        raise
+
+
+def _check_model(config: dict, snapshot: Snapshot):
+    if snapshot.manifest["embedding_model"] != config["embedding_model"]:
+        raise ValueError(f"{snapshot.path} was embedded with {snapshot.manifest['embedding_model']}, "
+                         f"but {engine.tenant_collection(config)} uses {config['embedding_model']}")
+
+
+def _record_documents(config: dict, snapshot: Snapshot, partition: str = None):
+    registry = engine.get_registry(config)
+    key = engine.scope_key(config, partition)
+    for d in snapshot.documents:
+        registry.record(key, d["doc_id"], d["name"], d["content_hash"], d["pages"], d["chunks"],
+                        d["embedding_model"])
+
+
+def open_store(config: dict, path: str):
+    """
+    LocalVectorStore serving the snapshot at `path` in place, its chunks in
+    the shared partition that every session searches (whatever partition
+    they were exported from). The snapshot must belong to `config`'s
+    tenant; its documents are recorded in the registry.
+    """
+    snapshot = Snapshot(path)
+    _check_model(config, snapshot)
+    if config["tenant_mode"] == "metadata" and snapshot.scope.get(engine.TENANT_KEY) != config["tenant"]:
+        raise ValueError(f"{path} holds tenant {snapshot.scope.get(engine.TENANT_KEY)!r}, "
+                         f"not {config['tenant']!r}; import it instead")
+    snapshot.rescope({engine.PARTITION_KEY: config["shared_partition"]})
+    store = engine._import_local_store().from_snapshot(snapshot, engine.get_embeddings(config["embedding_model"]))
+    _record_documents(config, snapshot, config["shared_partition"])
+    return store
+
+
+def import_snapshot(config: dict, path: str, partition: str = None, batch_size: int = 256, log=None) -> dict:
+    """
+    Copy a snapshot into `config`'s live collection under the scope of
+    (tenant, `partition`), re-tagging chunks and ids; nothing is
+    re-embedded. Returns {chunks, documents}.
+    """
+    log = log or (lambda message: None)
+    snapshot = Snapshot(path)
+    _check_model(config, snapshot)
+    vstore = engine.get_vector_store(config)
+    source, tags = snapshot.scope, engine.scope(config, partition)
+
+    for lo in range(0, len(snapshot), batch_size):
+        rows = range(lo, min(lo + batch_size, len(snapshot)))
+        texts = [snapshot.text(r) for r in rows]
+        metadatas = [{**{k: v for k, v in snapshot.metadata(r).items() if k not in source}, **tags} for r in rows]
+        # Chunk ids are "<scope prefix>/<doc>:<page>:<n>"; swap the prefix for the target scope
+        ids = [engine.scoped_id(snapshot.id(r).split("/", 1)[1] if source else snapshot.id(r), tags) for r in rows]
+        vectors = np.asarray(snapshot.vectors[lo:rows.stop])
+        try:
+            if hasattr(vstore, "add_vectors"):
+                vstore.add_vectors(vectors, texts, metadatas, ids)
+            else:
+                vstore.delete(ids=ids)
+                vstore.astra_env.collection.insert_many([
+                    vstore.document_codec.encode(text, i, vector.tolist(), meta)
+                    for text, i, vector, meta in zip(texts, ids, vectors, metadatas)
+                ])
+        except Exception:
+            metrics.STORE_ERRORS.inc(op="add")
+            raise
+        log(f"  {rows.stop}/{len(snapshot)} chunks")
+
+    _record_documents(config, snapshot, partition)
+    return {"chunks": len(snapshot), "documents": len(snapshot.documents)}
+
+
+# ─── CLI ──────────────────────────────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export, import or inspect index snapshots")
+    parser.add_argument("command", choices=("export", "import", "info"))
+    parser.add_argument("path", help="Snapshot directory")
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    parser.add_argument("--tenant", help="Tenant to export from / import into (default: PAGEWISE_TENANT)")
+    parser.add_argument("--partition", help="Partition to export / import into (default: tenant-wide)")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+
+    if args.command == "info":
+        snapshot = Snapshot(args.path)
+        info = {k: v for k, v in snapshot.manifest.items() if k not in ("values", "documents")}
+        print(json.dumps({**info, "documents": len(snapshot.documents)}))
+        return 0
+
+    config = engine.live_config(engine.load_config(engine.load_secrets_file(args.secrets), tenant=args.tenant))
+    if args.command == "export":
+        if config["vector_store"] == "local":
+            parser.error("the local store is empty in a new process; build it with "
+                         "`python ingest.py ... --processes 0 --snapshot PATH`")
+        manifest = export_snapshot(config, engine.get_vector_store(config), args.path, args.partition,
+                                   args.batch_size)
+        log(f"Wrote {manifest['count']} chunks of {len(manifest['documents'])} document(s) to {args.path}")
+        return 0
+
+    log(f"Importing {args.path} into {engine.scope_key(config, args.partition)}...")
+    log(json.dumps(import_snapshot(config, args.path, args.partition, args.batch_size, log=log)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
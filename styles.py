@@ -3,9 +3,9 @@ PDF Intelligence — Global CSS Design System
 Deep Intelligence aesthetic: Dark, precise, layered, trustworthy.
 """
 
+# Fonts are bundled and declared by assets.py; this is the source the
+# minified, content-hashed stylesheet is built from.
 GLOBAL_CSS = """
-<link href="https://fonts.googleapis.com/css2?family=DM+Sans:ital,opsz,wght@0,9..40,300;0,9..40,400;0,9..40,500;1,9..40,400&family=Lora:ital,wght@0,400;0,500;1,400&family=JetBrains+Mono:wght@400;500&display=swap" rel="stylesheet">
-
 <style>
 
 /* ════════════════════════════════════════════════════════════════════
@@ -277,6 +277,26 @@ button, input, select, textarea {
   border: 1px solid rgba(45,212,191,0.25);
 }
 
+.status-partial {
+  background: var(--accent-primary-glow);
+  color: var(--accent-primary);
+  border: 1px solid rgba(79,131,255,0.3);
+}
+
+.doc-coverage {
+  height: 3px;
+  margin-top: 6px;
+  border-radius: 2px;
+  background: var(--color-border);
+  overflow: hidden;
+}
+
+.doc-coverage-fill {
+  height: 100%;
+  background: var(--accent-primary);
+  transition: width 0.4s ease;
+}
+
 /* Mode tooltip */
 .mode-tooltip {
   font-size: 12px;
@@ -750,6 +770,23 @@ button, input, select, textarea {
   padding: 0 2px;
 }
 
+/* Collapsed citations on older messages */
+.citation-summary {
+  font-size: 12px;
+  color: var(--text-muted);
+  font-family: var(--font-mono);
+  padding: 2px 0 10px 0;
+}
+
+/* Transcript window */
+.transcript-window-note {
+  font-size: 12px;
+  color: var(--text-muted);
+  font-family: var(--font-mono);
+  text-align: center;
+  margin: 4px 0 12px 0;
+}
+
 /* ════════════════════════════════════════════════════════════════════
    DEVELOPER PANEL
 ═══════════════════════════════════════════════════════════════════ */
@@ -791,6 +828,13 @@ button, input, select, textarea {
   font-size: 11px;
 }
 
+.dev-profile-row .dev-key {
+  overflow-wrap: anywhere;
+  padding-right: 8px;
+}
+
+.dev-profile-row .dev-val { white-space: nowrap; }
+
 .dev-chunk-box {
   background: var(--color-surface-2);
   border: 1px solid var(--color-border);
@@ -0,0 +1,19 @@
+import os
+import sys
+import uuid
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+from benchmarks.hashing_embeddings import HashingEmbeddings  # noqa: E402
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    """Local-store engine config with offline hashing embeddings."""
+    monkeypatch.setattr(engine, "get_embeddings", lambda model_name=None: HashingEmbeddings(dim=384))
+    return engine.live_config(engine.load_config(
+        {}, vector_store="local", data_dir=str(tmp_path), collection_name=f"test_{uuid.uuid4().hex[:8]}",
+    ))
@@ -0,0 +1,29 @@
+import os
+
+import assets
+
+
+def test_fonts_are_bundled_and_declared():
+    css = assets.font_face_css()
+    for face in assets.FONT_FACES:
+        name = assets.font_file(*face)
+        assert os.path.getsize(os.path.join(assets.FONTS_DIR, name)) > 0
+        assert f'url("fonts/{name}")' in css
+    assert "http" not in assets.stylesheet()[1]
+
+
+def test_committed_stylesheet_is_current():
+    # Fails after a styles.py edit until `python assets.py build` is run and committed
+    name, css = assets.stylesheet()
+    with open(os.path.join(assets.STATIC_DIR, name), encoding="utf-8") as f:
+        assert f.read() == css
+
+
+def test_stylesheet_html_never_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(assets, "static_css_served", lambda: True)
+    monkeypatch.setattr(assets, "STATIC_DIR", str(tmp_path))
+    assert assets.stylesheet_html().startswith("<style>")
+    assert os.listdir(tmp_path) == []
+
+    name = assets.build_stylesheet(str(tmp_path))
+    assert assets.stylesheet_html().startswith(f'<link rel="stylesheet" href="app/static/{name}')
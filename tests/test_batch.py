@@ -0,0 +1,27 @@
+import io
+import json
+
+import batch
+import engine
+from benchmarks.hashing_embeddings import HashingEmbeddings
+from local_store import LocalVectorStore
+
+
+def test_bad_question_line_fails_alone(config, monkeypatch):
+    monkeypatch.setattr(engine, "answer_question", lambda config, chain, retriever, question: {
+        "answer": f"re: {question}", "sources": [], "timings": {}, "error": None,
+    })
+    questions = [
+        {"id": "a", "question": "first"},
+        {"id": "b", "question": "second", "k": "ten"},
+        {"id": "c", "question": "third", "k": 2},
+    ]
+    out = io.StringIO()
+    summary = batch.run_batch(config, LocalVectorStore(HashingEmbeddings(dim=64)), questions, out,
+                              workers=2, k=4, mode="⚡ Factual Answer", strict=False, log=lambda *_: None)
+
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r["id"] for r in records] == ["a", "b", "c"]
+    assert [r["answer"] for r in records] == ["re: first", "", "re: third"]
+    assert records[1]["error"] and "ten" in records[1]["error"]
+    assert summary["questions"] == 3 and summary["failed"] == 1
@@ -0,0 +1,26 @@
+import io
+
+from blob_store import BlobStore
+
+
+def test_same_bytes_put_twice_by_one_owner_need_two_releases(tmp_path):
+    spool = BlobStore(str(tmp_path))
+    first = spool.put(io.BytesIO(b"%PDF same bytes"), owner="session")
+    second = spool.put(io.BytesIO(b"%PDF same bytes"), owner="session")
+    assert first == second
+
+    spool.release(first, "session")
+    assert spool.exists(first)   # the second upload is still being ingested
+    spool.release(second, "session")
+    assert not spool.exists(first)
+
+
+def test_release_by_another_owner_keeps_blob(tmp_path):
+    spool = BlobStore(str(tmp_path))
+    digest = spool.put(io.BytesIO(b"%PDF shared"), owner="a")
+    spool.put(io.BytesIO(b"%PDF shared"), owner="b")
+    spool.release(digest, "a")
+    spool.release(digest, "a")
+    assert spool.exists(digest)
+    spool.release(digest, "b")
+    assert not spool.exists(digest)
@@ -0,0 +1,18 @@
+import engine
+
+OFF = {"PAGEWISE_METRICS_PORT": 0, "PAGEWISE_PROGRESSIVE_PAGES": 0, "PAGEWISE_PARTITION_TTL_HOURS": 0}
+
+
+def test_zero_in_secrets_turns_features_off(tmp_path, monkeypatch):
+    monkeypatch.setenv("PAGEWISE_METRICS_PORT", "9999")   # secrets win over the environment
+    (tmp_path / "secrets.toml").write_text("".join(f"{key} = {value}\n" for key, value in OFF.items()))
+    config = engine.load_config(engine.load_secrets_file(str(tmp_path / "secrets.toml")))
+    assert (config["metrics_port"], config["progressive_pages"], config["partition_ttl_hours"]) == (0, 0, 0)
+
+
+def test_missing_or_empty_secret_falls_back_to_environment(monkeypatch):
+    monkeypatch.setenv("PAGEWISE_METRICS_PORT", "9999")
+    monkeypatch.setenv("PAGEWISE_PROGRESSIVE_PAGES", "0")
+    config = engine.load_config({"PAGEWISE_METRICS_PORT": ""})
+    assert config["metrics_port"] == 9999 and config["progressive_pages"] == 0
+    assert config["partition_ttl_hours"] == engine.DEFAULT_CONFIG["partition_ttl_hours"]
@@ -0,0 +1,22 @@
+import ingest
+
+
+def test_dedup_reports_id_collisions(tmp_path):
+    paths = {}
+    for name, body in (("a.pdf", b"one"), ("b.pdf", b"one"), ("c.pdf", b"two"), ("d.pdf", b"three")):
+        paths[name] = str(tmp_path / name)
+        (tmp_path / name).write_bytes(body)
+    files = [
+        {"path": paths["a.pdf"], "name": "a.pdf", "id": "x"},
+        {"path": paths["b.pdf"], "name": "b.pdf", "id": "y"},   # same content as a
+        {"path": paths["c.pdf"], "name": "c.pdf", "id": "x"},   # same id as a, other content
+        {"path": paths["d.pdf"], "name": "d.pdf", "id": "z"},
+        {"path": str(tmp_path / "missing.pdf"), "name": "missing.pdf", "id": "m"},
+    ]
+    unique, duplicates, unreadable = ingest.dedup(files, threads=1)
+
+    assert [f["name"] for f in unique] == ["a.pdf", "d.pdf"]
+    assert duplicates == [(paths["b.pdf"], paths["a.pdf"])]
+    assert unreadable[0] == (paths["c.pdf"], f"duplicate id of {paths['a.pdf']}")
+    assert [path for path, _ in unreadable[1:]] == [str(tmp_path / "missing.pdf")]
+    assert len(unique) + len(duplicates) + len(unreadable) == len(files)
@@ -0,0 +1,28 @@
+from benchmarks.hashing_embeddings import HashingEmbeddings
+from local_store import LocalVectorStore
+
+
+def _store():
+    store = LocalVectorStore(HashingEmbeddings(dim=64))
+    store.add_texts(["alpha page", "beta page"], [{"source_file": "a.pdf", "page": 0},
+                                                  {"source_file": "a.pdf", "page": 1}], ids=["c0", "c1"])
+    return store
+
+
+def test_update_metadata_merges_and_reindexes_filters():
+    store = _store()
+    assert store.update_metadata({"c0": {"source_file": "b.pdf"}, "missing": {"source_file": "b.pdf"}}) == 1
+
+    [doc] = store.similarity_search("alpha", k=5, filter={"source_file": "b.pdf"})
+    assert doc.id == "c0" and doc.metadata == {"source_file": "b.pdf", "page": 0}
+    assert [d.id for d in store.similarity_search("beta", k=5, filter={"source_file": "a.pdf"})] == ["c1"]
+
+
+def test_search_on_empty_store():
+    store = LocalVectorStore(HashingEmbeddings(dim=64))
+    assert store.similarity_search_with_score_by_vector([0.1] * 384) == []
+    assert store.similarity_search("anything", k=3, filter={"source_file": "a.pdf"}) == []
+
+    store = _store()
+    store.delete(["c0", "c1"])
+    assert store.similarity_search("alpha", k=3) == []
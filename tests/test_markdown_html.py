@@ -0,0 +1,51 @@
+from markdown_html import _HEADER_TAGS, _LI, _LIST_OPEN, _P, MarkdownStream, markdown_to_html
+
+SAMPLE = """# Quarterly summary
+
+**Revenue** rose 12% on *strong* demand; see `report_q3*final*.pdf`.
+Margins held at 41%.
+
+## Drivers
+1. Pricing
+2. Volume of `units`
+- New regions
+- Churn < 3% & falling
+
+### Outlook
+Guidance is unchanged.
+
+
+Trailing paragraph with **bold *nested* text**"""
+
+
+def test_inline_code_is_literal():
+    # The old converters applied italics inside code spans
+    assert markdown_to_html("Open `a*b*c.txt` now") == f"{_P}Open <code>a*b*c.txt</code> now</p>"
+
+
+def test_headers_are_not_wrapped_in_paragraphs():
+    assert markdown_to_html("## Title\nBody") == f"{_HEADER_TAGS[2]}Title</h2>\n{_P}Body</p>"
+
+
+def test_list_kind_change_starts_a_new_list():
+    html = markdown_to_html("1. first\n- second\n2. third")
+    assert html == "\n".join([
+        f"{_LIST_OPEN['ol']}{_LI}first</li></ol>",
+        f"{_LIST_OPEN['ul']}{_LI}second</li></ul>",
+        f"{_LIST_OPEN['ol']}{_LI}third</li></ol>",
+    ])
+
+
+def test_paragraph_starting_with_bold_is_wrapped():
+    assert markdown_to_html("**Note** this\nand that") == f"{_P}<strong>Note</strong> this<br>and that</p>"
+
+
+def test_html_is_escaped():
+    assert markdown_to_html("<b>x</b> & y") == f"{_P}&lt;b&gt;x&lt;/b&gt; &amp; y</p>"
+
+
+def test_stream_matches_full_render_at_every_character():
+    stream = MarkdownStream()
+    for end in range(1, len(SAMPLE) + 1):
+        assert stream.append(SAMPLE[end - 1]) == markdown_to_html(SAMPLE[:end]), repr(SAMPLE[:end])
+    assert stream.html == markdown_to_html(SAMPLE)
@@ -0,0 +1,77 @@
+import asyncio
+import socket
+import time
+
+from langchain_core.documents import Document
+
+import engine
+import metrics
+
+
+def _stage_sum(stage: str) -> float:
+    state = metrics.QUERY_SECONDS._values.get((stage,))
+    return state[1] if state else 0.0
+
+
+class _Retriever:
+    def invoke(self, question):
+        return [Document(page_content=f"chunk {i}", metadata={"source_file": "a.pdf", "page": i}) for i in range(4)]
+
+    async def ainvoke(self, question):
+        return self.invoke(question)
+
+
+class _SlowReranker:
+    def rerank(self, question, docs, top_n):
+        time.sleep(0.2)
+        return docs[:top_n], {"model": "stub", "candidates": len(docs), "kept": top_n, "cached": 0, "seconds": 0.2}
+
+
+def _chain():
+    return {"reranker": _SlowReranker(), "k": 2, "system_prompt": "", "strict": False, "mode": "⚡ Factual Answer"}
+
+
+def test_rerank_time_is_not_counted_as_retrieve_or_generate(monkeypatch):
+    monkeypatch.setattr(engine, "stream_answer", lambda config, chain, prompt: iter(["an", "swer"]))
+    before = _stage_sum("retrieve")
+    result = engine.answer_question({}, _chain(), _Retriever(), "question?")
+
+    assert result["answer"] == "answer" and len(result["sources"]) == 2
+    timings = result["timings"]
+    assert timings["rerank_s"] == 0.2
+    assert timings["retrieve_s"] < 0.1 and timings["generate_s"] < 0.1 and timings["ttft_s"] < 0.1
+    assert timings["total_s"] >= 0.2
+    assert _stage_sum("retrieve") - before < 0.1
+
+
+def test_async_query_stops_retrieve_timer_before_rerank(monkeypatch):
+    async def tokens(config, chain, prompt):
+        yield "answer"
+
+    monkeypatch.setattr(engine, "astream_answer", tokens)
+    before = _stage_sum("retrieve")
+
+    async def run():
+        return [kind async for kind, _ in engine.aquery_events({}, _chain(), _Retriever(), "question?", [])]
+
+    assert asyncio.run(run()) == ["docs", "rerank", "token"]
+    assert _stage_sum("retrieve") - before < 0.1
+
+
+def test_taken_port_is_not_retried(monkeypatch):
+    monkeypatch.setattr(metrics, "_SERVER", None)
+    monkeypatch.setattr(metrics, "_SERVER_ERROR", None)
+    binds, bind = [], metrics.ThreadingHTTPServer
+
+    def server(*args):
+        binds.append(args)
+        return bind(*args)
+
+    monkeypatch.setattr(metrics, "ThreadingHTTPServer", server)
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        assert metrics.start_server(port) is None
+        assert metrics.start_server(port) is None
+    assert len(binds) == 1
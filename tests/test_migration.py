@@ -0,0 +1,60 @@
+import engine
+import migration
+from benchmarks.pdf_corpus import make_pdf
+
+
+def _file(tmp_path, name):
+    make_pdf(str(tmp_path / name), pages=2, seed=sum(map(ord, name)))
+    return {"path": str(tmp_path / name), "name": name, "id": name}
+
+
+def _doc_ids(vstore):
+    return {d.metadata["doc_id"] for batch in vstore.iter_documents() for d in batch}
+
+
+def test_write_between_last_pass_and_cutover(config, tmp_path):
+    engine.ingest_job(config, [_file(tmp_path, "before.pdf")])
+    results = {}
+
+    def log(message):
+        # Runs after every pass; "0 change(s)" is the last pass before the pause, then the cutover
+        if " 0 change(s)" in message:
+            name = "racing.pdf" if "racing.pdf" not in results else "paused.pdf"
+            results[name] = engine.ingest_job(config, [_file(tmp_path, name)])[name]
+
+    status = migration.Migration(config, config["embedding_model"], "2", log=log).run()
+    assert status["state"] == "done"
+
+    # Landed before writes were paused: copied by the final pass and moved by the cutover
+    assert not results["racing.pdf"].get("error")
+    # Landed after: refused, not recorded as indexed anywhere
+    assert "being migrated" in results["paused.pdf"]["error"]
+
+    live = engine.live_config(config)
+    registry = engine.get_registry(live)
+    assert {d["doc_id"] for d in registry.documents(engine.scope_key(live))} == {"before.pdf", "racing.pdf"}
+    assert _doc_ids(engine.get_vector_store(live)) == {"before.pdf", "racing.pdf"}
+
+    # Writes resume on the new collection
+    again = engine.ingest_job(live, [_file(tmp_path, "paused.pdf")])["paused.pdf"]
+    assert not again.get("error") and not again["skipped"]
+    assert registry.paused_writes() == {}
+
+
+def test_failed_final_pass_resumes_writes(config, tmp_path, monkeypatch):
+    engine.ingest_job(config, [_file(tmp_path, "a.pdf")])
+    sync = migration.Migration._sync
+
+    def failing_sync(self, *args):
+        if self.state == "finalizing":
+            raise RuntimeError("store unavailable")
+        return sync(self, *args)
+
+    monkeypatch.setattr(migration.Migration, "_sync", failing_sync)
+    status = migration.Migration(config, config["embedding_model"], "2").run()
+    assert status["state"] == "failed" and status["error"] == "store unavailable"
+
+    registry = engine.get_registry(config)
+    assert registry.paused_writes() == {}
+    assert engine.live_config(config)["collection"] == config["collection"]
+    assert not engine.ingest_job(config, [_file(tmp_path, "b.pdf")])["b.pdf"].get("error")
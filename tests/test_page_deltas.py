@@ -0,0 +1,78 @@
+import pytest
+from pypdf import PdfReader, PdfWriter
+
+import engine
+from benchmarks.pdf_corpus import make_pdf
+from registry import file_hash
+
+
+@pytest.fixture
+def versions(tmp_path):
+    """v1: five long pages. v2: page 1 replaced by a shorter one, page 4 removed."""
+    make_pdf(str(tmp_path / "long.pdf"), pages=5, words_per_page=400, seed=1)
+    make_pdf(str(tmp_path / "short.pdf"), pages=5, words_per_page=40, seed=2)
+
+    def build(name, pages):
+        writer = PdfWriter()
+        for src, page in pages:
+            writer.add_page(PdfReader(str(tmp_path / src)).pages[page])
+        writer.write(str(tmp_path / name))
+        return str(tmp_path / name)
+
+    v1 = build("v1.pdf", [("long.pdf", i) for i in range(5)])
+    v2 = build("v2.pdf", [("long.pdf", 0), ("short.pdf", 1), ("long.pdf", 2), ("long.pdf", 3)])
+    return v1, v2
+
+
+def _ingest(config, path, fname, doc_id, partition):
+    vstore = engine.get_vector_store(config)
+    stats = engine.ingest_progressive(config, vstore, engine.make_splitter(config), path, fname, doc_id,
+                                      file_hash(path), partition=partition)
+    job = engine._JOBS.get((engine.scope_key(config, partition), doc_id))
+    if job:
+        job.wait()
+        assert job.state == "ready"
+    return stats
+
+
+def _chunks(config, partition):
+    """{doc-local chunk id: (page, text, source_file)} stored in `partition`."""
+    return {d.id.split("/", 1)[1].split(":", 1)[1]: (d.metadata["page"], d.page_content, d.metadata["source_file"])
+            for batch in engine.get_vector_store(config).iter_documents() for d in batch
+            if d.metadata["partition"] == partition}
+
+
+@pytest.mark.parametrize("progressive_pages", [0, 2])
+@pytest.mark.parametrize("new_name", ["contract.pdf", "contract_v2.pdf"])
+def test_revision_reembeds_only_changed_pages(config, versions, progressive_pages, new_name):
+    config["progressive_pages"] = progressive_pages
+    v1, v2 = versions
+    _ingest(config, v1, "contract.pdf", "d", "p")
+    before = _chunks(config, "p")
+    assert {page for page, _, _ in before.values()} == {0, 1, 2, 3, 4}
+
+    stats = _ingest(config, v2, new_name, "d", "p")
+    assert stats["pages"] == 4 and not stats["skipped"]
+    job = engine._JOBS.get((engine.scope_key(config, "p"), "d"))
+    assert (job.embedded_pages if job else stats["embedded_pages"]) == 1
+
+    # Same chunks as a fresh ingest of v2: page 1 shortened, page 4 gone, every chunk under the new name
+    _ingest(config, v2, new_name, "d", "fresh")
+    after = _chunks(config, "p")
+    assert after == _chunks(config, "fresh")
+    assert len([i for i in before if i.startswith("1:")]) > len([i for i in after if i.startswith("1:")]) == 1
+    assert not [i for i in after if i.startswith("4:")]
+    assert {source for _, _, source in after.values()} == {new_name}
+
+    registry = engine.get_registry(config)
+    key = engine.scope_key(config, "p")
+    assert sorted(registry.pages(key, "d")) == [0, 1, 2, 3]
+    assert registry.get(key, "d")["name"] == new_name
+    assert registry.get(key, "d")["chunks"] == len(after)
+
+
+def test_new_embedding_model_reembeds_everything(config, versions):
+    v1, v2 = versions
+    _ingest(config, v1, "contract.pdf", "d", "p")
+    stats = _ingest({**config, "embedding_model": "other-model"}, v2, "contract.pdf", "d", "p")
+    assert stats["embedded_pages"] == 4
@@ -0,0 +1,45 @@
+import engine
+from benchmarks.pdf_corpus import make_pdf
+from blob_store import BlobStore
+
+
+def _upload(config, tmp_path, pages, name="doc.pdf"):
+    pdf = tmp_path / name
+    make_pdf(str(pdf), pages=pages)
+    spool = BlobStore(str(tmp_path / "spool"))
+    with open(pdf, "rb") as f:
+        digest = spool.put(f, owner="session")
+    return spool, digest
+
+
+def _ingest(config, spool, digest, doc_id):
+    vstore = engine.get_vector_store(config)
+    released = []
+    stats = engine.ingest_progressive(
+        config, vstore, engine.make_splitter(config), spool.path(digest), "doc.pdf", doc_id,
+        content_hash=digest, partition="p", on_done=lambda: (released.append(1), spool.release(digest, "session")),
+    )
+    return stats, released
+
+
+def test_small_upload_releases_blob(config, tmp_path):
+    config["progressive_pages"] = 10
+    spool, digest = _upload(config, tmp_path, pages=5)
+    stats, released = _ingest(config, spool, digest, "small")
+    assert not stats["pending"] and stats["pages"] == 5
+    assert released == [1]
+    assert not spool.exists(digest)
+
+
+def test_cached_upload_releases_blob(config, tmp_path):
+    config["progressive_pages"] = 3
+    spool, digest = _upload(config, tmp_path, pages=6)
+    _, released = _ingest(config, spool, digest, "cached")
+    engine._JOBS[(engine.scope_key(config, "p"), "cached")].wait()
+    assert released == [1]
+
+    spool, digest = _upload(config, tmp_path, pages=6)
+    stats, released = _ingest(config, spool, digest, "cached")
+    assert stats["skipped"] and not stats["pending"]
+    assert released == [1]
+    assert not spool.exists(digest)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from benchmarks.hashing_embeddings import HashingEmbeddings
+from local_store import LocalVectorStore
+from quantized_store import QuantizedVectorStore
+
+N, DIM, K = 3000, 64, 10
+
+
+def _corpus():
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(30, DIM))
+    vectors = centers[rng.integers(0, 30, N)] + 0.7 * rng.normal(size=(N, DIM))
+    queries = vectors[rng.integers(0, N, 30)] + 0.5 * rng.normal(size=(30, DIM))
+    return vectors, queries
+
+
+def _fill(store, vectors):
+    store.add_vectors(vectors, [f"text {i}" for i in range(len(vectors))], None, [f"c{i}" for i in range(len(vectors))])
+    return store
+
+
+@pytest.fixture(params=["int8", "binary"])
+def stores(request, tmp_path):
+    vectors, queries = _corpus()
+    embedding = HashingEmbeddings(dim=DIM)
+    exact = _fill(LocalVectorStore(embedding), vectors)
+    quantized = _fill(QuantizedVectorStore(embedding, request.param, rescore_dir=str(tmp_path)), vectors)
+    return exact, quantized, queries
+
+
+def _search(store, query):
+    return [(doc.id, score) for doc, score in store.similarity_search_with_score_by_vector(query, K)]
+
+
+def test_recall_against_exact_search(stores):
+    exact, quantized, queries = stores
+    recall = [len({i for i, _ in _search(exact, q)} & {i for i, _ in _search(quantized, q)}) / K for q in queries]
+    assert np.mean(recall) >= 0.95
+
+
+def test_hits_are_rescored_at_full_precision(stores):
+    exact, quantized, queries = stores
+    for query in queries[:10]:
+        hits = _search(quantized, query)
+        exact_scores = {doc.id: score for doc, score in exact.similarity_search_with_score_by_vector(query, N)}
+        assert [s for _, s in hits] == sorted((s for _, s in hits), reverse=True)
+        for chunk_id, score in hits:
+            assert score == pytest.approx(exact_scores[chunk_id], abs=1e-5)
+
+
+def test_deleted_rows_are_never_returned(stores):
+    exact, quantized, queries = stores
+    gone = [f"c{i}" for i in range(0, N, 2)]
+    exact.delete(gone)
+    quantized.delete(gone)   # more than half dead: compacts, re-reading rows from disk
+    assert len(quantized) == N // 2
+    for query in queries[:10]:
+        hits = _search(quantized, query)
+        assert not set(gone) & {i for i, _ in hits}
+        assert [i for i, _ in hits][:3] == [i for i, _ in _search(exact, query)][:3]
+
+
+def test_codes_are_compact(stores):
+    exact, quantized, _ = stores
+    per_row = quantized.vector_bytes() / N
+    assert per_row == (DIM + 4 if quantized.quantization == "int8" else DIM / 8)
+    assert exact.vector_bytes() / N == DIM * 4
+
+
+def test_snapshots_are_rejected():
+    with pytest.raises(TypeError, match="LocalVectorStore"):
+        QuantizedVectorStore.from_snapshot(object(), HashingEmbeddings(dim=DIM))
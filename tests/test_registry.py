@@ -0,0 +1,52 @@
+import pytest
+
+from registry import DocumentRegistry
+
+LIVE = {"collection": "docs_acme_v2", "embedding_model": "model-b", "embedding_version": "2"}
+
+
+def _registry():
+    registry = DocumentRegistry(":memory:")
+    registry.live_embedding("docs_acme", {"collection": "docs_acme", "embedding_model": "model-a",
+                                          "embedding_version": "1"})
+    return registry
+
+
+def test_cutover_moves_untagged_scope():
+    # Collection tenant mode without a partition: the scope is the bare collection name
+    registry = _registry()
+    registry.record("docs_acme", "d1", "a.pdf", "h1", 2, 5, "model-a")
+    registry.record_pages("docs_acme", "d1", {0: ("f0", 3), 1: ("f1", 2)})
+
+    registry.cutover("docs_acme", "docs_acme", LIVE)
+
+    assert registry.documents("docs_acme") == []
+    [moved] = registry.documents("docs_acme_v2")
+    assert moved["doc_id"] == "d1" and moved["embedding_model"] == "model-b"
+    assert registry.pages("docs_acme_v2", "d1") == {0: ("f0", 3), 1: ("f1", 2)}
+    assert registry.pages("docs_acme", "d1") == {}
+
+
+def test_cutover_moves_tagged_scopes_only_of_that_collection():
+    registry = _registry()
+    registry.record("docs_acme/partition=p", "d1", "a.pdf", "h1", 1, 1, "model-a")
+    registry.record("docs_acmex/partition=p", "d2", "b.pdf", "h2", 1, 1, "model-a")
+
+    registry.cutover("docs_acme", "docs_acme", LIVE)
+
+    assert [d["doc_id"] for d in registry.documents("docs_acme_v2/partition=p")] == ["d1"]
+    assert [d["doc_id"] for d in registry.documents("docs_acmex/partition=p")] == ["d2"]
+
+
+def test_paused_writes_refuse_records_until_cutover():
+    registry = _registry()
+    registry.pause_writes("docs_acme", "docs_acme_v2")
+    with pytest.raises(RuntimeError, match="being migrated"):
+        registry.record("docs_acme/partition=p", "d1", "a.pdf", "h1", 1, 1, "model-a")
+    with pytest.raises(RuntimeError, match="being migrated"):
+        registry.record_pages("docs_acme", "d1", {0: ("f0", 1)})
+    registry.record("docs_acmex", "d2", "b.pdf", "h2", 1, 1, "model-a")   # another collection
+
+    registry.cutover("docs_acme", "docs_acme", LIVE)
+    assert registry.paused_writes() == {}
+    registry.record("docs_acme_v2", "d1", "a.pdf", "h1", 1, 1, "model-b")
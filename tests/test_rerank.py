@@ -0,0 +1,77 @@
+import pytest
+from langchain_core.documents import Document
+
+import engine
+import rerank
+from benchmarks.hashing_embeddings import HashingEmbeddings
+from local_store import LocalVectorStore
+
+
+class _StubCrossEncoder:
+    """Scores a pair by the number in its text, and records every pair it was asked to score."""
+    calls = []
+
+    def __init__(self, model_name, max_length=None, device=None):
+        pass
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=None):
+        _StubCrossEncoder.calls.append(list(pairs))
+        return [float(text.split()[-1]) for _, text in pairs]
+
+
+@pytest.fixture
+def reranker(monkeypatch):
+    _StubCrossEncoder.calls = []
+    monkeypatch.setattr(rerank, "_import_cross_encoder", lambda: _StubCrossEncoder)
+    return rerank.Reranker("stub", cache_size=6)
+
+
+def _docs(*scores):
+    return [Document(page_content=f"chunk scoring {s}", metadata={"n": s}) for s in scores]
+
+
+def test_keeps_top_n_in_score_order(reranker):
+    kept, info = reranker.rerank("q", _docs(3, 9, 1, 7, 5), 3)
+    assert [d.metadata["n"] for d in kept] == [9, 7, 5]
+    assert [d.metadata["rerank_score"] for d in kept] == [9.0, 7.0, 5.0]
+    assert {k: info[k] for k in ("model", "candidates", "kept", "cached")} == \
+        {"model": "stub", "candidates": 5, "kept": 3, "cached": 0}
+
+
+def test_cache_hits_skip_the_model(reranker):
+    reranker.rerank("q", _docs(1, 2, 3), 2)
+    _, info = reranker.rerank("q", _docs(1, 2, 3), 2)
+    assert info["cached"] == 3 and len(_StubCrossEncoder.calls) == 1
+
+    # A follow-up scores only the chunks it has not seen; another question scores all
+    _, info = reranker.rerank("q", _docs(2, 3, 4), 2)
+    assert info["cached"] == 2 and [text for _, text in _StubCrossEncoder.calls[-1]] == ["chunk scoring 4"]
+    _, info = reranker.rerank("other", _docs(2, 3), 2)
+    assert info["cached"] == 0 and len(_StubCrossEncoder.calls[-1]) == 2
+
+
+def test_cache_evicts_least_recently_used(reranker):
+    reranker.rerank("q", _docs(1, 2, 3, 4, 5, 6), 1)   # fills the 6 slots
+    reranker.rerank("q", _docs(1), 1)                  # 1 becomes most recent
+    reranker.rerank("q", _docs(7), 1)                  # evicts 2, the oldest
+    _StubCrossEncoder.calls = []
+    _, info = reranker.rerank("q", _docs(1, 2, 3), 1)
+    assert info["cached"] == 2 and [text for _, text in _StubCrossEncoder.calls[0]] == ["chunk scoring 2"]
+
+
+def test_chain_fetches_candidates_and_cuts_to_k(reranker):
+    vstore = LocalVectorStore(HashingEmbeddings(dim=64))
+    vstore.add_texts([f"report page {i}" for i in range(30)], ids=[str(i) for i in range(30)])
+    chain, retriever = engine.make_chain(vstore, k=3, reranker=reranker, candidates=20)
+
+    candidates = retriever.invoke("report page")
+    assert len(candidates) == 20
+    kept, info = engine.rerank_docs(chain, "report page", candidates)
+    expected = sorted((int(d.page_content.split()[-1]) for d in candidates), reverse=True)[:3]
+    assert [int(d.page_content.split()[-1]) for d in kept] == expected
+    assert info["candidates"] == 20 and info["kept"] == 3
+
+    # Without a reranker the retriever fetches k and nothing is cut
+    chain, retriever = engine.make_chain(vstore, k=3)
+    docs = retriever.invoke("report page")
+    assert len(docs) == 3 and engine.rerank_docs(chain, "report page", docs) == (docs, None)
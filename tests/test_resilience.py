@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+import pytest
+
+import resilience
+from resilience import LatencyWindow, StreamTimeout
+
+FAST = {"first_token_timeout": 0.3, "idle_timeout": 0.3, "max_retries": 2, "backoff_base": 0.01,
+        "backoff_max": 0.01, "hedge_after": None}
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _sync_stream(steps):
+    for op, value in steps:
+        if op == "sleep":
+            time.sleep(value)
+        elif op == "raise":
+            raise value
+        else:
+            yield value
+
+
+async def _async_stream(steps):
+    for op, value in steps:
+        if op == "sleep":
+            await asyncio.sleep(value)
+        elif op == "raise":
+            raise value
+        else:
+            yield value
+
+
+def _run(mode, attempts, wrap=lambda stream: stream, **policy):
+    """
+    Stream through resilient_stream or aresilient_stream, where the n-th
+    attempt follows attempts[n] ([(op, value), ...]). Returns (tokens, events, error, attempts started).
+    """
+    started, tokens, events = [], [], []
+    make = _sync_stream if mode == "sync" else _async_stream
+
+    def start_stream():
+        started.append(len(started))
+        return wrap(make(attempts[len(started) - 1]))
+
+    kwargs = dict(policy={**FAST, **policy}, window=LatencyWindow(),
+                  on_event=lambda name, **info: events.append((name, info)))
+    try:
+        if mode == "sync":
+            for token in resilience.resilient_stream(start_stream, **kwargs):
+                tokens.append(token)
+        else:
+            async def consume():
+                async for token in resilience.aresilient_stream(start_stream, **kwargs):
+                    tokens.append(token)
+            asyncio.run(consume())
+    except Exception as e:
+        return tokens, events, e, len(started)
+    return tokens, events, None, len(started)
+
+
+def _names(events):
+    return [name for name, _ in events]
+
+
+@pytest.fixture(params=["sync", "async"])
+def mode(request):
+    return request.param
+
+
+def test_first_token_stall_is_retried(mode):
+    tokens, events, error, started = _run(mode, [[("sleep", 2.0), ("token", "late")],
+                                                 [("token", "a"), ("token", "b")]])
+    assert error is None and tokens == ["a", "b"] and started == 2
+    assert _names(events) == ["retry", "first_token"]
+    assert isinstance(events[0][1]["error"], StreamTimeout)
+
+
+def test_server_error_then_success(mode):
+    tokens, events, error, started = _run(mode, [[("raise", ApiError(500))], [("token", "ok")]])
+    assert error is None and tokens == ["ok"] and started == 2
+    assert _names(events) == ["retry", "first_token"] and events[1][1]["attempt"] == 1
+
+
+def test_client_error_is_not_retried(mode):
+    tokens, events, error, started = _run(mode, [[("raise", ApiError(401))], [("token", "never")]])
+    assert isinstance(error, ApiError) and error.status_code == 401
+    assert tokens == [] and started == 1 and events == []
+
+
+def test_retries_are_bounded(mode):
+    tokens, events, error, started = _run(mode, [[("raise", ApiError(503))]] * 3, max_retries=2)
+    assert isinstance(error, ApiError) and started == 3
+    assert _names(events) == ["retry", "retry"]
+
+
+def test_slow_primary_loses_to_hedge(mode):
+    tokens, events, error, started = _run(
+        mode, [[("sleep", 1.0), ("token", "slow")], [("token", "fast"), ("token", "!")]],
+        hedge_after=0.05, first_token_timeout=2.0)
+    assert error is None and tokens == ["fast", "!"] and started == 2
+    assert _names(events) == ["hedge", "first_token"] and events[1][1]["attempt"] == 1
+
+
+def test_idle_stall_after_first_token_is_raised(mode):
+    tokens, events, error, started = _run(mode, [[("token", "a"), ("sleep", 2.0), ("token", "b")],
+                                                 [("token", "retried")]])
+    # Tokens already reached the caller, so the stall is not retried
+    assert isinstance(error, StreamTimeout) and "stalled" in str(error)
+    assert tokens == ["a"] and started == 1
+
+
+def test_error_mid_stream_is_raised(mode):
+    tokens, events, error, started = _run(mode, [[("token", "a"), ("raise", ApiError(500))],
+                                                 [("token", "retried")]])
+    assert isinstance(error, ApiError) and tokens == ["a"] and started == 1
+
+
+def test_backoff_is_full_jitter_capped(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(resilience.random, "uniform", lambda lo, hi: bounds.append((lo, hi)) or hi / 2)
+    policy = {**resilience.DEFAULT_STREAM_POLICY, "backoff_base": 0.4, "backoff_max": 1.0}
+    assert [resilience._backoff(policy, retry) for retry in (1, 2, 3, 4)] == [0.2, 0.4, 0.5, 0.5]
+    assert bounds == [(0, 0.4), (0, 0.8), (0, 1.0), (0, 1.0)]
+
+
+def test_hedge_delay_uses_p95_once_warm():
+    policy = {**resilience.DEFAULT_STREAM_POLICY, "hedge_after": "p95", "hedge_fallback": 2.5,
+              "hedge_min_samples": 20}
+    window = LatencyWindow()
+    for i in range(19):
+        window.add(i / 100)
+    assert resilience._hedge_delay(policy, window) == 2.5
+    window.add(0.19)
+    assert resilience._hedge_delay(policy, window) == 0.18
+    assert resilience._hedge_delay({**policy, "hedge_after": "0.7"}, window) == 0.7
+    assert resilience._hedge_delay({**policy, "hedge_after": None}, window) is None
+
+
+def test_retryable_statuses():
+    class Response:
+        status_code = 429
+
+    wrapped = Exception("rate limited")
+    wrapped.response = Response()
+    assert resilience.is_retryable(wrapped)
+    assert resilience.is_retryable(StreamTimeout("slow"))
+    assert resilience.is_retryable(ApiError(408)) and resilience.is_retryable(ApiError(502))
+    assert not resilience.is_retryable(ApiError(400)) and not resilience.is_retryable(ApiError(401))
+    assert resilience.is_retryable(ConnectionError("reset"))
+
+
+def test_empty_deltas_do_not_count_as_first_token():
+    # A role-only empty chunk arrives at once, the text only after the hedge delay
+    steps = [("token", ""), ("sleep", 0.3), ("token", "text")]
+    _, raw_events, _, raw_started = _run("sync", [steps, steps], hedge_after=0.05, first_token_timeout=1.0)
+    tokens, events, error, started = _run("sync", [steps, steps], hedge_after=0.05, first_token_timeout=1.0,
+                                          wrap=resilience.text_tokens)
+    assert _names(raw_events) == ["first_token"] and raw_started == 1
+    assert _names(events) == ["hedge", "first_token"] and started == 2
+    assert error is None and tokens == ["text"]
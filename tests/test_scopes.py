@@ -0,0 +1,61 @@
+import engine
+from benchmarks.pdf_corpus import make_pdf
+
+
+def _ingest(config, tmp_path, name, partition):
+    pdf = tmp_path / name
+    make_pdf(str(pdf), pages=3, seed=sum(map(ord, name)))
+    return engine.ingest_job({**config, "partition": partition},
+                             [{"path": str(pdf), "name": name, "id": name}])[name]
+
+
+def test_sessions_search_shared_partition(config, tmp_path):
+    _ingest(config, tmp_path, "corpus.pdf", config["shared_partition"])
+    _ingest(config, tmp_path, "mine.pdf", "session-a")
+    _ingest(config, tmp_path, "theirs.pdf", "session-b")
+
+    vstore = engine.get_vector_store(config)
+    hits = vstore.similarity_search("report", k=100, filter=engine.search_scope(config, "session-a"))
+    assert {d.metadata["doc_id"] for d in hits} == {"corpus.pdf", "mine.pdf"}
+
+    registry = engine.get_registry(config)
+    totals = [registry.totals(key)["documents"] for key in engine.search_scope_keys(config, "session-a")]
+    assert totals == [1, 1]
+
+
+def test_upload_already_in_shared_partition_is_skipped(config, tmp_path):
+    first = _ingest(config, tmp_path, "corpus.pdf", config["shared_partition"])
+    assert not first["skipped"]
+
+    # Same bytes under another name and doc id, in a new session's partition
+    (tmp_path / "copy.pdf").write_bytes((tmp_path / "corpus.pdf").read_bytes())
+    again = engine.ingest_job({**config, "partition": "session-c"},
+                              [{"path": str(tmp_path / "copy.pdf"), "name": "copy.pdf", "id": "copy"}])["copy"]
+    assert again["skipped"] and again["chunks"] == first["chunks"]
+
+
+def test_sweep_drops_only_idle_partitions(config, tmp_path):
+    _ingest(config, tmp_path, "gone.pdf", "session-gone")
+    _ingest(config, tmp_path, "live.pdf", "session-live")
+    registry = engine.get_registry(config)
+    engine.touch_partition(config, "session-gone")
+    engine.touch_partition(config, "session-live")
+    registry._conn.execute("UPDATE partitions SET last_seen = 0 WHERE partition = 'session-gone'")
+
+    vstore = engine.get_vector_store(config)
+    assert engine.sweep_partitions(config) == ["session-gone"]
+    engine._DROPPER.submit(lambda: None).result()   # deletes run on the drop thread, in order
+
+    assert registry.totals(engine.scope_key(config, "session-gone"))["documents"] == 0
+    assert registry.totals(engine.scope_key(config, "session-live"))["documents"] == 1
+    assert {d.metadata["partition"] for batch in vstore.iter_documents() for d in batch} == {"session-live"}
+    assert engine.sweep_partitions(config) == []
+
+
+def test_tenant_collections_never_collide():
+    names = set()
+    for tenant in ("a-b", "a.b", "a_b", "x" * 60 + "1", "x" * 60 + "2"):
+        name = engine.base_collection(engine.load_config({}, tenant_mode="collection", tenant=tenant))
+        assert len(name) <= 48 and name.replace("_", "").isalnum()
+        names.add(name)
+    assert len(names) == 5
@@ -0,0 +1,46 @@
+import pytest
+
+import engine
+import snapshot
+from benchmarks.pdf_corpus import make_pdf
+
+
+def test_served_snapshot_is_searched_by_sessions(config, tmp_path):
+    pdf = tmp_path / "filing.pdf"
+    make_pdf(str(pdf), pages=3)
+    source = {**config, "partition": "export-run"}
+    engine.ingest_job(source, [{"path": str(pdf), "name": "filing.pdf", "id": "filing"}])
+    snapshot.export_snapshot(source, engine.get_vector_store(source), str(tmp_path / "snap"), "export-run")
+
+    served = {**config, "collection_name": config["collection_name"] + "_served", "collection": None,
+              "snapshot": str(tmp_path / "snap")}
+    vstore = engine.get_vector_store(served)
+    hits = vstore.similarity_search("filing", k=5, filter=engine.search_scope(served, "session-a"))
+    assert hits and {d.metadata["partition"] for d in hits} == {served["shared_partition"]}
+
+    registry = engine.get_registry(served)
+    assert sum(registry.totals(key)["documents"] for key in engine.search_scope_keys(served, "session-a")) == 1
+
+
+def test_snapshot_rejects_quantization():
+    with pytest.raises(ValueError):
+        engine.load_config({}, vector_store="local", snapshot="snapshots/x", vector_quantization="int8")
+
+
+def test_update_metadata_copies_snapshot_rows_out(config, tmp_path):
+    pdf = tmp_path / "filing.pdf"
+    make_pdf(str(pdf), pages=2)
+    source = {**config, "partition": "export-run"}
+    engine.ingest_job(source, [{"path": str(pdf), "name": "filing.pdf", "id": "filing"}])
+    snapshot.export_snapshot(source, engine.get_vector_store(source), str(tmp_path / "snap"), "export-run")
+
+    vstore = engine.get_vector_store({**config, "collection_name": config["collection_name"] + "_served",
+                                      "collection": None, "snapshot": str(tmp_path / "snap")})
+    ids = [d.id for batch in vstore.iter_documents() for d in batch]
+    assert vstore.update_metadata({ids[0]: {"source_file": "renamed.pdf"}}) == 1
+
+    docs = [d for batch in vstore.iter_documents() for d in batch]
+    assert len(docs) == len(ids)
+    assert [d.id for d in docs if d.metadata["source_file"] == "renamed.pdf"] == [ids[0]]
+    assert [d.id for d in vstore.similarity_search("filing", k=len(ids), filter={"source_file": "renamed.pdf"})] \
+        == [ids[0]]
@@ -5,17 +5,26 @@ All Streamlit rendering components for the design system.
 
 import streamlit as st
 import re
+import functools
+import uuid
 from datetime import datetime
 
+from markdown_html import markdown_to_html
+
 
 # ─── Top Navigation Bar ───────────────────────────────────────────────────────
-def render_top_bar():
+def render_top_bar(warming: bool = False):
     has_docs = bool(st.session_state.get("documents"))
     status_color = "var(--accent-teal)" if has_docs else "var(--text-muted)"
     status_label = "Online" if has_docs else "Ready"
 
     doc_count = len(st.session_state.get("documents", []))
     doc_label = f"{doc_count} doc{'s' if doc_count != 1 else ''} indexed" if doc_count else "No documents"
+    warm_badge = (
+        '<div class="model-badge" style="gap:6px">'
+        '<span style="width:6px;height:6px;border-radius:50%;background:var(--accent-amber);display:inline-block;"></span>'
+        'Warming up</div>'
+    ) if warming else ""
 
     st.markdown(f"""
     <div class="top-bar">
@@ -31,7 +40,7 @@ def render_top_bar():
         <div class="model-badge" style="gap:6px">
           <span style="width:6px;height:6px;border-radius:50%;background:{status_color};display:inline-block;"></span>
           {doc_label}
-        </div>
+        </div>{warm_badge}
       </div>
     </div>
     """, unsafe_allow_html=True)
@@ -74,6 +83,15 @@ def render_document_card(doc: dict):
 
     status_class = "status-ready" if status == "ready" else "status-indexing"
     status_text = "✓ Ready" if status == "ready" else "Indexing..."
+    coverage_html = ""
+    if status == "partial":
+        # Queryable already; the tail of the document is still being indexed
+        indexed = doc.get("indexed_pages", 0)
+        status_class = "status-partial"
+        status_text = (f"Stopped at {indexed}/{pages} pages" if doc.get("stalled")
+                       else f"◐ {indexed}/{pages} pages · searchable")
+        coverage_html = (f'<div class="doc-coverage"><div class="doc-coverage-fill" '
+                         f'style="width:{100 * indexed / max(pages, 1):.0f}%"></div></div>')
 
     # Truncate long filenames
     display_name = name if len(name) <= 24 else name[:21] + "..."
@@ -91,28 +109,47 @@ def render_document_card(doc: dict):
         <span class="doc-card-name" title="{name}">{display_name}</span>
       </div>
       <div class="doc-card-meta">{meta}</div>
+      {coverage_html}
       <span class="status-pill {status_class}">{status_text}</span>
     </div>
     """, unsafe_allow_html=True)
 
 
 # ─── Message Bubble ────────────────────────────────────────────────────────────
+def prerender_message(msg: dict) -> dict:
+    """
+    Attach an id and the message's rendered HTML (bubble + citation cards).
+    Called once when a message is created; reruns replay the cached HTML.
+    """
+    msg.setdefault("id", uuid.uuid4().hex[:12])
+    msg["html"] = _message_html(msg)
+    if msg["role"] == "assistant" and msg.get("sources"):
+        msg["citations_html"] = _citations_html(msg["sources"], msg.get("query", ""))
+    return msg
+
+
 def render_message_bubble(msg: dict):
+    if "html" not in msg:
+        prerender_message(msg)
+    st.markdown(msg["html"], unsafe_allow_html=True)
+
+
+def _message_html(msg: dict) -> str:
     role = msg["role"]
     content = msg["content"]
     timestamp = msg.get("timestamp", "")
 
     if role == "user":
-        st.markdown(f"""
+        return f"""
         <div class="message-wrapper user-message-wrapper">
           <div class="user-bubble">{_escape_html(content)}</div>
           <div class="msg-timestamp">{timestamp}</div>
         </div>
-        """, unsafe_allow_html=True)
+        """
 
-    else:  # assistant
-        html_content = _markdown_to_html(content)
-        st.markdown(f"""
+    # assistant
+    html_content = _markdown_to_html(content)
+    return f"""
         <div class="message-wrapper ai-message-wrapper">
           <div class="ai-bubble">
             <div class="ai-bubble-header">
@@ -125,7 +162,21 @@ def render_message_bubble(msg: dict):
           </div>
           <div class="msg-timestamp">{timestamp}</div>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+
+def transcript_window_start(messages: list, exchanges: int) -> int:
+    """
+    Index of the first message in the most recent `exchanges` exchanges.
+    Walks back from the end, so cost depends on the window, not the transcript.
+    """
+    seen = 0
+    for i in range(len(messages) - 1, -1, -1):
+        if messages[i]["role"] == "user":
+            seen += 1
+            if seen >= exchanges:
+                return i
+    return 0
 
 
 # ─── Skeleton Loader ──────────────────────────────────────────────────────────
@@ -145,19 +196,39 @@ def render_skeleton_loader():
 
 
 # ─── Source Citations ──────────────────────────────────────────────────────────
-def render_source_citations(sources: list, query: str = ""):
+def render_source_citations(sources: list, query: str = "", cached_html: str = None):
     if not sources:
         return
 
     n = len(sources)
-    query_words = set(query.lower().split()) if query else set()
+    cards_html = cached_html if cached_html is not None else _citations_html(sources, query)
 
     with st.expander(f"▸ Source Citations ({n} passage{'s' if n != 1 else ''})", expanded=False):
-        for source in sources:
-            _render_citation_card(source, query_words)
+        st.markdown(cards_html, unsafe_allow_html=True)
+
 
+def render_citation_summary(msg: dict):
+    """One-line stand-in for the citation cards of an older message."""
+    if "citations_summary_html" not in msg:
+        sources = msg.get("sources") or []
+        refs = ", ".join(
+            f'{_escape_html(s.get("filename", "Unknown"))} p.{s.get("page", 1)}' for s in sources[:3]
+        )
+        more = f" +{len(sources) - 3}" if len(sources) > 3 else ""
+        msg["citations_summary_html"] = (
+            f'<div class="citation-summary">▸ {len(sources)} source{"s" if len(sources) != 1 else ""}'
+            f' · {refs}{more}</div>'
+        )
+    st.markdown(msg["citations_summary_html"], unsafe_allow_html=True)
 
-def _render_citation_card(source: dict, query_words: set):
+
+def _citations_html(sources: list, query: str) -> str:
+    # One matcher per answer, shared by every citation card
+    matcher = keyword_matcher(frozenset(query.lower().split())) if query else None
+    return "".join(_citation_card_html(source, matcher) for source in sources)
+
+
+def _citation_card_html(source: dict, matcher) -> str:
     filename = source.get("filename", "Unknown")
     page = source.get("page", 1)
     score = source.get("score", 0.5)
@@ -183,9 +254,9 @@ def _render_citation_card(source: dict, query_words: set):
     display_fname = filename if len(filename) <= 30 else filename[:27] + "..."
 
     # Highlight keywords in snippet
-    highlighted_snippet = _highlight_keywords(snippet, query_words)
+    highlighted_snippet = _highlight_keywords(snippet, matcher)
 
-    st.markdown(f"""
+    return f"""
     <div class="citation-card {accent_class}">
       <div class="citation-header">
         <svg width="14" height="14" viewBox="0 0 24 24" fill="none" stroke="var(--accent-primary)" stroke-width="2" style="flex-shrink:0">
@@ -198,34 +269,50 @@ def _render_citation_card(source: dict, query_words: set):
       </div>
       <div class="citation-snippet">{highlighted_snippet}</div>
     </div>
-    """, unsafe_allow_html=True)
-
-
-def _highlight_keywords(text: str, keywords: set) -> str:
-    """Highlight keyword matches in snippet text."""
-    if not keywords:
-        return _escape_html(text)
-
-    # Escape HTML first
-    escaped = _escape_html(text)
+    """
+
+
+_STOP_WORDS = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "in", "on", "at",
+    "to", "of", "and", "or", "for", "with", "this", "that", "it",
+    "be", "by", "from", "as", "but", "not", "have", "has", "had",
+})
+
+
+@functools.lru_cache(maxsize=128)
+def keyword_matcher(keywords: frozenset):
+    """
+    Compile one case-insensitive alternation for all significant query words.
+    Longer words come first so overlapping keywords prefer the longest match.
+    Returns None when no word qualifies.
+    """
+    words = sorted(
+        (w for w in keywords - _STOP_WORDS if len(w) >= 3),
+        key=lambda w: (-len(w), w),
+    )
+    if not words:
+        return None
+    return re.compile("|".join(re.escape(w) for w in words), re.IGNORECASE)
 
-    # Highlight each keyword (case-insensitive, whole-ish words)
-    stop_words = {"the", "a", "an", "is", "are", "was", "were", "in", "on", "at",
-                  "to", "of", "and", "or", "for", "with", "this", "that", "it",
-                  "be", "by", "from", "as", "but", "not", "have", "has", "had"}
 
-    significant_words = keywords - stop_words
+def _highlight_keywords(text: str, matcher) -> str:
+    """
+    Highlight keyword matches in snippet text in a single scan.
 
-    for word in significant_words:
-        if len(word) < 3:
-            continue
-        pattern = re.compile(re.escape(word), re.IGNORECASE)
-        escaped = pattern.sub(
-            lambda m: f'<span class="highlight-kw">{m.group()}</span>',
-            escaped
-        )
+    Matching runs on the raw text and each segment is escaped on the way
+    out, so keywords never match inside entities or inserted markup.
+    """
+    if matcher is None:
+        return _escape_html(text)
 
-    return escaped
+    parts = []
+    pos = 0
+    for m in matcher.finditer(text):
+        parts.append(_escape_html(text[pos:m.start()]))
+        parts.append(f'<span class="highlight-kw">{_escape_html(m.group())}</span>')
+        pos = m.end()
+    parts.append(_escape_html(text[pos:]))
+    return "".join(parts)
 
 
 # ─── Developer Panel ───────────────────────────────────────────────────────────
@@ -248,6 +335,11 @@ def render_dev_panel_content(info: dict):
         ("strict_mode", str(info.get("strict_mode", False))),
         ("query_mode", info.get("query_mode", "—")),
     ]
+    rerank = info.get("rerank")
+    if rerank:
+        config_rows.append(("rerank", f'{rerank["model"].split("/")[-1]} · {rerank["candidates"]} → '
+                                      f'{rerank["kept"]} · {rerank["seconds"] * 1000:.0f} ms · '
+                                      f'{rerank["cached"]} cached'))
 
     rows_html = "".join(
         f'<div class="dev-kv-row"><span class="dev-key">{k}</span><span class="dev-val">{v}</span></div>'
@@ -263,10 +355,11 @@ def render_dev_panel_content(info: dict):
         source = chunk.get("source", "Unknown")
         page = chunk.get("page", 1)
         length = chunk.get("length", 0)
+        score = f' · rerank {chunk["rerank_score"]:.2f}' if chunk.get("rerank_score") is not None else ""
 
         st.markdown(f"""
         <div class="dev-chunk-box">
-          <div class="dev-chunk-label">Chunk {i+1} · {source} · p.{page} · {length} chars</div>
+          <div class="dev-chunk-label">Chunk {i+1} · {source} · p.{page} · {length} chars{score}</div>
           <div class="dev-chunk-text">{_escape_html(chunk_text)}{"..." if len(chunk.get("text","")) > 600 else ""}</div>
         </div>
         """, unsafe_allow_html=True)
@@ -274,72 +367,62 @@ def render_dev_panel_content(info: dict):
     st.markdown("</div>", unsafe_allow_html=True)
 
 
+def render_profile_panel(profile: dict):
+    """Top frames and allocation sites from the last profiler capture, plus the raw download."""
+    if not profile:
+        return
+
+    summary = [
+        ("captured", profile["label"]),
+        ("profiler", profile["mode"]),
+        ("wall_time", f'{profile["wall_s"]:.3f}s'),
+    ]
+    if profile.get("samples") is not None:
+        summary.append(("samples", f'{profile["samples"]} busy · {profile["idle_samples"]} idle'))
+    if profile.get("peak_alloc_kib") is not None:
+        summary.append(("peak_alloc", f'{profile["peak_alloc_kib"]:,.0f} KiB'))
+    if profile.get("error"):
+        summary.append(("error", _escape_html(profile["error"])))
+
+    def _rows(pairs):
+        return "".join(
+            f'<div class="dev-kv-row dev-profile-row"><span class="dev-key">{k}</span>'
+            f'<span class="dev-val">{v}</span></div>'
+            for k, v in pairs
+        )
+
+    if profile["mode"] == "sampling":
+        frames = [(_escape_html(f["frame"]), f'{f["self_pct"]}% · {f["total_pct"]}% cum')
+                  for f in profile["top_frames"]]
+    else:
+        frames = [(_escape_html(f["frame"]), f'{f["self_s"]:.3f}s · {f["calls"]} calls')
+                  for f in profile["top_frames"]]
+    allocs = [(_escape_html(a["site"]), f'{a["kib"]:,.1f} KiB · {a["blocks"]} blocks')
+              for a in profile["top_allocs"]]
+
+    html = (
+        '<div class="dev-panel">'
+        '<div class="dev-section-label">Profile</div>' + _rows(summary) +
+        '<div class="dev-section-label">Top Frames (self time)</div>' + (_rows(frames) or "—")
+    )
+    if profile.get("trace_allocs"):
+        html += '<div class="dev-section-label">Top Allocation Sites</div>' + (_rows(allocs) or "—")
+    st.markdown(html + "</div>", unsafe_allow_html=True)
+
+    st.download_button(
+        "Download raw profile",
+        data=profile["raw"],
+        file_name=profile["filename"],
+        mime="application/octet-stream",
+        key="download_profile",
+        use_container_width=True,
+    )
+
+
 # ─── Utility: Markdown → HTML ──────────────────────────────────────────────────
 def _markdown_to_html(text: str) -> str:
     """Convert markdown to HTML for AI response rendering."""
-    import re
-
-    # Escape HTML
-    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-
-    # Headers
-    text = re.sub(r'^### (.+)$', r'<h3 style="font-family:var(--font-prose);font-size:18px;margin:16px 0 8px 0;color:var(--text-primary);">\1</h3>', text, flags=re.MULTILINE)
-    text = re.sub(r'^## (.+)$', r'<h2 style="font-family:var(--font-prose);font-size:20px;margin:18px 0 10px 0;color:var(--text-primary);">\1</h2>', text, flags=re.MULTILINE)
-    text = re.sub(r'^# (.+)$', r'<h1 style="font-family:var(--font-prose);font-size:24px;margin:20px 0 12px 0;color:var(--text-primary);">\1</h1>', text, flags=re.MULTILINE)
-
-    # Bold
-    text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
-    # Italic
-    text = re.sub(r'\*(.+?)\*', r'<em>\1</em>', text)
-    # Inline code
-    text = re.sub(r'`(.+?)`', r'<code>\1</code>', text)
-
-    # Bullet lists
-    lines = text.split('\n')
-    result = []
-    in_list = False
-
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('- ') or stripped.startswith('* ') or stripped.startswith('• '):
-            if not in_list:
-                result.append('<ul style="margin:8px 0;padding-left:22px;">')
-                in_list = True
-            item = stripped[2:]
-            result.append(f'<li style="margin:4px 0;">{item}</li>')
-        elif re.match(r'^\d+\.\s', stripped):
-            if not in_list:
-                result.append('<ol style="margin:8px 0;padding-left:22px;">')
-                in_list = 'ol'
-            item = re.sub(r'^\d+\.\s', '', stripped)
-            result.append(f'<li style="margin:4px 0;">{item}</li>')
-        else:
-            if in_list:
-                tag = 'ol' if in_list == 'ol' else 'ul'
-                result.append(f'</{tag}>')
-                in_list = False
-            result.append(line)
-
-    if in_list:
-        tag = 'ol' if in_list == 'ol' else 'ul'
-        result.append(f'</{tag}>')
-
-    text = '\n'.join(result)
-
-    # Paragraphs
-    paragraphs = text.split('\n\n')
-    processed = []
-    for para in paragraphs:
-        para = para.strip()
-        if not para:
-            continue
-        if para.startswith('<'):
-            processed.append(para)
-        else:
-            para = para.replace('\n', '<br>')
-            processed.append(f'<p style="margin:0 0 12px 0;">{para}</p>')
-
-    return '\n'.join(processed)
+    return markdown_to_html(text)
 
 
 def _escape_html(text: str) -> str:
@@ -0,0 +1,156 @@
+"""
+PDF Intelligence — Warm-up
+Loads the heavy imports and the embedding model (plus one dummy encode) on
+a background thread so the first upload or question of a fresh replica
+does not pay for them. Progress is reported per step through `status()`.
+
+    python warmup.py --profile        # where does startup time go?
+
+serve.py starts the warm-up at server boot, before Streamlit takes traffic.
+"""
+
+import argparse
+import subprocess
+import sys
+import threading
+import time
+
+import engine
+import metrics
+
+
+class WarmUp:
+    """One background warm-up run with per-step timings."""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.ready = threading.Event()
+        self.started = time.time()
+        self.finished = None
+        self.steps = [
+            {"name": name, "status": "pending", "seconds": None, "error": None}
+            for name, _ in self._plan()
+        ]
+        self._thread = threading.Thread(target=self._run, name="pagewise-warmup", daemon=True)
+
+    def _plan(self):
+        model = self.config["embedding_model"]
+        plan = [
+            ("import pdf tools", engine._import_pdf_tools),
+            ("import embeddings", engine._import_embeddings),
+            ("load embedding model", lambda: engine.get_embeddings(model)),
+            ("dummy encode", lambda: engine.get_embeddings(model).embed_query("warm up")),
+            ("import vector store", engine._import_astra),
+            ("import llm client", engine._import_groq),
+        ]
+        if self.config["rerank_model"]:
+            plan.append(("load reranker", lambda: engine.get_reranker(self.config).score("warm up", ["warm up"])))
+        return plan
+
+    def _run(self):
+        for step, (_, fn) in zip(self.steps, self._plan()):
+            step["status"] = "running"
+            start = time.perf_counter()
+            try:
+                fn()
+                step["status"] = "ok"
+            except Exception as e:
+                # Later steps may still succeed; the request path retries lazily
+                step["status"] = "failed"
+                step["error"] = str(e)[:200]
+            step["seconds"] = round(time.perf_counter() - start, 3)
+        self.finished = time.time()
+        self.ready.set()
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.ready.wait(timeout)
+
+    def status(self) -> dict:
+        """{ready, ok, elapsed_s, steps: [{name, status, seconds, error}]}"""
+        end = self.finished or time.time()
+        return {
+            "ready": self.ready.is_set(),
+            "ok": all(s["status"] == "ok" for s in self.steps),
+            "elapsed_s": round(end - self.started, 3),
+            "steps": [dict(s) for s in self.steps],
+        }
+
+
+_CURRENT = None
+_LOCK = threading.Lock()
+
+
+def start(config: dict) -> WarmUp:
+    """Start the process-wide warm-up once; later calls return the same run."""
+    global _CURRENT
+    with _LOCK:
+        if _CURRENT is None:
+            _CURRENT = WarmUp(config).start()
+        return _CURRENT
+
+
+def current():
+    return _CURRENT
+
+
+_READY = metrics.Gauge("pagewise_warmup_ready", "1 once boot warm-up has finished, else 0.")
+
+
+@metrics.on_scrape
+def _sync_ready():
+    _READY.set(1 if _CURRENT is not None and _CURRENT.ready.is_set() else 0)
+
+
+# ─── Import-time profile ──────────────────────────────────────────────────────
+def import_profile(modules=("engine", "langchain_huggingface", "sentence_transformers",
+                            "langchain_astradb", "langchain_groq", "langchain_community.document_loaders")):
+    """
+    Import `modules` in a fresh interpreter under -X importtime and return
+    [(top-level package, self_s, cumulative_s)] sorted by self time.
+    Cumulative is the slowest single import of that package's subtree.
+    """
+    code = "\n".join(f"try:\n    import {m}\nexcept Exception:\n    pass" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          capture_output=True, text=True)
+
+    totals = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        package = name.strip().split(".")[0]
+        self_s, cum_s = totals.get(package, (0.0, 0.0))
+        totals[package] = (self_s + int(self_us) / 1e6, max(cum_s, int(cumulative_us) / 1e6))
+
+    return sorted(((pkg, s, c) for pkg, (s, c) in totals.items()), key=lambda row: -row[1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warm up (or profile) the engine's startup path")
+    parser.add_argument("--profile", action="store_true", help="Report import time per top-level package")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--secrets", default=".streamlit/secrets.toml")
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        rows = import_profile()
+        total = sum(s for _, s, _ in rows)
+        print(f"{'package':<32} {'self s':>8} {'cum s':>8} {'share':>6}")
+        for pkg, self_s, cum_s in rows[:args.top]:
+            print(f"{pkg:<32} {self_s:8.3f} {cum_s:8.3f} {self_s / total:6.1%}")
+        print(f"{'total':<32} {total:8.3f}")
+
+    run = WarmUp(engine.live_config(engine.load_config(engine.load_secrets_file(args.secrets)))).start()
+    run.wait()
+    for step in run.status()["steps"]:
+        mark = "✓" if step["status"] == "ok" else "✕"
+        print(f"  {mark} {step['name']:<22} {step['seconds']:7.3f}s  {step['error'] or ''}")
+    return 0 if run.status()["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())